@@ -0,0 +1,319 @@
+"""
+benchmark.py
+============
+
+Benchmarks reproducibles del motor de Cuadrito (Dots and Boxes).
+
+Mide, para varios tamaños de tablero y sobre posiciones fijas generadas
+con semilla:
+    - Board.move, Board.clone, Board.valid_moves y Board.winner
+    - SmartAgent.compute
+    - partidas completas simuladas (Environment sin salida por consola)
+
+y reporta la mediana (p50) en microsegundos, operaciones por segundo
+derivadas de ella y el percentil 99 por lote. Las operaciones del tablero
+tardan pocos microsegundos, así que cada muestra es el tiempo medio de un
+lote de `inner` llamadas (no una sola llamada, que sería sobre todo ruido
+del reloj); por eso su p99 es el de los lotes (`p99_batch_us`), no el de
+las llamadas sueltas: una llamada lenta aislada se diluye en su lote.
+SmartAgent.compute y las partidas se miden de una en una (inner = 1) y su
+p99 sí es el de cada llamada. El resultado se puede guardar en JSON y
+compararse con una ejecución anterior para detectar regresiones; las
+partidas completas, con pocas muestras, tienen un umbral de comparación
+más holgado.
+
+Ejemplo:
+
+    python benchmark.py --sizes 3 5 10 15 --json antes.json
+    python benchmark.py --sizes 3 5 10 15 --json despues.json --compare antes.json
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+from main import Environment
+from squares.board import Board
+from squares.registry import make_agent
+from squares.smart_agent import SmartAgent
+
+BENCHES = ("move", "clone", "valid_moves", "winner", "smart_compute", "game")
+
+
+# --------------------------------------------------------------------------
+# Posiciones de prueba
+# --------------------------------------------------------------------------
+
+def positions(size: int, count: int, seed: int):
+    """
+    Genera posiciones fijas jugando líneas al azar desde el tablero vacío,
+    repartidas entre apertura, medio juego y final.
+
+    :param size: Tamaño del tablero
+    :param count: Número de posiciones
+    :param seed: Semilla base
+    :return: Lista de tuplas (Board, código de quien mueve)
+    """
+    rng = random.Random(seed * 1000 + size)
+    out = []
+    for k in range(count):
+        board = Board(size)
+        moves = board.legal_moves()
+        rng.shuffle(moves)
+        played = int(len(moves) * (k + 0.5) / count)
+        color = -1
+        for i, j, s in moves[:played]:
+            if board.check(i, j, s):
+                board.move(i, j, s, color)
+                color = -2 if color == -1 else -1
+        out.append((board, color))
+    return out
+
+
+# --------------------------------------------------------------------------
+# Medición
+# --------------------------------------------------------------------------
+
+def percentile(sorted_values, q: float) -> float:
+    """Percentil q (0..100) por rango más cercano de una lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(bench: str, size: int, samples_ns, inner: int = 1) -> dict:
+    """
+    Resume una lista de tiempos por operación.
+
+    :param samples_ns: Tiempo medio por llamada de cada muestra (ns)
+    :param inner: Llamadas por muestra (lote)
+    :return: Diccionario con n, inner, ops/s y latencias (µs); p99 es el
+             percentil de las muestras, es decir, de los lotes de `inner`
+             llamadas
+    """
+    samples = sorted(samples_ns)
+    total = sum(samples)
+    p50 = percentile(samples, 50)
+    return {
+        "bench": bench,
+        "size": size,
+        "n": len(samples),
+        "inner": inner,
+        "ops_per_sec": 1e9 / p50 if p50 else 0.0,     # de la mediana
+        "mean_us": total / len(samples) / 1000 if samples else 0.0,
+        "p50_us": p50 / 1000,
+        "p99_batch_us": percentile(samples, 99) / 1000,
+    }
+
+
+def timed(fn, *args, number: int = 1):
+    """
+    Ejecuta fn(*args) `number` veces seguidas.
+
+    :return: Tiempo medio por llamada en nanosegundos
+    """
+    calls = range(number)
+    start = time.perf_counter_ns()
+    for _ in calls:
+        fn(*args)
+    return (time.perf_counter_ns() - start) / number
+
+
+def timed_moves(copies, move, color: int):
+    """
+    Aplica la misma jugada sobre cada copia del tablero (Board.move
+    modifica el tablero, así que cada llamada necesita la suya).
+
+    :return: Tiempo medio por jugada en nanosegundos
+    """
+    i, j, s = move
+    start = time.perf_counter_ns()
+    for copy in copies:
+        copy.move(i, j, s, color)
+    return (time.perf_counter_ns() - start) / len(copies)
+
+
+def bench_board(size: int, boards, samples: int, inner: int = 20):
+    """
+    Mide las operaciones del tablero sobre las posiciones dadas.
+
+    :param inner: Llamadas por muestra (cada muestra es su tiempo medio)
+    :return: Diccionario {nombre: lista de tiempos por llamada (ns)}
+    """
+    times = {"move": [], "clone": [], "valid_moves": [], "winner": []}
+    rounds = max(1, samples // len(boards))
+    for board, color in boards:
+        moves = board.legal_moves()
+        for r in range(rounds):
+            times["clone"].append(timed(board.clone, number=inner))
+            times["valid_moves"].append(timed(board.valid_moves, number=inner))
+            times["winner"].append(timed(board.winner, number=inner))
+            if moves:
+                copies = [board.clone() for _ in range(inner)]
+                times["move"].append(timed_moves(copies, moves[r % len(moves)], color))
+    return times
+
+
+def bench_smart(boards, samples: int, time_limit: int):
+    """Mide SmartAgent.compute en las posiciones con líneas libres."""
+    times = []
+    playable = [(b, c) for b, c in boards if b.legal_moves()]
+    for k in range(samples):
+        board, color = playable[k % len(playable)]
+        agent = SmartAgent("R" if color == -1 else "Y")
+        agent.init(agent.color, board.grid, time_limit)
+        times.append(timed(agent.compute, board, time_limit))
+    return times
+
+
+def bench_games(size: int, games: int, agents, time_limit: int, seed: int):
+    """Mide partidas completas (Environment sin salida por consola)."""
+    times = []
+    for g in range(games):
+        random.seed(seed * 1000 + size * 10 + g)
+        env = Environment(size=size, time_limit=time_limit, verbose=False)
+        red = make_agent(agents[0], color="R")
+        yellow = make_agent(agents[1], color="Y")
+        times.append(timed(env.play, red, yellow))
+    return times
+
+
+def run(sizes, seed=0, samples=500, smart_samples=20, games=7,
+        game_agents=("smart", "random"), benches=BENCHES, positions_per_size=20, inner=20):
+    """
+    Ejecuta los benchmarks.
+
+    :param sizes: Tamaños de tablero
+    :param seed: Semilla de las posiciones y partidas
+    :param samples: Muestras por operación del tablero y tamaño
+    :param smart_samples: Llamadas a SmartAgent.compute por tamaño
+    :param games: Partidas completas por tamaño
+    :param game_agents: Agentes (rojo, amarillo) de las partidas
+    :param benches: Benchmarks a ejecutar (ver BENCHES)
+    :param positions_per_size: Posiciones fijas por tamaño
+    :param inner: Llamadas por muestra en las operaciones del tablero
+    :return: Lista de resultados (ver summarize)
+    """
+    time_limit = 10 ** 9   # sin límite de reloj: solo se mide
+    results = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for size in sizes:
+            boards = positions(size, positions_per_size, seed)
+            if {"move", "clone", "valid_moves", "winner"} & set(benches):
+                for name, t in bench_board(size, boards, samples, inner).items():
+                    if name in benches:
+                        results.append(summarize(name, size, t, inner))
+            if "smart_compute" in benches and smart_samples:
+                results.append(summarize("smart_compute", size,
+                                         bench_smart(boards, smart_samples, time_limit)))
+            if "game" in benches and games:
+                results.append(summarize("game", size,
+                                         bench_games(size, games, game_agents, time_limit, seed)))
+            gc.collect()
+    finally:
+        if enabled:
+            gc.enable()
+    return results
+
+
+# --------------------------------------------------------------------------
+# Reporte y comparación
+# --------------------------------------------------------------------------
+
+def print_results(results):
+    """Muestra la tabla de resultados en consola."""
+    print(f"\n⏱️  {'benchmark':<14} {'tamaño':>5} {'ops/s':>12} {'p50 µs':>11} "
+          f"{'p99 lote µs':>12} {'lote':>5}")
+    print("-" * 66)
+    for r in results:
+        print(f"{r['bench']:<14} {r['size']:>2}x{r['size']:<2} {r['ops_per_sec']:12.1f} "
+              f"{r['p50_us']:11.2f} {r['p99_batch_us']:12.2f} {r['inner']:>5}")
+    print("-" * 66)
+
+
+def compare(results, baseline, threshold: float, game_threshold: float = 0.25):
+    """
+    Compara la mediana con una ejecución anterior.
+
+    :param results: Resultados actuales
+    :param baseline: Resultados anteriores (mismo formato)
+    :param threshold: Empeoramiento relativo tolerado (0.1 = 10 %)
+    :param game_threshold: Umbral de las partidas completas (pocas muestras
+                           y mucho más variables que una operación)
+    :return: Lista de regresiones (bench, tamaño, p50 anterior, p50 actual)
+    """
+    old = {(r["bench"], r["size"]): r for r in baseline}
+    regressions = []
+    print(f"\n📊 Comparación (umbral {100 * threshold:.0f} %, partidas {100 * game_threshold:.0f} %)")
+    print("-" * 60)
+    for r in results:
+        prev = old.get((r["bench"], r["size"]))
+        if prev is None or not prev["p50_us"]:
+            continue
+        limit = game_threshold if r["bench"] == "game" else threshold
+        change = r["p50_us"] / prev["p50_us"] - 1
+        mark = "🔺" if change > limit else "🔻" if change < -limit else "  "
+        print(f"{mark} {r['bench']:<14} {r['size']:>2}x{r['size']:<2} "
+              f"{prev['p50_us']:11.2f} → {r['p50_us']:11.2f} µs ({100 * change:+.1f} %)")
+        if change > limit:
+            regressions.append((r["bench"], r["size"], prev["p50_us"], r["p50_us"]))
+    print("-" * 60)
+    return regressions
+
+
+# --------------------------------------------------------------------------
+# Punto de entrada principal
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de Cuadrito")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[3, 5, 7, 10, 15])
+    parser.add_argument("--bench", nargs="+", default=list(BENCHES), choices=BENCHES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=500,
+                        help="Muestras por operación del tablero y tamaño")
+    parser.add_argument("--inner", type=int, default=20,
+                        help="Llamadas por muestra en las operaciones del tablero")
+    parser.add_argument("--smart-samples", type=int, default=20)
+    parser.add_argument("--games", type=int, default=7, help="Partidas completas por tamaño")
+    parser.add_argument("--game-agents", nargs=2, default=["smart", "random"])
+    parser.add_argument("--json", default=None, help="Archivo donde guardar los resultados")
+    parser.add_argument("--compare", default=None, help="JSON de una ejecución anterior")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Empeoramiento relativo de p50 que cuenta como regresión")
+    parser.add_argument("--game-threshold", type=float, default=0.25,
+                        help="Umbral de regresión de las partidas completas")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.seed, args.samples, args.smart_samples, args.games,
+                  args.game_agents, args.bench, inner=args.inner)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "seed": args.seed,
+                    "samples": args.samples,
+                    "inner": args.inner,
+                },
+                "results": results,
+            }, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold, args.game_threshold):
+            sys.exit(1)
@@ -0,0 +1,54 @@
+"""
+build_book.py
+=============
+
+Generador fuera de línea del libro de aperturas (squares.book).
+
+Busca a fondo las primeras jugadas de un tamaño de tablero (con reducción
+por simetría) y guarda la mejor línea de cada posición en un archivo que
+los agentes abren con mmap:
+
+    python build_book.py --size 4 --plies 4 --time 500 --out libro4.book
+    SearchAgent(book="libro4.book")
+
+Con --solve guarda en su lugar la tabla exacta de squares.solver
+(solo 3x3 y 4x4):
+
+    python build_book.py --size 4 --solve --out tabla4.db
+    PerfectAgent(path="tabla4.db")
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import argparse
+import time
+
+from squares.book import MAX_BOOK_SIZE, generate, write_book
+from squares.solver import SolutionTable
+
+
+# --------------------------------------------------------------------------
+# Punto de entrada principal
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador del libro de aperturas")
+    parser.add_argument("--size", type=int, default=4, help=f"Tamaño del tablero (hasta {MAX_BOOK_SIZE})")
+    parser.add_argument("--plies", type=int, default=4, help="Jugadas cubiertas por el libro")
+    parser.add_argument("--time", type=int, default=500, help="Tiempo de búsqueda por posición (ms)")
+    parser.add_argument("--solve", action="store_true",
+                        help="Resolver todas las posiciones (tabla exacta de squares.solver)")
+    parser.add_argument("--out", required=True, help="Archivo de salida")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.solve:
+        table = SolutionTable.build(args.size)
+        table.save(args.out)
+        count = len(table)
+    else:
+        book = generate(args.size, args.plies, args.time, verbose=True)
+        write_book(args.out, args.size, book)
+        count = len(book)
+    print(f"📖 {count} posiciones guardadas en {args.out} ({time.perf_counter() - start:.1f} s)")
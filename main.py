@@ -20,14 +20,37 @@ class Environment:
     """
     Entorno de simulación entre dos agentes.
     Controla turnos, tiempo y determina el ganador.
+
+    Con verbose=False no escribe nada en consola (modo sin interfaz,
+    útil para simulaciones masivas). Si se indica un GameRecorder
+    (squares.records), cada partida terminada se añade a su búfer.
+
+    Antes de cada jugada se avisa al agente en turno de la respuesta del
+    rival (Agent.notify_opponent_move) dentro de su propio tiempo, así que
+    detener su búsqueda de fondo (pondering) se descuenta de su reloj.
+
+    El resultado incluye las métricas de cada agente en la partida (nodos,
+    evaluaciones, aciertos de caché, profundidad, tiempo por fase; ver
+    squares.metrics).
     """
 
-    def __init__(self, size=4, time_limit=20000):
+    def __init__(self, size=4, time_limit=20000, verbose=True, recorder=None):
         self.board = Board(size)
         self.time_limit = time_limit
         self.remaining = {"R": time_limit, "Y": time_limit}
         self.player = "R"
         self.winner = None
+        self.reason = None
+        self.verbose = verbose
+        self.recorder = recorder
+        self.moves = []   # jugadas aplicadas (o intentadas)
+        self.times = []   # ms usados en cada jugada
+        self.clock = []   # ms restantes del jugador tras cada jugada
+
+    def _log(self, *args):
+        """Imprime solo en modo verbose."""
+        if self.verbose:
+            print(*args)
 
     def play(self, red_agent, yellow_agent):
         """
@@ -35,20 +58,43 @@ class Environment:
 
         :param red_agent: instancia de Agent (color 'R')
         :param yellow_agent: instancia de Agent (color 'Y')
+        :return: Diccionario con el registro de la partida (ver result())
         """
         red_agent.init("R", self.board.grid, self.time_limit)
         yellow_agent.init("Y", self.board.grid, self.time_limit)
 
-        print(f"\n🎯 Iniciando partida ({self.board.size}x{self.board.size})")
-        print(f"🔴 {red_agent.__class__.__name__}  vs  🟡 {yellow_agent.__class__.__name__}")
-        print("-" * 45)
-        self.board.display()
+        self._log(f"\n🎯 Iniciando partida ({self.board.size}x{self.board.size})")
+        self._log(f"🔴 {red_agent.__class__.__name__}  vs  🟡 {yellow_agent.__class__.__name__}")
+        self._log("-" * 45)
+        if self.verbose:
+            self.board.display()
+
+        try:
+            self._loop(red_agent, yellow_agent)
+        finally:
+            red_agent.stop_pondering()
+            yellow_agent.stop_pondering()
+
+        self._log(f"\n🏁 Ganador final: {self.winner}")
+        self._log("-" * 45)
+
+        record = self.result(red_agent, yellow_agent)
+        if self.recorder is not None:
+            self.recorder.write(record)
+        return record
 
+    def _loop(self, red_agent, yellow_agent):
+        """Bucle de turnos hasta que la partida termina."""
+        last_move = None
         while True:
             start_time = time.time()
             current_agent = red_agent if self.player == "R" else yellow_agent
             color_code = -1 if self.player == "R" else -2
 
+            # Aviso de la jugada del rival (detiene su pondering)
+            if last_move is not None:
+                current_agent.notify_opponent_move(self.board, last_move)
+
             # Calcular jugada del agente
             move = current_agent.compute(self.board, self.remaining[self.player])
             end_time = time.time()
@@ -56,39 +102,68 @@ class Environment:
             # Calcular tiempo transcurrido y actualizar
             elapsed = (end_time - start_time) * 1000  # ms
             self.remaining[self.player] -= elapsed
+            self.moves.append([int(v) for v in move])
+            self.times.append(elapsed)
+            self.clock.append(self.remaining[self.player])
 
             # Validar si el tiempo se agotó antes de aplicar movimiento
             if self.remaining[self.player] <= 0:
                 self.winner = "Y" if self.player == "R" else "R"
+                self.reason = "timeout"
                 loser_name = type(red_agent if self.player == "R" else yellow_agent).__name__
                 winner_name = type(yellow_agent if self.player == "R" else red_agent).__name__
-                print(f"⏰ {self.player} ({loser_name}) agotó su tiempo. "
-                      f"Gana {self.winner} ({winner_name})")
+                self._log(f"⏰ {self.player} ({loser_name}) agotó su tiempo. "
+                          f"Gana {self.winner} ({winner_name})")
                 break
 
             # Aplicar movimiento
             valid = self.board.move(*move, color=color_code)
             if not valid:
                 self.winner = "Y" if self.player == "R" else "R"
+                self.reason = "invalid"
                 name = type(current_agent).__name__
-                print(f"❌ Movimiento inválido de {self.player} ({name}): {move}. "
-                      f"Gana {self.winner}")
+                self._log(f"❌ Movimiento inválido de {self.player} ({name}): {move}. "
+                          f"Gana {self.winner}")
                 break
 
             # Mostrar estado del tablero
             current_winner = self.board.winner()
-            print(f"\n▶️ Turno {self.player} → movimiento {move}")
-            self.board.display()
-
-            if current_winner != " ":
+            if self.verbose:
+                print(f"\n▶️ Turno {self.player} → movimiento {move}")
+                if self.board.last_captured:
+                    print(f"📦 Casillas cerradas: {self.board.last_captured}")
+                self.board.display()
+
+            # Tablero completo: decide el marcador (' ' si es empate)
+            if self.board.filled == self.board.size * self.board.size:
                 self.winner = current_winner
+                self.reason = "score"
                 break
 
             # Cambio de turno
+            last_move = self.moves[-1]
             self.player = "Y" if self.player == "R" else "R"
 
-        print(f"\n🏁 Ganador final: {self.winner}")
-        print("-" * 45)
+    def result(self, red_agent, yellow_agent) -> dict:
+        """
+        Registro compacto de la partida jugada.
+
+        :return: Diccionario con tamaño, agentes, jugadas, tiempos por jugada,
+                 reloj restante, ganador, motivo, marcador y métricas por color
+        """
+        return {
+            "size": self.board.size,
+            "time_limit": self.time_limit,
+            "red": type(red_agent).__name__,
+            "yellow": type(yellow_agent).__name__,
+            "moves": self.moves,
+            "times": self.times,
+            "clock": self.clock,
+            "winner": self.winner,
+            "reason": self.reason,
+            "score": [self.board.red_boxes, self.board.yellow_boxes],
+            "metrics": {"R": red_agent.metrics.snapshot(), "Y": yellow_agent.metrics.snapshot()},
+        }
 
 
 # --------------------------------------------------------------------------
@@ -7,21 +7,27 @@ inspirado en la versión JavaScript del profesor (squares.js).
 
 Contiene:
     - Clase Board: representa el tablero y operaciones sobre él
+    - Clase BitBoard: motor alternativo del tablero basado en bitboards
     - Clase Agent: clase base para los agentes
     - Clase RandomAgent: agente aleatorio (referencia)
     - Clase SmartAgent: agente inteligente (heurístico)
+    - Clase SearchAgent: agente de búsqueda alfa-beta con profundización iterativa
+    - Clase MCTSAgent: agente Monte Carlo Tree Search (UCT)
     
 El paquete permite importar directamente las clases principales:
 
-    from squares import Board, Agent, RandomAgent, SmartAgent
+    from squares import Board, BitBoard, Agent, RandomAgent, SmartAgent, SearchAgent, MCTSAgent
 
 Autor: Equipo Arazaca – UNAL
 Fecha: 2025
 """
 
 from .board import Board
+from .bitboard import BitBoard
 from .agent_base import Agent
 from .random_agent import RandomAgent
 from .smart_agent import SmartAgent
+from .search_agent import SearchAgent
+from .mcts_agent import MCTSAgent
 
-__all__ = ["Board", "Agent", "RandomAgent", "SmartAgent"]
+__all__ = ["Board", "BitBoard", "Agent", "RandomAgent", "SmartAgent", "SearchAgent", "MCTSAgent"]
@@ -8,14 +8,35 @@ del juego Cuadrito (Dots and Boxes).
 Cada agente debe heredar de Agent y sobreescribir el método:
     - compute(board, time): retorna la jugada a realizar.
 
+Opcionalmente puede "pensar en el tiempo del rival" (ponder): tras su
+jugada sigue buscando en un hilo de fondo (ponder_step) hasta que el
+entorno le avisa de la respuesta del rival (notify_opponent_move) o se le
+vuelve a pedir jugada, y aprovecha lo calculado en compute().
+Solo rinde si el rival no compite por el mismo intérprete (agentes JS,
+navegador, otro proceso): dos agentes Python en el mismo proceso se
+reparten el GIL. Con ponder_limit se acota el tiempo total de la búsqueda
+de fondo en cada turno, y cancel_pondering() la detiene sin esperarla.
+
+Cada agente lleva sus contadores y tiempos por fase en `metrics`
+(squares.metrics), que se ponen a cero al empezar cada partida.
+
+Para analizar posiciones sueltas, fuera de una partida (por ejemplo
+/api/analyze/batch), analyze(board, move_time, max_depth) devuelve la
+jugada junto con la valoración y la profundidad cuando el agente las
+conoce.
+
 Basado en la guía del profesor (squares.js).
 
 Autor: Equipo Arazaca – UNAL
 Fecha: 2025
 """
 
+import threading
+import time as _time
 from abc import ABC, abstractmethod
 
+from squares.metrics import Metrics
+
 
 class Agent(ABC):
     """
@@ -32,6 +53,12 @@ class Agent(ABC):
         self.color = color
         self.time_total = 20000  # tiempo total en milisegundos
         self.size = None         # tamaño del tablero (nxn)
+        self.ponder = False      # buscar durante el turno del rival
+        self.ponder_limit = None # segundos de búsqueda de fondo por turno (None = sin tope)
+        self.ponder_deadline = None
+        self.metrics = Metrics() # contadores y tiempos de la partida
+        self._ponder_thread = None
+        self._ponder_stop = threading.Event()
 
     # ----------------------------------------------------------------------
     # Métodos base
@@ -48,6 +75,7 @@ class Agent(ABC):
         self.color = color
         self.time_total = time
         self.size = len(board)
+        self.metrics.reset()
 
     # ----------------------------------------------------------------------
 
@@ -66,3 +94,110 @@ class Agent(ABC):
                      3 = izquierda
         """
         pass
+
+    def analyze(self, board, move_time: int, max_depth: int = None) -> dict:
+        """
+        Analiza una posición suelta con un tope de tiempo y de profundidad.
+        Por defecto es compute() con move_time como reloj; los agentes que
+        miden su búsqueda lo sobreescriben.
+
+        :param board: Tablero a analizar (mueve el color del agente)
+        :param move_time: Tiempo máximo para la posición (ms)
+        :param max_depth: Profundidad máxima (None = la del agente)
+        :return: Diccionario con move, score (o None) y depth (o None)
+        """
+        return {"move": [int(v) for v in self.compute(board, move_time)],
+                "score": None, "depth": None}
+
+    # ----------------------------------------------------------------------
+    # Pondering (búsqueda en el tiempo del rival)
+    # ----------------------------------------------------------------------
+
+    def notify_opponent_move(self, board, move):
+        """
+        Aviso del entorno: el rival jugó `move` y `board` es el tablero
+        resultante. Por defecto detiene la búsqueda de fondo.
+
+        :param board: Tablero tras la jugada del rival
+        :param move: Lista [fila, columna, lado]
+        """
+        self.stop_pondering()
+
+    def ponder_step(self, board) -> bool:
+        """
+        Una unidad de trabajo de la búsqueda de fondo (a implementar por
+        los agentes que saben aprovecharla). El bucle solo mira el tope y
+        la orden de parada entre pasos: un paso largo debe acabar a la hora
+        de step_deadline() y en cuanto se active la parada.
+
+        :param board: Posición tras la jugada propia (mueve el rival)
+        :return: False para terminar la búsqueda de fondo
+        """
+        return False
+
+    def start_pondering(self, board):
+        """
+        Lanza la búsqueda de fondo sobre `board` si el agente tiene activado
+        ponder y sabe aprovecharla. Los agentes la llaman al final de compute().
+
+        :param board: Posición tras la jugada propia
+        """
+        self.stop_pondering()
+        if not self.ponder or type(self).ponder_step is Agent.ponder_step:
+            return
+        self._ponder_stop.clear()
+        self.ponder_deadline = (None if self.ponder_limit is None
+                                else _time.perf_counter() + self.ponder_limit)
+        self._ponder_thread = threading.Thread(target=self._ponder_loop, args=(board,),
+                                               name=f"ponder-{self.color}", daemon=True)
+        self._ponder_thread.start()
+
+    def step_deadline(self, seconds: float) -> float:
+        """
+        Hora límite (perf_counter) de un paso de la búsqueda de fondo:
+        `seconds` desde ahora, sin pasar del tope del turno (ponder_deadline).
+        """
+        deadline = _time.perf_counter() + seconds
+        if self.ponder_deadline is not None:
+            deadline = min(deadline, self.ponder_deadline)
+        return deadline
+
+    def stop_pondering(self):
+        """Detiene la búsqueda de fondo y espera a que termine su paso actual."""
+        thread = self._ponder_thread
+        if thread is None:
+            return
+        self._ponder_stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        self._ponder_thread = None
+
+    def cancel_pondering(self):
+        """
+        Pide a la búsqueda de fondo que termine sin esperarla (no bloquea;
+        útil desde un bucle de eventos). El hilo acaba en su próximo control
+        y suelta entonces su referencia (_ponder_thread).
+        """
+        self._ponder_stop.set()
+        thread = self._ponder_thread
+        if thread is not None and not thread.is_alive():
+            self._ponder_thread = None
+
+    @property
+    def pondering(self) -> bool:
+        """True mientras la búsqueda de fondo está activa."""
+        return self._ponder_thread is not None and self._ponder_thread.is_alive()
+
+    def _ponder_loop(self, board):
+        stop = self._ponder_stop
+        try:
+            while not stop.is_set():
+                deadline = self.ponder_deadline
+                if deadline is not None and _time.perf_counter() >= deadline:
+                    break
+                if not self.ponder_step(board):
+                    break
+        finally:
+            # Cancelada sin esperarla: nadie hará join, se suelta la referencia
+            if stop.is_set() and self._ponder_thread is threading.current_thread():
+                self._ponder_thread = None
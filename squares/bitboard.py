@@ -0,0 +1,440 @@
+"""
+bitboard.py
+===========
+
+Implementa la clase BitBoard, un motor alternativo del tablero de
+Cuadrito (Dots and Boxes) que empaqueta todas las líneas y los dueños
+de las casillas en enteros de Python (bitboards).
+
+A diferencia de Board (lista de listas + deepcopy), BitBoard permite
+aplicar y deshacer jugadas en O(1) mediante make_move / unmake_move,
+lo que lo hace adecuado para agentes de búsqueda.
+
+Para compatibilidad conserva la vista `grid`, los métodos `check`,
+`move`, `valid_moves`, `winner` y `clone` con la misma semántica que
+Board (y que squares.js) y sus contadores (`red_boxes`, `yellow_boxes`,
+`boxes`, `filled`, `free_edges`, `sides_histogram`, `three_sided`), de
+modo que las heurísticas escritas para Board sirven también aquí.
+
+Distribución de bits:
+    - Líneas: índice canónico de squares.edges (bits de `edges`)
+    - Casillas b = i * n + j (bits de `red` y `yellow`)
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+from squares import wire
+from squares.edges import layout
+from squares.zobrist import zobrist_keys, hash_edges
+
+
+class BitBoard:
+    """
+    Tablero basado en bitboards con jugadas incrementales y reversibles.
+
+    Estado:
+        - edges:  entero con un bit por línea dibujada
+        - red:    entero con un bit por casilla del jugador rojo (-1)
+        - yellow: entero con un bit por casilla del jugador amarillo (-2)
+        - hash:   clave Zobrist de las líneas interiores (ver squares.zobrist)
+    """
+
+    def __init__(self, size: int = 3):
+        """
+        Inicializa un tablero vacío (solo con el borde exterior dibujado).
+
+        :param size: Tamaño del tablero (número de casillas por lado)
+        """
+        self.size = size
+        self.layout = layout(size)
+        self.keys = zobrist_keys(size)
+        self.edges = self.layout.border
+        self.red = 0
+        self.yellow = 0
+        self.hash = 0
+        self._history = []
+
+    # ----------------------------------------------------------------------
+    # Conversión desde / hacia la representación clásica
+    # ----------------------------------------------------------------------
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Construye un BitBoard a partir de una matriz al estilo Board.grid.
+
+        :param grid: Lista de listas con valores 0..15, -1 o -2
+        :return: Instancia BitBoard equivalente
+        """
+        b = cls(len(grid))
+        layout = b.layout
+        edges = 0
+        for i, row in enumerate(grid):
+            for j, v in enumerate(row):
+                cell = i * b.size + j
+                sides = layout.cell_edges[cell]
+                if v < 0:
+                    edges |= layout.cell_mask[cell]
+                    if v == -1:
+                        b.red |= 1 << cell
+                    else:
+                        b.yellow |= 1 << cell
+                else:
+                    for s in range(4):
+                        if v & (1 << s):
+                            edges |= 1 << sides[s]
+        b.edges = edges | layout.border
+        b.hash = hash_edges(b.size, b.edges, layout.border)
+        return b
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Construye un BitBoard desde un Board, un BitBoard o una matriz.
+
+        :param board: Instancia Board, BitBoard o lista de listas
+        :return: Instancia BitBoard independiente
+        """
+        if isinstance(board, BitBoard):
+            return board.clone()
+        grid = getattr(board, "grid", board)
+        return cls.from_grid(grid)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_size: int = wire.MAX_SIZE):
+        """
+        Construye un BitBoard desde el formato compacto de squares.wire.
+
+        :param data: Bytes empaquetados
+        :param max_size: Mayor tamaño aceptado (se comprueba antes de crear
+                         las tablas del tamaño)
+        :return: Instancia BitBoard
+        :raises ValueError: Si los datos no son un tablero válido
+        """
+        size, edges, red, yellow = wire.unpack(data, max_size)
+        b = cls(size)
+        b.edges, b.red, b.yellow = edges, red, yellow
+        b.hash = hash_edges(size, edges, b.layout.border)
+        return b
+
+    def to_bytes(self) -> bytes:
+        """Serializa el tablero en el formato compacto de squares.wire."""
+        return wire.pack(self.size, self.edges, self.red, self.yellow)
+
+    @property
+    def grid(self):
+        """
+        Vista compatible con Board.grid (se recalcula en cada acceso).
+
+        :return: Lista de listas con máscaras 0..15 o dueños -1 / -2
+        """
+        n = self.size
+        layout = self.layout
+        edges = self.edges
+        grid = []
+        for i in range(n):
+            row = []
+            for j in range(n):
+                cell = i * n + j
+                bit = 1 << cell
+                if self.red & bit:
+                    row.append(-1)
+                elif self.yellow & bit:
+                    row.append(-2)
+                else:
+                    v = 0
+                    for s, e in enumerate(layout.cell_edges[cell]):
+                        if edges >> e & 1:
+                            v |= 1 << s
+                    row.append(v)
+            grid.append(row)
+        return grid
+
+    # ----------------------------------------------------------------------
+    # Operaciones rápidas sobre índices de línea
+    # ----------------------------------------------------------------------
+
+    def edge_of(self, r: int, c: int, s: int) -> int:
+        """
+        Devuelve el índice de línea correspondiente a (fila, columna, lado).
+
+        :param r: Fila
+        :param c: Columna
+        :param s: Lado (0=arriba, 1=derecha, 2=abajo, 3=izquierda)
+        :return: Índice de la línea en el bitboard
+        """
+        return self.layout.cell_edges[r * self.size + c][s]
+
+    def legal_edges(self):
+        """
+        Índices de las líneas libres, en orden creciente.
+
+        :return: Lista de enteros
+        """
+        free = self.layout.full & ~self.edges
+        out = []
+        while free:
+            low = free & -free
+            out.append(low.bit_length() - 1)
+            free ^= low
+        return out
+
+    def legal_moves(self):
+        """
+        Retorna los movimientos posibles sin duplicados (jugada canónica
+        de cada línea libre), igual que Board.legal_moves.
+
+        :return: Lista de tuplas (fila, columna, lado)
+        """
+        moves = self.layout.moves
+        return [moves[e] for e in self.legal_edges()]
+
+    def make_move(self, e: int, color: int) -> int:
+        """
+        Dibuja la línea e (que debe estar libre) y propaga las capturas.
+        El estado anterior se guarda para poder deshacerlo con unmake_move.
+
+        La jugada se aplica como si se hubiera indicado con su jugada
+        canónica (ver squares.edges.edge_to_move).
+
+        :param e: Índice de la línea
+        :param color: -1 para rojo, -2 para amarillo (quien juega)
+        :return: Número de casillas cerradas por la jugada
+        """
+        cells = self.layout.edge_cells[e]
+        return self._apply(e, color, cells[-1], cells[0], False)
+
+    def unmake_move(self):
+        """
+        Deshace la última jugada aplicada con make_move o move.
+        """
+        self.edges, self.red, self.yellow, self.hash = self._history.pop()
+
+    def _apply(self, e: int, color: int, first: int, second: int, quirk: bool) -> int:
+        """
+        Aplica la línea e replicando el orden de propagación de Board.move:
+        primero se propaga desde la casilla `first` (la indicada en la jugada)
+        sin que `second` vea aún la línea, y luego desde `second`.
+
+        Si la jugada se indicó por el lado de abajo (quirk=True) y `second`
+        quedó cerrada para el amarillo en la primera fase, pasa al rojo,
+        tal como ocurre con `grid[i + 1][j] |= 1` en Board.move y squares.js.
+
+        :return: Número de casillas cerradas
+        """
+        before = self.edges
+        self._history.append((before, self.red, self.yellow, self.hash))
+        self.edges |= 1 << e
+        owned = self.red | self.yellow
+        first_phase = self._settle(first, owned, second, e)
+        captured = first_phase | self._settle(second, owned | first_phase, -1, -1)
+
+        keys = self.keys
+        h = self.hash
+        drawn = self.edges ^ before
+        while drawn:
+            low = drawn & -drawn
+            h ^= keys[low.bit_length() - 1]
+            drawn ^= low
+        self.hash = h
+
+        if color == -2:
+            self.red |= captured
+        else:
+            self.yellow |= captured
+            if quirk and first_phase >> second & 1:
+                self.yellow &= ~(1 << second)
+                self.red |= 1 << second
+        return captured.bit_count()
+
+    def _settle(self, start: int, owned: int, hidden: int, hidden_edge: int) -> int:
+        """
+        Propaga el cierre de casillas (3 o 4 lados) a partir de `start`.
+
+        :param start: Casilla inicial
+        :param owned: Máscara de casillas que ya tienen dueño
+        :param hidden: Casilla que aún no ve la línea `hidden_edge` (-1 si ninguna)
+        :param hidden_edge: Línea oculta para `hidden`
+        :return: Máscara de casillas cerradas
+        """
+        layout = self.layout
+        cell_mask = layout.cell_mask
+        edge_cells = layout.edge_cells
+        edges = self.edges
+        captured = 0
+        stack = [start]
+        while stack:
+            b = stack.pop()
+            bit = 1 << b
+            if (owned | captured) & bit:
+                continue
+            mask = cell_mask[b]
+            drawn = edges & mask
+            if b == hidden:
+                drawn &= ~(1 << hidden_edge)
+            if drawn.bit_count() < 3:
+                continue
+            captured |= bit
+            missing = mask & ~edges
+            if missing:
+                f = missing.bit_length() - 1
+                edges |= missing
+                for c in edge_cells[f]:
+                    if c != b:
+                        stack.append(c)
+        self.edges = edges
+        return captured
+
+    # ----------------------------------------------------------------------
+    # Contadores (equivalentes a los de Board)
+    # ----------------------------------------------------------------------
+
+    @property
+    def red_boxes(self) -> int:
+        """Número de casillas del jugador rojo (-1)."""
+        return self.red.bit_count()
+
+    @property
+    def yellow_boxes(self) -> int:
+        """Número de casillas del jugador amarillo (-2)."""
+        return self.yellow.bit_count()
+
+    def boxes(self, code: int) -> int:
+        """
+        Número de casillas que pertenecen a un jugador.
+
+        :param code: -1 (rojo) o -2 (amarillo)
+        :return: Cantidad de casillas
+        """
+        return (self.red if code == -1 else self.yellow).bit_count()
+
+    @property
+    def filled(self) -> int:
+        """Número total de casillas con dueño."""
+        return (self.red | self.yellow).bit_count()
+
+    @property
+    def free_edges(self) -> int:
+        """Número de líneas que aún se pueden dibujar."""
+        return (self.layout.full & ~self.edges).bit_count()
+
+    @property
+    def sides_histogram(self):
+        """
+        Tupla con el número de casillas libres con 0, 1, 2 y 3 lados
+        (se recalcula en cada acceso a partir de las máscaras).
+        """
+        hist = [0, 0, 0, 0, 0]
+        owned = self.red | self.yellow
+        edges = self.edges
+        for cell, mask in enumerate(self.layout.cell_mask):
+            if not owned >> cell & 1:
+                hist[(edges & mask).bit_count()] += 1
+        return tuple(hist[:4])
+
+    @property
+    def three_sided(self) -> int:
+        """Número de casillas libres con exactamente tres lados."""
+        return self.sides_histogram[3]
+
+    # ----------------------------------------------------------------------
+    # API compatible con Board
+    # ----------------------------------------------------------------------
+
+    def clone(self):
+        """
+        Devuelve otra instancia BitBoard con el mismo estado (sin historial).
+
+        :return: Copia independiente del tablero
+        """
+        b = BitBoard.__new__(BitBoard)
+        b.size = self.size
+        b.layout = self.layout
+        b.keys = self.keys
+        b.hash = self.hash
+        b.edges = self.edges
+        b.red = self.red
+        b.yellow = self.yellow
+        b._history = []
+        return b
+
+    def check(self, r: int, c: int, s: int) -> bool:
+        """
+        Determina si se puede dibujar una línea en (r,c) en el lado s.
+
+        :param r: Fila
+        :param c: Columna
+        :param s: Lado (0=arriba, 1=derecha, 2=abajo, 3=izquierda)
+        :return: True si el movimiento es válido (False fuera del tablero)
+        """
+        n = self.size
+        if not (0 <= r < n and 0 <= c < n and 0 <= s < 4):
+            return False
+        cell = r * n + c
+        if (self.red | self.yellow) >> cell & 1:
+            return False
+        return not self.edges >> self.layout.cell_edges[cell][s] & 1
+
+    def valid_moves(self):
+        """
+        Retorna una lista de todos los movimientos posibles
+        (con la misma enumeración que Board.valid_moves).
+
+        :return: Lista de tuplas (fila, columna, lado)
+        """
+        moves = []
+        n = self.size
+        edges = self.edges
+        owned = self.red | self.yellow
+        for cell, sides in enumerate(self.layout.cell_edges):
+            if owned >> cell & 1:
+                continue
+            i, j = divmod(cell, n)
+            for s in range(4):
+                if not edges >> sides[s] & 1:
+                    moves.append((i, j, s))
+        return moves
+
+    def move(self, i: int, j: int, s: int, color: int) -> bool:
+        """
+        Realiza un movimiento en el tablero (semántica de Board.move).
+
+        :param i: Fila
+        :param j: Columna
+        :param s: Lado (0,1,2,3)
+        :param color: -1 para rojo, -2 para amarillo
+        :return: True si el movimiento fue válido, False si no
+        """
+        if not self.check(i, j, s):
+            return False
+        e = self.edge_of(i, j, s)
+        first = i * self.size + j
+        cells = self.layout.edge_cells[e]
+        second = cells[0] if cells[-1] == first else cells[-1]
+        self._apply(e, color, first, second, s == 2)
+        return True
+
+    def winner(self) -> str:
+        """
+        Determina si hay un ganador.
+
+        :return: 'R', 'Y' o ' ' (ninguno)
+        """
+        cr = self.red.bit_count()
+        cy = self.yellow.bit_count()
+        if cr + cy < self.layout.n_cells:
+            return " "
+        if cr > cy:
+            return "R"
+        if cy > cr:
+            return "Y"
+        return " "
+
+    def display(self):
+        """
+        Muestra el tablero en texto (para depuración), igual que Board.display.
+        """
+        for i, row in enumerate(self.grid):
+            print(f"{i:02} | " + " ".join(f"{v:2}" for v in row))
+        print("-" * (self.size * 3 + 5))
@@ -12,7 +12,18 @@ Autor: Equipo Arazaca – UNAL
 Fecha: 2025
 """
 
-from copy import deepcopy
+from squares import wire
+from squares.edges import layout
+from squares.zobrist import zobrist_keys
+
+# Número de lados dibujados para cada máscara 0..15
+_BITS = tuple(bin(v).count("1") for v in range(16))
+
+# Lados que _fill recorre según el valor de la casilla (15 = todos, o el que falta)
+_FILL_SIDES = {15: (0, 1, 2, 3), 14: (0,), 13: (1,), 11: (2,), 7: (3,)}
+
+# Vecino a través de cada lado: (desplazamiento fila, columna, bit que gana el vecino)
+_NEIGHBOURS = ((-1, 0, 4), (0, 1, 8), (1, 0, 1), (0, -1, 2))
 
 
 class Board:
@@ -28,7 +39,72 @@ class Board:
         :param size: Tamaño del tablero (número de casillas por lado)
         """
         self.size = size
+        self.layout = layout(size)
+        self.keys = zobrist_keys(size)
         self.grid = self.init(size)
+        self.last_captured = []
+        self._history = []
+        self._recount()
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Construye un Board a partir de una matriz al estilo Board.grid / squares.js.
+
+        :param grid: Lista de listas cuadrada con valores 0..15, -1 o -2
+        :return: Instancia Board con una copia de la matriz
+        """
+        size = len(grid)
+        if any(len(row) != size for row in grid):
+            raise ValueError("El tablero debe ser cuadrado")
+        if any(v < -2 or v > 15 for row in grid for v in row):
+            raise ValueError("Valores de casilla fuera de rango (-2..15)")
+        return cls._wrap(size, [list(row) for row in grid])
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_size: int = wire.MAX_SIZE):
+        """
+        Construye un Board desde el formato compacto de squares.wire
+        (líneas y dueños empaquetados).
+
+        :param data: Bytes empaquetados
+        :param max_size: Mayor tamaño aceptado (se comprueba antes de crear
+                         las tablas del tamaño)
+        :return: Instancia Board
+        :raises ValueError: Si los datos no son un tablero válido
+        """
+        size, grid = wire.decode_grid(data, max_size)
+        return cls._wrap(size, grid)
+
+    @classmethod
+    def from_base64(cls, text: str, max_size: int = wire.MAX_SIZE):
+        """Igual que from_bytes(), desde el texto base64 de to_base64()."""
+        return cls.from_bytes(wire.from_base64(text), max_size)
+
+    @classmethod
+    def _wrap(cls, size: int, grid):
+        """Crea el Board sobre una matriz ya validada (sin copiarla)."""
+        b = cls.__new__(cls)
+        b.size = size
+        b.layout = layout(size)
+        b.keys = zobrist_keys(size)
+        b.grid = grid
+        b.last_captured = []
+        b._history = []
+        b._recount()
+        return b
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializa el tablero en el formato compacto de squares.wire.
+
+        :return: Bytes empaquetados
+        """
+        return wire.encode_grid(self.grid)
+
+    def to_base64(self) -> str:
+        """Formato compacto en base64 (para JSON)."""
+        return wire.to_base64(self.to_bytes())
 
     # ----------------------------------------------------------------------
     # Métodos principales del tablero
@@ -64,15 +140,140 @@ class Board:
         board[m][m] = 6
         return board
 
+    # ----------------------------------------------------------------------
+    # Contadores incrementales
+    # ----------------------------------------------------------------------
+
+    def _recount(self):
+        """
+        Recalcula desde cero los contadores del tablero:
+        casillas de cada jugador, casillas libres según lados dibujados
+        y clave Zobrist. Solo se usa al crear el tablero; move() los
+        mantiene al día.
+        """
+        self._owned = [0, 0]          # casillas de -1 (rojo) y -2 (amarillo)
+        self._sides = [0] * 5         # casillas libres con 0..4 lados
+        self.hash = 0                 # clave Zobrist de las líneas interiores
+        cell_edges = self.layout.cell_edges
+        for i, row in enumerate(self.grid):
+            for j, v in enumerate(row):
+                if v < 0:
+                    self._owned[-v - 1] += 1
+                    v = 15
+                else:
+                    self._sides[_BITS[v]] += 1
+                # Cada línea se cuenta desde su casilla de abajo / derecha
+                sides = cell_edges[i * self.size + j]
+                if v & 1 and i > 0:
+                    self.hash ^= self.keys[sides[0]]
+                if v & 8 and j > 0:
+                    self.hash ^= self.keys[sides[3]]
+        self._free = None             # conjunto de líneas libres (perezoso)
+
+    def _set(self, i: int, j: int, value: int):
+        """
+        Escribe una celda del tablero actualizando los contadores.
+
+        :param i: Fila
+        :param j: Columna
+        :param value: Nuevo valor (máscara 0..15 o dueño -1 / -2)
+        """
+        old = self.grid[i][j]
+        self._journal.append((i, j, old))
+        if old < 0:
+            # Solo ocurre al pasar de -2 a -1 (ver BitBoard._apply)
+            self._owned[-old - 1] -= 1
+            self._owned[-value - 1] += 1
+            self.grid[i][j] = value
+            return
+        self._sides[_BITS[old]] -= 1
+        if value < 0:
+            self._owned[-value - 1] += 1
+            drawn = 15 & ~old      # al cerrarse, sus lados libres quedan dibujados
+        else:
+            self._sides[_BITS[value]] += 1
+            drawn = value & ~old
+        if drawn:
+            sides = self.layout.cell_edges[i * self.size + j]
+            # Cada línea se registra una sola vez: desde su casilla de abajo / derecha
+            if drawn & 1 and i > 0:
+                self.hash ^= self.keys[sides[0]]
+            if drawn & 8 and j > 0:
+                self.hash ^= self.keys[sides[3]]
+            free = self._free
+            if free is not None:
+                for s in range(4):
+                    if drawn >> s & 1 and sides[s] in free:
+                        free.discard(sides[s])
+                        self._removed.append(sides[s])
+        self.grid[i][j] = value
+
+    @property
+    def red_boxes(self) -> int:
+        """Número de casillas del jugador rojo (-1)."""
+        return self._owned[0]
+
+    @property
+    def yellow_boxes(self) -> int:
+        """Número de casillas del jugador amarillo (-2)."""
+        return self._owned[1]
+
+    def boxes(self, code: int) -> int:
+        """
+        Número de casillas que pertenecen a un jugador.
+
+        :param code: -1 (rojo) o -2 (amarillo)
+        :return: Cantidad de casillas
+        """
+        return self._owned[-code - 1]
+
+    @property
+    def filled(self) -> int:
+        """Número total de casillas con dueño."""
+        return self._owned[0] + self._owned[1]
+
+    @property
+    def sides_histogram(self):
+        """Tupla con el número de casillas libres con 0, 1, 2 y 3 lados."""
+        return tuple(self._sides[:4])
+
+    @property
+    def three_sided(self) -> int:
+        """Número de casillas libres con exactamente tres lados."""
+        return self._sides[3]
+
+    @property
+    def free_edges(self) -> int:
+        """
+        Número de líneas que aún se pueden dibujar.
+        Cada línea libre separa dos casillas libres (el borde ya está dibujado),
+        por lo que se obtiene a partir del histograma de lados.
+        """
+        h = self._sides
+        return (4 * h[0] + 3 * h[1] + 2 * h[2] + h[3]) // 2
+
     # ----------------------------------------------------------------------
 
     def clone(self):
         """
-        Devuelve **otra instancia Board** (deepcopy) con el mismo estado.
+        Devuelve **otra instancia Board** con el mismo estado.
+        Copia la matriz y los contadores; las tablas de líneas se comparten
+        y el historial de undo() no se copia.
 
         :return: Objeto Board idéntico al actual, pero independiente.
         """
-        return deepcopy(self)
+        b = Board.__new__(Board)
+        b.size = self.size
+        b.layout = self.layout
+        b.keys = self.keys
+        b.hash = self.hash
+        b.grid = [row[:] for row in self.grid]
+        b._owned = self._owned[:]
+        b._sides = self._sides[:]
+        b._free = None if self._free is None else set(self._free)
+        b.last_captured = []
+        b._history = []
+        return b
 
     # ----------------------------------------------------------------------
 
@@ -83,9 +284,10 @@ class Board:
         :param r: Fila
         :param c: Columna
         :param s: Lado (0=arriba, 1=derecha, 2=abajo, 3=izquierda)
-        :return: True si el movimiento es válido
+        :return: True si el movimiento es válido (False fuera del tablero)
         """
-        if self.grid[r][c] < 0:
+        n = self.size
+        if not (0 <= r < n and 0 <= c < n and 0 <= s < 4) or self.grid[r][c] < 0:
             return False
         mask = 1 << s
         return (self.grid[r][c] & mask) != mask
@@ -108,42 +310,76 @@ class Board:
 
     # ----------------------------------------------------------------------
 
+    def free_edge_ids(self):
+        """
+        Conjunto de índices canónicos (ver squares.edges) de las líneas libres.
+        Se construye la primera vez que se pide y luego move() lo mantiene.
+
+        :return: Conjunto de enteros (no modificar)
+        """
+        if self._free is None:
+            free = set()
+            for e in self.layout.interior:
+                i, j, s = self.layout.moves[e]
+                if self.grid[i][j] >= 0 and not self.grid[i][j] >> s & 1:
+                    free.add(e)
+            self._free = free
+        return self._free
+
+    def legal_moves(self):
+        """
+        Retorna los movimientos posibles sin duplicados: una jugada
+        canónica por cada línea libre, en orden de índice.
+
+        :return: Lista de tuplas (fila, columna, lado)
+        """
+        moves = self.layout.moves
+        return [moves[e] for e in sorted(self.free_edge_ids())]
+
+    # ----------------------------------------------------------------------
+
     def _fill(self, i: int, j: int, color: int):
         """
         Marca una casilla completada (-1 o -2) y propaga la actualización
         a las celdas vecinas, igual que en el código JS original.
 
+        Es iterativo: una pila explícita reproduce el orden exacto de la
+        versión recursiva (profundidad primero, lado por lado), así que
+        las cadenas largas de tableros grandes no agotan la pila de Python.
+        Las casillas capturadas se añaden a self.last_captured.
+
         :param i: Fila
         :param j: Columna
         :param color: Código del jugador (-1 rojo, -2 amarillo)
         """
-        if i < 0 or i >= self.size or j < 0 or j >= self.size:
+        n = self.size
+        grid = self.grid
+        if i < 0 or i >= n or j < 0 or j >= n:
             return
-
-        cell = self.grid[i][j]
-        if cell in (15, 14):
-            self.grid[i][j] = color
-            if i > 0 and self.grid[i - 1][j] >= 0:
-                self.grid[i - 1][j] += 4
-                self._fill(i - 1, j, color)
-
-        if cell in (15, 13):
-            self.grid[i][j] = color
-            if j < self.size - 1 and self.grid[i][j + 1] >= 0:
-                self.grid[i][j + 1] += 8
-                self._fill(i, j + 1, color)
-
-        if cell in (15, 11):
-            self.grid[i][j] = color
-            if i < self.size - 1 and self.grid[i + 1][j] >= 0:
-                self.grid[i + 1][j] += 1
-                self._fill(i + 1, j, color)
-
-        if cell in (15, 7):
-            self.grid[i][j] = color
-            if j > 0 and self.grid[i][j - 1] >= 0:
-                self.grid[i][j - 1] += 2
-                self._fill(i, j - 1, color)
+        sides = _FILL_SIDES.get(grid[i][j])
+        if sides is None:
+            return
+        captured = self.last_captured
+        # Marco pendiente: (fila, columna, lados por recorrer); None = entrar en la casilla
+        stack = [(i, j, sides)]
+        while stack:
+            i, j, sides = stack.pop()
+            if sides is None:
+                sides = _FILL_SIDES.get(grid[i][j])
+                if sides is None:
+                    continue
+            for k, s in enumerate(sides):
+                if grid[i][j] >= 0:
+                    captured.append((i, j))
+                self._set(i, j, color)
+                di, dj, bit = _NEIGHBOURS[s]
+                ni, nj = i + di, j + dj
+                if 0 <= ni < n and 0 <= nj < n and grid[ni][nj] >= 0:
+                    self._set(ni, nj, grid[ni][nj] + bit)
+                    # Continuar con los lados restantes al volver del vecino
+                    stack.append((i, j, sides[k + 1:]))
+                    stack.append((ni, nj, None))
+                    break
 
     # ----------------------------------------------------------------------
 
@@ -151,6 +387,10 @@ class Board:
         """
         Realiza un movimiento en el tablero.
 
+        Las casillas cerradas por la jugada (en orden de captura) quedan en
+        self.last_captured; su dueño es el rival de quien juega (salvo el
+        caso heredado descrito en BitBoard._apply).
+
         :param i: Fila
         :param j: Columna
         :param s: Lado (0,1,2,3)
@@ -158,27 +398,63 @@ class Board:
         :return: True si el movimiento fue válido, False si no
         """
         if not self.check(i, j, s):
+            self.last_captured = []
             return False
 
+        # Estado previo para undo(): celdas tocadas y líneas libres quitadas
+        # (se llenan en _set) y contadores
+        self._journal = []
+        self._removed = [] if self._free is not None else None
+        self._history.append((self._journal, self._removed, self.hash, self._owned[:],
+                              self._sides[:], self.last_captured))
+        self.last_captured = []
+
         ocolor = -1 if color == -2 else -2
-        self.grid[i][j] |= (1 << s)
+        self._set(i, j, self.grid[i][j] | (1 << s))
         self._fill(i, j, ocolor)
 
         # actualiza celdas vecinas
         if i > 0 and s == 0:
-            self.grid[i - 1][j] |= 4
+            self._set(i - 1, j, self.grid[i - 1][j] | 4)
             self._fill(i - 1, j, ocolor)
         if i < self.size - 1 and s == 2:
-            self.grid[i + 1][j] |= 1
+            self._set(i + 1, j, self.grid[i + 1][j] | 1)
             self._fill(i + 1, j, ocolor)
         if j > 0 and s == 3:
-            self.grid[i][j - 1] |= 2
+            self._set(i, j - 1, self.grid[i][j - 1] | 2)
             self._fill(i, j - 1, ocolor)
         if j < self.size - 1 and s == 1:
-            self.grid[i][j + 1] |= 8
+            self._set(i, j + 1, self.grid[i][j + 1] | 8)
             self._fill(i, j + 1, ocolor)
         return True
 
+    def undo(self) -> bool:
+        """
+        Deshace la última jugada válida: restaura exactamente las celdas que
+        tocó (lados de la casilla y de sus vecinas, casillas capturadas),
+        los contadores, la clave Zobrist y el conjunto de líneas libres.
+
+        Permite a los agentes explorar jugadas sobre el mismo tablero
+        sin clonarlo.
+
+        :return: True si se deshizo una jugada, False si no había ninguna
+        """
+        if not self._history:
+            return False
+        (journal, removed, self.hash, self._owned, self._sides,
+         self.last_captured) = self._history.pop()
+        grid = self.grid
+        for i, j, old in reversed(journal):
+            grid[i][j] = old
+
+        if self._free is not None:
+            if removed is None:
+                # El conjunto se construyó después de la jugada: se rehace al pedirlo
+                self._free = None
+            else:
+                self._free.update(removed)
+        return True
+
     # ----------------------------------------------------------------------
 
     def winner(self) -> str:
@@ -187,15 +463,7 @@ class Board:
 
         :return: 'R', 'Y' o ' ' (ninguno)
         """
-        cr = cy = 0
-        for i in range(self.size):
-            for j in range(self.size):
-                cell = self.grid[i][j]
-                if cell < 0:
-                    if cell == -1:
-                        cr += 1
-                    else:
-                        cy += 1
+        cr, cy = self._owned
         total = self.size * self.size
         if cr + cy < total:
             return " "
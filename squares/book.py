@@ -0,0 +1,293 @@
+"""
+book.py
+=======
+
+Libro de aperturas de Cuadrito (Dots and Boxes) en disco.
+
+Un generador fuera de línea recorre las primeras jugadas de un tamaño de
+tablero, busca a fondo cada posición con SearchAgent y guarda la mejor
+línea en una tabla compacta. Un cargador la abre con mmap, de modo que
+los agentes consultan una jugada en microsegundos y sin coste de arranque;
+si la posición no está en el libro, el agente sigue con su búsqueda.
+
+Reducción por simetría:
+    Las 8 simetrías del cuadrado (rotaciones y reflejos) dejan el juego
+    igual, así que cada posición se guarda una sola vez, con la forma
+    canónica de menor valor de su conjunto de líneas. Como el valor de una
+    posición solo depende de las líneas dibujadas (ver squares.zobrist),
+    la clave no incluye a los dueños de las casillas.
+
+Formato del archivo (little-endian):
+    - Cabecera de 16 bytes: magia b"CQBK", versión, tamaño, relleno, número de posiciones
+    - Claves: enteros sin signo de 64 bits (líneas dibujadas), ordenadas
+    - Jugadas: enteros sin signo de 16 bits (línea canónica a jugar)
+
+Ejemplo:
+
+    python build_book.py --size 4 --plies 4 --time 500 --out libro4.book
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import bisect
+import mmap
+import struct
+
+from squares.bitboard import BitBoard
+from squares.edges import layout
+
+_MAGIC = b"CQBK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHQ")   # magia, versión, tamaño, relleno, posiciones
+
+# El libro solo admite tableros cuyas líneas caben en una clave de 64 bits
+MAX_BOOK_SIZE = 5
+
+_SYMMETRIES = {}
+_BYTE_TABLES = {}
+
+
+# --------------------------------------------------------------------------
+# Simetrías
+# --------------------------------------------------------------------------
+
+def symmetries(size: int):
+    """
+    Permutaciones de líneas de las 8 simetrías del tablero.
+
+    :param size: Tamaño del tablero
+    :return: Lista de 8 listas `perm`, con perm[e] = imagen de la línea e
+    """
+    perms = _SYMMETRIES.get(size)
+    if perms is not None:
+        return perms
+    n = size
+    lay = layout(size)
+
+    def rotate(i, j, s):      # giro de 90° en sentido horario
+        return j, n - 1 - i, (s + 1) % 4
+
+    def mirror(i, j, s):      # reflejo izquierda-derecha
+        return i, n - 1 - j, (0, 3, 2, 1)[s]
+
+    perms = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = [0] * lay.n_edges
+            for i in range(n):
+                for j in range(n):
+                    for s in range(4):
+                        a, b, t = mirror(i, j, s) if flip else (i, j, s)
+                        for _ in range(turns):
+                            a, b, t = rotate(a, b, t)
+                        perm[lay.cell_edges[i * n + j][s]] = lay.cell_edges[a * n + b][t]
+            perms.append(perm)
+    _SYMMETRIES[size] = perms
+    return perms
+
+
+def _permute(edges: int, perm) -> int:
+    out = 0
+    while edges:
+        low = edges & -edges
+        out |= 1 << perm[low.bit_length() - 1]
+        edges ^= low
+    return out
+
+
+def _byte_tables(size: int):
+    """
+    Para cada simetría, la imagen precalculada de cada byte de la máscara
+    de líneas (así una permutación cuesta una consulta por byte).
+    """
+    tables = _BYTE_TABLES.get(size)
+    if tables is None:
+        n_bytes = (layout(size).n_edges + 7) // 8
+        tables = []
+        for perm in symmetries(size):
+            padded = perm + list(range(len(perm), 8 * n_bytes))
+            tables.append([[_permute(b << (8 * k), padded) for b in range(256)]
+                           for k in range(n_bytes)])
+        _BYTE_TABLES[size] = tables
+    return tables
+
+
+def canonical(size: int, edges: int):
+    """
+    Forma canónica de un conjunto de líneas.
+
+    :param size: Tamaño del tablero
+    :param edges: Máscara de líneas dibujadas
+    :return: Tupla (máscara canónica, índice de la simetría usada)
+    """
+    best, best_k = None, 0
+    for k, chunks in enumerate(_byte_tables(size)):
+        image = 0
+        rest = edges
+        for table in chunks:
+            image |= table[rest & 255]
+            rest >>= 8
+        if best is None or image < best:
+            best, best_k = image, k
+    return best, best_k
+
+
+# --------------------------------------------------------------------------
+# Lectura
+# --------------------------------------------------------------------------
+
+class OpeningBook:
+    """
+    Libro de aperturas abierto con mmap (solo lectura).
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Archivo generado con write_book / generate
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, _, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path!r} no es un libro de aperturas válido")
+        self.size = size
+        self.count = count
+        view = memoryview(self._map)
+        start = _HEADER.size
+        self._keys = view[start:start + 8 * count].cast("Q")
+        start += 8 * count
+        self._moves = view[start:start + 2 * count].cast("H")
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, board):
+        """
+        Línea del libro para la posición, o None si no está.
+
+        :param board: Board, BitBoard o matriz (del tamaño del libro)
+        :return: Índice de línea (en la orientación del tablero dado) o None
+        """
+        bb = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+        if bb.size != self.size:
+            return None
+        key, k = canonical(self.size, bb.edges)
+        pos = bisect.bisect_left(self._keys, key)
+        if pos == self.count or self._keys[pos] != key:
+            return None
+        move = self._moves[pos]
+        return symmetries(self.size)[k].index(move)
+
+    def move(self, board):
+        """
+        Jugada del libro en el formato de Agent.compute.
+
+        :return: Lista [fila, columna, lado] o None si la posición no está
+        """
+        e = self.lookup(board)
+        if e is None:
+            return None
+        return list(layout(self.size).moves[e])
+
+    def close(self):
+        """Libera el mapeo y cierra el archivo."""
+        for attr in ("_keys", "_moves"):
+            view = getattr(self, attr, None)
+            if view is not None:
+                view.release()
+                setattr(self, attr, None)
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_book(book):
+    """
+    Acepta un OpeningBook, una ruta o None.
+
+    :return: OpeningBook o None
+    """
+    if book is None or isinstance(book, OpeningBook):
+        return book
+    return OpeningBook(book)
+
+
+# --------------------------------------------------------------------------
+# Escritura y generación
+# --------------------------------------------------------------------------
+
+def write_book(path: str, size: int, entries: dict):
+    """
+    Escribe un libro de aperturas.
+
+    :param path: Archivo de salida
+    :param size: Tamaño del tablero
+    :param entries: Diccionario {máscara canónica: línea canónica}
+    """
+    keys = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, size, 0, len(keys)))
+        f.write(struct.pack(f"<{len(keys)}Q", *keys))
+        f.write(struct.pack(f"<{len(keys)}H", *(entries[k] for k in keys)))
+
+
+def generate(size: int, plies: int, time_ms: int = 500, verbose: bool = False) -> dict:
+    """
+    Calcula las posiciones del libro.
+
+    Para cada color se recorren las primeras `plies` jugadas: en los turnos
+    del libro solo se sigue la jugada elegida y en los del rival todas.
+
+    :param size: Tamaño del tablero (hasta MAX_BOOK_SIZE)
+    :param plies: Profundidad del libro en jugadas
+    :param time_ms: Tiempo de búsqueda por posición (ms)
+    :param verbose: Muestra el progreso
+    :return: Diccionario {máscara canónica: línea canónica}
+    """
+    from squares.search_agent import SearchAgent
+
+    if size > MAX_BOOK_SIZE:
+        raise ValueError(f"El libro admite tableros de hasta {MAX_BOOK_SIZE}x{MAX_BOOK_SIZE}")
+    agent = SearchAgent(max_move_time=time_ms, reserve=0, tt_mb=64)
+    agent.init("R", BitBoard(size).grid, 10 ** 9)
+    perms = symmetries(size)
+    entries = {}
+    seen = set()
+
+    def book_move(bb):
+        key, k = canonical(size, bb.edges)
+        if key not in entries:
+            r, c, s = agent.compute(bb, 10 ** 9)
+            entries[key] = perms[k][bb.edge_of(r, c, s)]
+            if verbose:
+                print(f"  {len(entries)} posiciones")
+        return perms[k].index(entries[key])
+
+    def walk(bb, ply, color, mine):
+        if ply == plies or not bb.legal_edges():
+            return
+        key = (canonical(size, bb.edges)[0], color == mine)
+        if key in seen:
+            return
+        seen.add(key)
+        other = -1 if color == -2 else -2
+        moves = [book_move(bb)] if color == mine else bb.legal_edges()
+        for e in moves:
+            bb.make_move(e, color)
+            walk(bb, ply + 1, other, mine)
+            bb.unmake_move()
+
+    for mine in (-1, -2):
+        walk(BitBoard(size), 0, -1, mine)
+    return entries
+
@@ -0,0 +1,354 @@
+"""
+chains.py
+=========
+
+Descomposición del tablero en cadenas, ciclos y componentes, y
+evaluador exacto del final de partida de Cuadrito (Dots and Boxes).
+
+Con las reglas de squares.js, una casilla con tres lados se cierra sola
+(se dibuja su cuarto lado) y se entrega al rival de quien jugó, en
+cascada por sus vecinas; además el turno siempre pasa. Por eso:
+
+    - Una línea es "segura" si no deja ninguna casilla con tres lados
+      (sus dos casillas tienen como mucho un lado dibujado).
+    - Cuando no quedan líneas seguras, dibujar cualquier línea de una
+      cadena (o ciclo) entrega la cadena completa al rival, y el
+      resultado es el mismo sea cual sea la línea elegida.
+
+Así, el final se reduce a elegir qué cadena regalar en cada turno, y se
+puede resolver de forma exacta con minimax sobre cadenas en lugar de
+sobre líneas. (La regla clásica de la cadena larga y el "double-dealing"
+no aplican aquí: no hay turno extra ni se puede rechazar la captura.)
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import time as _time
+
+from squares.bitboard import BitBoard
+
+
+class Chain:
+    """
+    Cadena (camino) o ciclo de casillas libres con dos lados dibujados.
+
+    Atributos:
+        - cells: casillas en orden de recorrido
+        - edges: líneas libres que tocan la cadena (incluye las de los extremos)
+        - ends:  casillas de unión (con 3 o 4 líneas libres) en los extremos
+        - loop:  True si la cadena se cierra sobre sí misma
+    """
+
+    __slots__ = ("cells", "edges", "ends", "loop")
+
+    def __init__(self, cells, edges, ends, loop):
+        self.cells = tuple(cells)
+        self.edges = tuple(edges)
+        self.ends = tuple(ends)
+        self.loop = loop
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        kind = "Loop" if self.loop else "Chain"
+        return f"{kind}(len={len(self.cells)}, ends={self.ends})"
+
+
+class Decomposition:
+    """
+    Estructura de un tablero: cadenas, ciclos, casillas de unión
+    y componentes independientes (casillas libres conectadas por líneas libres).
+    """
+
+    def __init__(self, chains, loops, junctions, components):
+        self.chains = chains
+        self.loops = loops
+        self.junctions = junctions
+        self.components = components
+
+    def all(self):
+        """Cadenas y ciclos juntos."""
+        return self.chains + self.loops
+
+
+# --------------------------------------------------------------------------
+# Utilidades sobre BitBoard
+# --------------------------------------------------------------------------
+
+def _as_bitboard(board):
+    """Acepta Board, BitBoard o matriz y devuelve un BitBoard."""
+    if isinstance(board, BitBoard):
+        return board
+    return BitBoard.from_board(board)
+
+
+def _free_edges_of(bb: BitBoard, cell: int):
+    """Líneas libres de una casilla."""
+    edges = bb.edges
+    return [e for e in bb.layout.cell_edges[cell] if not edges >> e & 1]
+
+
+def safe_edges(board):
+    """
+    Líneas libres que no dejan ninguna casilla con tres lados.
+
+    :param board: Board, BitBoard o matriz
+    :return: Lista de índices de línea
+    """
+    bb = _as_bitboard(board)
+    edges = bb.edges
+    layout = bb.layout
+    cell_mask = layout.cell_mask
+    safe = []
+    for e in bb.legal_edges():
+        for c in layout.edge_cells[e]:
+            if (edges & cell_mask[c]).bit_count() >= 2:
+                break
+        else:
+            safe.append(e)
+    return safe
+
+
+def has_safe_edge(board) -> bool:
+    """
+    True si queda alguna línea segura (se detiene en la primera).
+
+    :param board: Board, BitBoard o matriz
+    """
+    bb = _as_bitboard(board)
+    edges = bb.edges
+    layout = bb.layout
+    cell_mask = layout.cell_mask
+    edge_cells = layout.edge_cells
+    free = layout.full & ~edges
+    while free:
+        low = free & -free
+        for c in edge_cells[low.bit_length() - 1]:
+            if (edges & cell_mask[c]).bit_count() >= 2:
+                break
+        else:
+            return True
+        free ^= low
+    return False
+
+
+def decompose(board) -> Decomposition:
+    """
+    Descompone las casillas libres del tablero en cadenas, ciclos,
+    casillas de unión y componentes conectadas.
+
+    :param board: Board, BitBoard o matriz
+    :return: Decomposition
+    """
+    bb = _as_bitboard(board)
+    layout = bb.layout
+    edge_cells = layout.edge_cells
+    owned = bb.red | bb.yellow
+
+    free_cells = [c for c in range(layout.n_cells) if not owned >> c & 1]
+    free_of = {c: _free_edges_of(bb, c) for c in free_cells}
+    junctions = [c for c in free_cells if len(free_of[c]) >= 3]
+
+    def other(e, c):
+        a = edge_cells[e]
+        return a[0] if a[-1] == c else a[-1]
+
+    # Cadenas y ciclos: casillas con como mucho dos líneas libres
+    chains, loops = [], []
+    seen = set()
+    for c in free_cells:
+        if c in seen or len(free_of[c]) > 2:
+            continue
+        # Extender hacia ambos lados hasta una unión o hasta cerrar el ciclo
+        group = {c}
+        stack = [c]
+        while stack:
+            x = stack.pop()
+            for e in free_of[x]:
+                y = other(e, x)
+                if y not in group and len(free_of[y]) <= 2:
+                    group.add(y)
+                    stack.append(y)
+        seen |= group
+
+        edges = sorted(set(e for x in group for e in free_of[x]))
+        ends = [other(e, x) for x in group for e in free_of[x] if other(e, x) not in group]
+
+        # Orden de recorrido desde un extremo (o desde cualquier casilla en un ciclo)
+        inner = {x: [other(e, x) for e in free_of[x] if other(e, x) in group] for x in group}
+        start = next((x for x in group if len(inner[x]) < 2), c)
+        order, x = [], start
+        while x is not None:
+            order.append(x)
+            x = next((y for y in inner[x] if y not in order), None)
+
+        if not ends and all(len(free_of[x]) == 2 for x in group):
+            loops.append(Chain(order, edges, (), True))
+        else:
+            chains.append(Chain(order, edges, ends, False))
+
+    # Componentes independientes
+    components = []
+    done = set()
+    for c in free_cells:
+        if c in done:
+            continue
+        comp = {c}
+        stack = [c]
+        while stack:
+            x = stack.pop()
+            for e in free_of[x]:
+                y = other(e, x)
+                if y not in comp:
+                    comp.add(y)
+                    stack.append(y)
+        done |= comp
+        components.append(sorted(comp))
+
+    return Decomposition(chains, loops, junctions, components)
+
+
+# --------------------------------------------------------------------------
+# Evaluador exacto del final
+# --------------------------------------------------------------------------
+
+class _Budget(Exception):
+    """Se lanza cuando la resolución supera el límite de nodos."""
+
+
+class Timeout(Exception):
+    """
+    Se lanza cuando la resolución pasa la hora límite (deadline) de quien
+    la pidió; a diferencia del límite de nodos, no se captura aquí para que
+    la búsqueda que llamó al solver corte también.
+    """
+
+
+class EndgameSolver:
+    """
+    Resuelve de forma exacta posiciones sin líneas seguras.
+
+    El valor es la diferencia de casillas (propias - rivales) que obtendrá
+    quien mueve desde la posición hasta el final. Los resultados se
+    memorizan por clave Zobrist (solo dependen de las líneas dibujadas).
+
+    Cada llamada puede recibir una hora límite (time.perf_counter()): se
+    revisa en cada nodo (cada uno descompone el tablero, así que el costo
+    del reloj no se nota) y al pasarla se lanza Timeout.
+    """
+
+    def __init__(self, max_nodes: int = 20000, max_entries: int = 200000):
+        """
+        :param max_nodes: Límite de nodos por llamada (evita explosiones)
+        :param max_entries: Tamaño máximo de la memoria de posiciones
+        """
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        self.memo = {}
+        self.nodes = 0
+        self._limit = max_nodes
+        self._deadline = None
+
+    def applicable(self, board) -> bool:
+        """True si ya no quedan líneas seguras (y sí quedan líneas libres)."""
+        bb = _as_bitboard(board)
+        return bb.edges != bb.layout.full and not has_safe_edge(bb)
+
+    def representatives(self, bb: BitBoard):
+        """
+        Una línea por cada cadena o ciclo (todas sus líneas son equivalentes).
+
+        :param bb: Tablero sin líneas seguras
+        :return: Lista de índices de línea, cadenas cortas primero
+        """
+        groups = decompose(bb).all()
+        groups.sort(key=len)
+        return [g.edges[0] for g in groups if g.edges]
+
+    def _value(self, bb: BitBoard, color: int) -> int:
+        key = bb.hash
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+        self.nodes += 1
+        if self.nodes > self._limit:
+            raise _Budget
+        if self._deadline is not None and _time.perf_counter() >= self._deadline:
+            raise Timeout
+
+        moves = self.representatives(bb)
+        if not moves:
+            return 0
+        other = -1 if color == -2 else -2
+        best = None
+        for e in moves:
+            given = bb.make_move(e, color)
+            try:
+                value = -given - self._value(bb, other)
+            finally:
+                bb.unmake_move()
+            if best is None or value > best:
+                best = value
+        if len(self.memo) >= self.max_entries:
+            self.memo.clear()
+        self.memo[key] = best
+        return best
+
+    def _start(self, max_nodes, deadline):
+        """Prepara los límites de una llamada."""
+        self.nodes = 0
+        self._limit = self.max_nodes if max_nodes is None else max_nodes
+        self._deadline = deadline
+
+    def value(self, board, color: int = -1, max_nodes: int = None, deadline: float = None):
+        """
+        Valor exacto de una posición sin líneas seguras.
+
+        :param board: Board, BitBoard o matriz
+        :param color: Código de quien mueve (no cambia el valor; solo
+                      decide a quién se asignan las casillas al simular)
+        :param max_nodes: Límite de nodos de esta llamada (None = max_nodes)
+        :param deadline: Hora límite (time.perf_counter()) o None
+        :return: Entero, o None si no aplica o se supera el límite de nodos
+        :raises Timeout: Si se pasa la hora límite
+        """
+        bb = _as_bitboard(board)
+        if not self.applicable(bb):
+            return None
+        self._start(max_nodes, deadline)
+        try:
+            return self._value(bb, color)
+        except _Budget:
+            return None
+
+    def best_move(self, board, color: int = -1, max_nodes: int = None, deadline: float = None):
+        """
+        Mejor línea en una posición sin líneas seguras.
+
+        :param board: Board, BitBoard o matriz
+        :param color: Código de quien mueve
+        :param max_nodes: Límite de nodos de esta llamada (None = max_nodes)
+        :param deadline: Hora límite (time.perf_counter()) o None
+        :return: Tupla (línea, valor) o None si no aplica o se supera el límite
+        :raises Timeout: Si se pasa la hora límite
+        """
+        bb = _as_bitboard(board)
+        if not self.applicable(bb):
+            return None
+        self._start(max_nodes, deadline)
+        other = -1 if color == -2 else -2
+        best = None
+        try:
+            for e in self.representatives(bb):
+                given = bb.make_move(e, color)
+                try:
+                    value = -given - self._value(bb, other)
+                finally:
+                    bb.unmake_move()
+                if best is None or value > best[1]:
+                    best = (e, value)
+        except _Budget:
+            return None
+        return best
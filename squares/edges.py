@@ -0,0 +1,124 @@
+"""
+edges.py
+========
+
+Enumeración canónica de las líneas del tablero de Cuadrito.
+
+Cada línea física del tablero recibe un único identificador entero,
+independiente de la casilla desde la que se nombre. Así una línea
+interior deja de aparecer dos veces (p. ej. (i,j,1) y (i,j+1,3)).
+
+Distribución de índices (n = tamaño del tablero):
+    - Líneas horizontales h(r, c) = r * n + c,            r ∈ [0, n], c ∈ [0, n)
+    - Líneas verticales   v(r, c) = n(n+1) + r(n+1) + c,  r ∈ [0, n), c ∈ [0, n]
+
+La jugada canónica de una línea, en el formato [fila, columna, lado]
+de Agent.compute, se nombra desde la casilla de abajo (lado 0) o de la
+derecha (lado 3). Con esa orientación Board.move nunca cambia el dueño
+de una casilla ya cerrada en la misma jugada (ver BitBoard._apply).
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+
+class EdgeLayout:
+    """
+    Tablas precalculadas para un tamaño de tablero dado.
+    Se comparten entre todas las instancias del mismo tamaño (ver layout()).
+    """
+
+    def __init__(self, size: int):
+        n = size
+        self.size = n
+        self.n_edges = 2 * n * (n + 1)
+        self.n_cells = n * n
+
+        # Lados de cada casilla en orden del protocolo (0=arriba, 1=derecha, 2=abajo, 3=izquierda)
+        self.cell_edges = []
+        self.cell_mask = []
+        for i in range(n):
+            for j in range(n):
+                top = i * n + j
+                bottom = (i + 1) * n + j
+                left = n * (n + 1) + i * (n + 1) + j
+                right = left + 1
+                sides = (top, right, bottom, left)
+                self.cell_edges.append(sides)
+                self.cell_mask.append(sum(1 << e for e in sides))
+
+        # Casillas adyacentes a cada línea (una en el borde, dos en el interior)
+        edge_cells = [[] for _ in range(self.n_edges)]
+        for b, sides in enumerate(self.cell_edges):
+            for e in sides:
+                edge_cells[e].append(b)
+        self.edge_cells = [tuple(c) for c in edge_cells]
+
+        # El borde exterior viene dibujado desde el inicio (igual que Board.init)
+        self.border = 0
+        for e, cells in enumerate(self.edge_cells):
+            if len(cells) == 1:
+                self.border |= 1 << e
+        self.full = (1 << self.n_edges) - 1
+        self.interior = [e for e in range(self.n_edges) if not self.border >> e & 1]
+
+        # Jugada canónica [fila, columna, lado] de cada línea
+        self.moves = []
+        for e, cells in enumerate(self.edge_cells):
+            b = cells[-1]
+            self.moves.append((b // n, b % n, self.cell_edges[b].index(e)))
+
+        # Líneas que tocan alguna casilla del borde del tablero
+        edge_cell = set(b for b in range(self.n_cells)
+                        if b // n in (0, n - 1) or b % n in (0, n - 1))
+        self.touches_border = [any(b in edge_cell for b in cells) for cells in self.edge_cells]
+
+
+_LAYOUTS = {}
+
+
+def layout(size: int) -> EdgeLayout:
+    """
+    Devuelve (y memoriza) las tablas de líneas para el tamaño indicado.
+
+    :param size: Tamaño del tablero
+    :return: Instancia EdgeLayout compartida
+    """
+    lay = _LAYOUTS.get(size)
+    if lay is None:
+        lay = _LAYOUTS[size] = EdgeLayout(size)
+    return lay
+
+
+def num_edges(size: int) -> int:
+    """
+    Número total de líneas del tablero (incluido el borde).
+
+    :param size: Tamaño del tablero
+    :return: 2·n·(n+1)
+    """
+    return 2 * size * (size + 1)
+
+
+def edge_id(size: int, r: int, c: int, s: int) -> int:
+    """
+    Convierte una jugada [fila, columna, lado] en su índice canónico.
+
+    :param size: Tamaño del tablero
+    :param r: Fila
+    :param c: Columna
+    :param s: Lado (0=arriba, 1=derecha, 2=abajo, 3=izquierda)
+    :return: Índice de la línea
+    """
+    return layout(size).cell_edges[r * size + c][s]
+
+
+def edge_to_move(size: int, e: int):
+    """
+    Convierte un índice de línea en su jugada canónica.
+
+    :param size: Tamaño del tablero
+    :param e: Índice de la línea
+    :return: Tupla (fila, columna, lado)
+    """
+    return layout(size).moves[e]
@@ -0,0 +1,251 @@
+"""
+js_agent.py
+===========
+
+Agentes JavaScript de la interfaz web (web/static/*.js) jugando como
+agentes Python.
+
+Un proceso Node.js persistente (squares/js_host.js) carga squares.js y el
+archivo de cada agente y atiende peticiones de una línea JSON: así no se
+paga el arranque de Node en cada jugada y los agentes del navegador pueden
+jugar contra los de Python en main.Environment o en tournament.py.
+
+Cada JSAgent guarda la latencia de cada jugada medida dentro de Node
+(`latencies`) y la vista desde Python, con la comunicación incluida
+(`roundtrips`); en sus métricas quedan como `search_seconds` e
+`ipc_seconds` (la diferencia).
+
+Cada jugada se pide con el reloj restante como plazo: si Node no responde
+a tiempo se termina el proceso (el agente sigue ocupado en la jugada) y
+compute devuelve [0, 0, 0] con el reloj ya agotado, de modo que el
+entorno lo declara 'timeout' como a cualquier agente lento.
+
+Ejemplo:
+
+    python tournament.py --agents js-prov6 search --sizes 4 --games 20
+
+Requiere Node.js en el PATH (o en la variable de entorno CUADRITO_NODE).
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from time import perf_counter
+
+from squares.agent_base import Agent
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web", "static")
+HOST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js_host.js")
+
+# Nombre de registro -> (archivo en web/static, clase, argumentos del constructor)
+# Mismos parámetros que los jugadores de index.html
+JS_AGENTS = {
+    "js-random": ("squares.js", "RandomPlayer", []),
+    "js-arazaca": ("smart_agent.js", "ArazacaAgent", []),
+    "js-minimini": ("minimini_agent.js", "MiniMiniAgent", []),
+    "js-alpha": ("alpha_edge_agent.js", "AlphaEdgeAgent", [{"baseDepth": 2, "maxDepth": 6, "timeSlice": 220}]),
+    "js-pro": ("arazaca_pro_agent.js", "ArazacaProAgent", [{"baseDepth": 2, "maxDepth": 7, "timeSlice": 320}]),
+    "js-pre": ("ArazacaPre.js", "ArazacaPre", []),
+    "js-ultra": ("arazaca_ultra.js", "ArazacaUltra", [{"baseDepth": 2, "maxDepth": 6, "timeSlice": 320}]),
+    "js-dominus": ("Arazaca_Dominus.js", "ArazacaDominusAgent", [{"baseDepth": 2, "maxDepth": 7, "timeSlice": 320}]),
+    "js-prov5": ("arazaca_prov4.js", "ArazacaProv5Agent", []),
+    "js-prov6": ("ArazacaProV6.js", "ArazacaProV6", []),
+}
+
+_RUNTIME = None
+_RUNTIME_LOCK = threading.Lock()
+
+
+def node_path():
+    """Ruta del ejecutable de Node.js o None si no está instalado."""
+    return os.environ.get("CUADRITO_NODE") or shutil.which("node")
+
+
+class JSRuntimeError(RuntimeError):
+    """Error del proceso Node.js o de un agente JavaScript."""
+
+
+class JSTimeoutError(JSRuntimeError):
+    """El proceso Node.js no respondió dentro del plazo de la petición."""
+
+
+class JSRuntime:
+    """
+    Proceso Node.js persistente que aloja instancias de agentes JS.
+    Las peticiones se serializan con un candado (un agente a la vez).
+    """
+
+    def __init__(self, node: str = None, static_dir: str = STATIC_DIR, verbose: bool = False):
+        """
+        :param node: Ejecutable de Node.js (por defecto node_path())
+        :param static_dir: Carpeta con squares.js y los agentes
+        :param verbose: Muestra los console.log de los agentes (por stderr)
+        """
+        self.node = node or node_path()
+        if self.node is None:
+            raise JSRuntimeError("No se encontró Node.js (instálelo o defina CUADRITO_NODE)")
+        self.static_dir = static_dir
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._pending_free = []
+        self._expired = False
+        self._proc = subprocess.Popen(
+            [self.node, HOST_SCRIPT, static_dir],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=None if verbose else subprocess.DEVNULL,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+
+    @property
+    def alive(self) -> bool:
+        """True si el proceso sigue vivo (y pertenece a este proceso Python)."""
+        return self._proc.poll() is None and self.pid == os.getpid()
+
+    def request(self, op: str, timeout: float = None, **fields) -> dict:
+        """
+        Envía una petición y espera su respuesta.
+
+        :param op: Operación ('create', 'init', 'compute', 'free')
+        :param timeout: Plazo de la respuesta en segundos (None: sin plazo).
+            Al vencer se termina el proceso, porque Node sigue ocupado en la
+            petición y las respuestas quedarían desfasadas.
+        :param fields: Campos de la petición
+        :return: Diccionario de respuesta
+        :raises JSTimeoutError: Si el plazo venció antes de la respuesta
+        """
+        with self._lock:
+            if self._pending_free:
+                fields["free"], self._pending_free = self._pending_free, []
+            fields["op"] = op
+            timer = None
+            try:
+                self._proc.stdin.write(json.dumps(fields) + "\n")
+                self._proc.stdin.flush()
+                if timeout is not None:
+                    timer = threading.Timer(max(timeout, 0.0), self._expire)
+                    timer.start()
+                line = self._proc.stdout.readline()
+            except (BrokenPipeError, OSError) as e:
+                raise JSRuntimeError(f"El proceso Node.js terminó: {e}") from e
+            finally:
+                if timer is not None:
+                    timer.cancel()
+        if not line:
+            if self._expired:
+                self._proc.wait()
+                raise JSTimeoutError(f"El proceso Node.js no respondió en {timeout * 1000:.0f} ms")
+            raise JSRuntimeError(f"El proceso Node.js terminó (código {self._proc.poll()})")
+        response = json.loads(line)
+        if "error" in response:
+            raise JSRuntimeError(response["error"])
+        return response
+
+    def _expire(self):
+        """Plazo vencido: termina el proceso (readline recibe fin de archivo)."""
+        self._expired = True
+        self._proc.kill()
+
+    def release(self, agent_id: int):
+        """
+        Libera una instancia en la próxima petición (seguro desde __del__,
+        no toma el candado).
+        """
+        self._pending_free.append(agent_id)
+
+    def close(self):
+        """Termina el proceso Node.js."""
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        self._proc.stdout.close()
+
+
+def runtime() -> JSRuntime:
+    """
+    Proceso Node.js compartido del proceso actual (se crea al primer uso y
+    de nuevo en cada proceso hijo de un pool).
+    """
+    global _RUNTIME
+    with _RUNTIME_LOCK:
+        if _RUNTIME is None or not _RUNTIME.alive:
+            _RUNTIME = JSRuntime()
+        return _RUNTIME
+
+
+class JSAgent(Agent):
+    """
+    Agente JavaScript de web/static ejecutado en el proceso Node.js.
+    """
+
+    def __init__(self, name: str, color: str = None, runtime: JSRuntime = None):
+        """
+        :param name: Nombre en JS_AGENTS (por ejemplo 'js-prov6')
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param runtime: JSRuntime a usar (por defecto el compartido)
+        """
+        super().__init__(color)
+        if name not in JS_AGENTS:
+            raise ValueError(f"Agente JS desconocido: {name!r} (disponibles: {sorted(JS_AGENTS)})")
+        self.name = name
+        self.file, self.cls, self.args = JS_AGENTS[name]
+        self.runtime = runtime
+        self._id = None
+        self.latencies = []     # ms de compute medidos dentro de Node
+        self.roundtrips = []    # ms vistos desde Python (con la comunicación)
+
+    def __del__(self):
+        if self._id is not None and self.runtime is not None and self.runtime.alive:
+            self.runtime.release(self._id)
+
+    def _create(self):
+        """Crea una instancia nueva del agente en el proceso Node.js."""
+        if self._id is not None and self.runtime.alive:
+            self.runtime.release(self._id)
+        if self.runtime is None or not self.runtime.alive:
+            self.runtime = runtime()
+        self._id = self.runtime.request("create", file=self.file, cls=self.cls, args=self.args)["id"]
+
+    def init(self, color: str, board, time: int = 20000):
+        """
+        Crea una instancia nueva del agente JS para la partida y la inicializa.
+        """
+        super().init(color, board, time)
+        self._create()
+        self.runtime.request("init", id=self._id, color=color,
+                             board=getattr(board, "grid", board), time=time)
+
+    def compute(self, board, time: int):
+        """
+        :param board: Estado actual del tablero (Board o matriz)
+        :param time: Tiempo restante en milisegundos
+        :return: Lista [fila, columna, lado]
+        """
+        grid = getattr(board, "grid", board)
+        if self._id is None or not self.runtime.alive:
+            self.init(self.color or "R", grid, time)
+        start = perf_counter()
+        try:
+            response = self.runtime.request("compute", timeout=time / 1000, id=self._id,
+                                            board=grid, time=time)
+        except JSTimeoutError:
+            # El proceso ya terminó: la próxima jugada crea otro (y otra instancia)
+            self._id = None
+            self.metrics.incr("timeouts")
+            return [0, 0, 0]
+        roundtrip = (perf_counter() - start) * 1000
+        self.roundtrips.append(roundtrip)
+        self.latencies.append(response["ms"])
+        self.metrics.incr("moves")
+        self.metrics.observe("search_seconds", response["ms"] / 1000)
+        self.metrics.observe("ipc_seconds", max(0.0, roundtrip - response["ms"]) / 1000)
+        move = response["move"]
+        return [int(v) for v in move[:3]] if len(move) >= 3 else [0, 0, 0]
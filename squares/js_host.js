@@ -0,0 +1,107 @@
+/*
+js_host.js
+==========
+
+Proceso Node.js persistente que ejecuta los agentes JavaScript de
+web/static sin navegador (lo lanza squares/js_agent.py).
+
+Cada archivo de agente se carga una sola vez en su propio contexto
+aislado junto con squares.js (Agent, Board, RandomPlayer), con `window`
+apuntando al propio contexto, igual que en la página.
+
+Protocolo: una petición JSON por línea en stdin y una respuesta JSON por
+línea en stdout, en el mismo orden.
+    {"op": "create", "file": ..., "cls": ..., "args": [...]}  -> {"id": n}
+    {"op": "init", "id": n, "color": "R", "board": [[...]], "time": ms}
+    {"op": "compute", "id": n, "board": [[...]], "time": ms}  -> {"move": [...], "ms": t}
+    {"op": "free", "id": n}
+Cualquier petición puede incluir "free": [ids] para liberar instancias.
+Los errores se responden como {"error": "mensaje"}.
+
+Autor: Equipo Arazaca – UNAL 2025
+*/
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+const vm = require("vm");
+const { Console } = require("console");
+
+const STATIC = process.argv[2] || path.join(__dirname, "..", "web", "static");
+const logger = new Console(process.stderr);   // stdout queda para el protocolo
+
+const contexts = new Map();   // archivo -> contexto con squares.js cargado
+const agents = new Map();     // id -> instancia del agente
+let nextId = 1;
+
+// ---------- carga de los scripts ----------
+class MainClient {}           // base de Environment en Konekti (no se usa aquí)
+
+function load(ctx, file) {
+  const full = path.join(STATIC, file);
+  vm.runInContext(fs.readFileSync(full, "utf8"), ctx, { filename: full });
+}
+
+function context(file) {
+  let ctx = contexts.get(file);
+  if (ctx) return ctx;
+  ctx = vm.createContext({ console: logger, performance, MainClient, Konekti: {} });
+  ctx.window = ctx;
+  load(ctx, "squares.js");
+  if (file !== "squares.js") load(ctx, file);
+  contexts.set(file, ctx);
+  return ctx;
+}
+
+// ---------- operaciones ----------
+function agent(id) {
+  const a = agents.get(id);
+  if (!a) throw new Error("Agente JS inexistente: " + id);
+  return a;
+}
+
+const OPS = {
+  create(req) {
+    const ctx = context(req.file);
+    const Cls = vm.runInContext(req.cls, ctx);
+    const id = nextId++;
+    agents.set(id, new Cls(...(req.args || [])));
+    return { id };
+  },
+
+  init(req) {
+    agent(req.id).init(req.color, req.board, req.time);
+    return {};
+  },
+
+  compute(req) {
+    const a = agent(req.id);
+    const start = performance.now();
+    const move = a.compute(req.board, req.time);
+    const ms = performance.now() - start;
+    return { move: Array.from(move || [0, 0, 0], Number), ms };
+  },
+
+  free(req) {
+    agents.delete(req.id);
+    return {};
+  },
+};
+
+function handle(line) {
+  let res;
+  try {
+    const req = JSON.parse(line);
+    for (const id of req.free || []) agents.delete(id);
+    const op = OPS[req.op];
+    if (!op) throw new Error("Operación desconocida: " + req.op);
+    res = op(req);
+  } catch (err) {
+    res = { error: String((err && err.stack) || err) };
+  }
+  process.stdout.write(JSON.stringify(res) + "\n");
+}
+
+readline.createInterface({ input: process.stdin }).on("line", handle);
@@ -0,0 +1,422 @@
+"""
+mcts_agent.py
+=============
+
+Implementa un agente de Búsqueda de Árbol Monte Carlo (MCTSAgent) para el
+juego Cuadrito (Dots and Boxes), pensado para tableros grandes donde el
+factor de ramificación (2·n·(n+1) líneas) impide la búsqueda completa.
+
+Características:
+----------------
+1️⃣ UCT: selección por cota superior de confianza, expansión de una jugada
+   por iteración y retropropagación del resultado (1 = gana, 0.5 = empate).
+2️⃣ Simulaciones rápidas con la regla de SmartAgent adaptada a estas reglas:
+   línea segura al azar si la hay (no deja casillas con 3 lados); si no,
+   se entrega la cadena o ciclo más corto.
+3️⃣ Respeta el tiempo que llega en compute() (mismo reparto que SearchAgent).
+4️⃣ Reutiliza entre turnos el subárbol de la jugada realmente jugada
+   (la propia y la del rival).
+5️⃣ Final exacto: cuando no quedan líneas seguras usa el EndgameSolver,
+   dentro del mismo presupuesto de la jugada (si no termina, simula).
+6️⃣ Informa de las simulaciones por segundo (por jugada y acumuladas) y
+   acumula en agent.metrics simulaciones, visitas reutilizadas y tiempo
+   de cada fase (libro, final exacto, búsqueda).
+7️⃣ Libro de aperturas (opcional, squares.book): si la posición está en el
+   libro se juega sin simular.
+8️⃣ Pondering (opcional): durante el turno del rival sigue simulando en un
+   hilo de fondo desde la posición tras su jugada; cuando el rival juega,
+   el subárbol de su respuesta ya tiene esas simulaciones.
+
+Recordatorio de reglas (igual que squares.js): quien cierra una casilla
+se la entrega al rival y el turno siempre pasa al otro jugador.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import math
+import random
+import time as _time
+
+from squares.agent_base import Agent
+from squares.bitboard import BitBoard
+from squares.book import open_book
+from squares.chains import EndgameSolver, Timeout
+
+
+class Node:
+    """
+    Nodo del árbol de búsqueda.
+
+    `wins` se cuenta desde el punto de vista del jugador que hizo `move`
+    (el que acaba de mover al llegar a este nodo).
+    """
+
+    __slots__ = ("move", "color", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move: int, color: int, parent=None):
+        self.move = move          # línea jugada para llegar aquí (-1 en la raíz)
+        self.color = color        # código de quien hizo esa jugada
+        self.parent = parent
+        self.children = {}
+        self.untried = None       # líneas aún no expandidas (se calcula al visitar)
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MCTSAgent(Agent):
+    """
+    Agente que decide con Monte Carlo Tree Search (UCT),
+    respetando el tiempo disponible en cada llamada a compute().
+    """
+
+    # Tope de visitas de la raíz al pensar en el turno del rival (memoria)
+    MAX_PONDER_VISITS = 200000
+
+    def __init__(self, color: str = None, exploration: float = 1.0,
+                 max_move_time: int = 2000, reserve: int = 250, seed: int = None,
+                 book=None, ponder: bool = False):
+        """
+        Inicializa el agente con color opcional y parámetros de búsqueda.
+
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param exploration: Constante de exploración de UCT
+        :param max_move_time: Tope de tiempo por jugada (ms)
+        :param reserve: Tiempo que nunca se gasta del reloj (ms)
+        :param seed: Semilla del generador aleatorio de las simulaciones
+        :param book: Libro de aperturas (OpeningBook o ruta) opcional
+        :param ponder: Simula también durante el turno del rival
+        """
+        super().__init__(color)
+        self.ponder = ponder
+        self.ply = None  # código interno del jugador (-1 o -2)
+        self.opp = None  # código del oponente
+        self.exploration = exploration
+        self.max_move_time = max_move_time
+        self.reserve = reserve
+        self.rng = random.Random(seed)
+        self.endgame = EndgameSolver(max_nodes=2000)
+        self.book = open_book(book)
+
+        # Árbol conservado entre turnos
+        self.root = None
+        self._root_board = None
+
+        # Estadísticas de la última jugada
+        self.playouts = 0
+        self.playouts_per_sec = 0.0
+        self.reused = 0
+        self.pondered = 0    # simulaciones hechas en el turno del rival
+
+        # Totales de la partida (para medir el rendimiento del motor)
+        self.total_playouts = 0
+        self.total_seconds = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Simulaciones por segundo acumuladas en la partida."""
+        return self.total_playouts / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    def init(self, color: str, board, time: int = 20000):
+        """
+        Inicializa el agente con su color y tiempo total.
+
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param board: Tablero inicial (instancia Board o matriz)
+        :param time: Tiempo total en milisegundos
+        """
+        self.stop_pondering()
+        super().init(color, board, time)
+        self.ply = -1 if color == "R" else -2
+        self.opp = -2 if color == "R" else -1
+        self.root = None
+        self._root_board = None
+        self.total_playouts = 0
+        self.total_seconds = 0.0
+        self.endgame.memo.clear()
+
+    # ----------------------------------------------------------------------
+    # Gestor de tiempo
+    # ----------------------------------------------------------------------
+
+    def budget(self, free_edges: int, time: int) -> float:
+        """
+        Calcula el tiempo (ms) que se puede usar en esta jugada.
+
+        :param free_edges: Líneas libres en el tablero
+        :param time: Tiempo restante del reloj (ms)
+        :return: Presupuesto en milisegundos
+        """
+        usable = max(0.0, time - self.reserve)
+        my_moves = max(1, (free_edges + 1) // 2)
+        return min(usable / my_moves, usable * 0.5, self.max_move_time)
+
+    # ----------------------------------------------------------------------
+    # Reutilización del árbol
+    # ----------------------------------------------------------------------
+
+    def _reuse(self, bb: BitBoard):
+        """
+        Busca en el árbol anterior el nodo que corresponde al tablero actual
+        (la jugada del rival tras la nuestra). Varias jugadas pueden llevar
+        al mismo tablero (las capturas dibujan otras líneas): se conserva
+        el hijo más visitado. Si no se encuentra, empieza un árbol nuevo.
+        """
+        old, prev = self.root, self._root_board
+        self.root = None
+        if old is not None and prev is not None and prev.size == bb.size:
+            drawn = bb.edges & ~prev.edges
+            for e, child in old.children.items():
+                if not drawn >> e & 1:
+                    continue
+                if self.root is not None and child.visits <= self.root.visits:
+                    continue
+                prev.make_move(e, child.color)
+                same = (prev.edges, prev.red, prev.yellow) == (bb.edges, bb.red, bb.yellow)
+                prev.unmake_move()
+                if same:
+                    self.root = child
+        if self.root is not None:
+            self.root.parent = None
+        else:
+            self.root = Node(-1, self.opp)
+        self.reused = self.root.visits
+
+    def _advance(self, bb: BitBoard, e: int):
+        """Baja la raíz a la jugada elegida y recuerda el tablero resultante."""
+        child = self.root.children.get(e)
+        after = bb.clone()
+        after.make_move(e, self.ply)
+        after._history = []
+        if child is not None:
+            child.parent = None
+        self.root = child
+        self._root_board = after
+
+    # ----------------------------------------------------------------------
+    # Búsqueda
+    # ----------------------------------------------------------------------
+
+    def policy(self, bb: BitBoard, moves) -> int:
+        """
+        Regla rápida de las simulaciones: una línea segura al azar o,
+        si no hay, una línea de la cadena / ciclo más corto.
+
+        :param bb: Tablero actual
+        :param moves: Líneas libres (no vacía)
+        :return: Índice de línea
+        """
+        edges = bb.edges
+        layout = bb.layout
+        cell_mask = layout.cell_mask
+        edge_cells = layout.edge_cells
+        rng = self.rng
+        start = rng.randrange(len(moves))
+        for k in range(len(moves)):
+            e = moves[(start + k) % len(moves)]
+            for c in edge_cells[e]:
+                if (edges & cell_mask[c]).bit_count() >= 2:
+                    break
+            else:
+                return e
+        return self.endgame.representatives(bb)[0]
+
+    def rollout(self, bb: BitBoard, color: int) -> int:
+        """
+        Juega la posición hasta el final y la deja como estaba.
+
+        :param bb: Tablero (se modifica y se restaura)
+        :param color: Código de quien mueve
+        :return: Diferencia final de casillas (rojas - amarillas)
+        """
+        played = 0
+        moves = bb.legal_edges()
+        while moves:
+            bb.make_move(self.policy(bb, moves), color)
+            played += 1
+            color = -1 if color == -2 else -2
+            moves = bb.legal_edges()
+        diff = bb.red_boxes - bb.yellow_boxes
+        for _ in range(played):
+            bb.unmake_move()
+        return diff
+
+    def select(self, node: Node) -> Node:
+        """Hijo con mayor valor UCT."""
+        log_n = math.log(node.visits)
+        c = self.exploration
+        best, best_score = None, -math.inf
+        for child in node.children.values():
+            score = child.wins / child.visits + c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def iterate(self, bb: BitBoard):
+        """
+        Una iteración de MCTS: selección, expansión, simulación y
+        retropropagación.
+
+        :param bb: Tablero de la raíz (se modifica y se restaura)
+        """
+        node = self.root
+        depth = 0
+        # Selección
+        while True:
+            if node.untried is None:
+                node.untried = bb.legal_edges()
+                self.rng.shuffle(node.untried)
+            if node.untried or not node.children:
+                break
+            node = self.select(node)
+            bb.make_move(node.move, node.color)
+            depth += 1
+
+        # Expansión
+        if node.untried:
+            e = node.untried.pop()
+            color = -1 if node.color == -2 else -2
+            child = Node(e, color, node)
+            node.children[e] = child
+            bb.make_move(e, color)
+            depth += 1
+            node = child
+
+        # Simulación
+        diff = self.rollout(bb, -1 if node.color == -2 else -2)
+        for _ in range(depth):
+            bb.unmake_move()
+
+        # Retropropagación
+        red_result = 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+        while node is not None:
+            node.visits += 1
+            node.wins += red_result if node.color == -1 else 1.0 - red_result
+            node = node.parent
+
+    # ----------------------------------------------------------------------
+    # Métricas
+    # ----------------------------------------------------------------------
+
+    def _record(self, phase: str, start: float):
+        """
+        Acumula en self.metrics lo hecho en la jugada.
+
+        :param phase: Fase que decidió la jugada ('book', 'endgame' o 'search')
+        :param start: Inicio de compute() (perf_counter)
+        """
+        m = self.metrics
+        m.incr("moves")
+        m.incr(phase + "_moves")
+        m.observe(phase + "_seconds", _time.perf_counter() - start)
+        if phase == "search":
+            m.incr("playouts", self.playouts)
+            m.incr("reused_visits", self.reused)
+
+    # ----------------------------------------------------------------------
+    # Método principal de decisión
+    # ----------------------------------------------------------------------
+
+    def compute(self, board, time: int):
+        """
+        Selecciona la jugada más visitada tras simular durante el
+        presupuesto de tiempo.
+
+        :param board: Estado actual del tablero (Board, BitBoard o matriz)
+        :param time: Tiempo restante en milisegundos
+        :return: Lista [fila, columna, lado]
+        """
+        start = _time.perf_counter()
+        self.stop_pondering()
+        if self.ply is None:
+            self.init(self.color or "R", getattr(board, "grid", board), time)
+        bb = BitBoard.from_board(board)
+        moves = bb.legal_edges()
+        self.playouts = 0
+        self.playouts_per_sec = 0.0
+        if not moves:
+            return [0, 0, 0]
+
+        # En el libro, o sin líneas seguras (el final se resuelve sin simular)
+        known = self.book.lookup(bb) if self.book is not None else None
+        phase = "book"
+        deadline = start + self.budget(len(moves), time) / 1000.0
+        if known is None:
+            try:
+                solved = self.endgame.best_move(bb, self.ply, deadline=deadline)
+            except Timeout:
+                self.metrics.incr("endgame_timeouts")
+                solved = None
+            known = solved[0] if solved is not None else None
+            phase = "endgame"
+        if known is not None:
+            self.root = None
+            self._root_board = None
+            self._record(phase, start)
+            return list(bb.layout.moves[known])
+
+        self._reuse(bb)
+        if len(moves) == 1:
+            best = moves[0]
+        else:
+            sim_start = _time.perf_counter()
+            while True:
+                self.iterate(bb)
+                self.playouts += 1
+                if _time.perf_counter() >= deadline:
+                    break
+            elapsed = _time.perf_counter() - sim_start
+            self.playouts_per_sec = self.playouts / elapsed if elapsed > 0 else 0.0
+            self.total_playouts += self.playouts
+            self.total_seconds += elapsed
+            best = max(self.root.children.values(), key=lambda n: n.visits).move
+        self._record("search", start)
+
+        self._advance(bb, best)
+        if self.ponder and not self.endgame.applicable(self._root_board):
+            if self.root is None:
+                self.root = Node(best, self.ply)
+            self.pondered = 0
+            self.start_pondering(self._root_board)
+        return list(bb.layout.moves[best])
+
+    def analyze(self, board, move_time: int, max_depth: int = None) -> dict:
+        """
+        Analiza una posición suelta simulando hasta move_time ms (sin
+        reparto del reloj). max_depth no aplica a las simulaciones.
+
+        :return: Diccionario con move, score (None) y depth (None)
+        """
+        saved = self.max_move_time, self.ponder
+        self.max_move_time, self.ponder = move_time, False
+        try:
+            move = self.compute(board, float("inf"))
+        finally:
+            self.max_move_time, self.ponder = saved
+        return {"move": [int(v) for v in move], "score": None, "depth": None}
+
+    # ----------------------------------------------------------------------
+    # Pondering
+    # ----------------------------------------------------------------------
+
+    def ponder_step(self, board: BitBoard) -> bool:
+        """
+        Una simulación desde la posición tras la jugada propia.
+
+        :param board: Tablero de la raíz actual (mueve el rival)
+        :return: False si el árbol ya alcanzó el tope de visitas
+        """
+        if self.root.visits >= self.MAX_PONDER_VISITS:
+            return False
+        self.iterate(board)
+        self.pondered += 1
+        return True
+
+    def stop_pondering(self):
+        """Detiene las simulaciones de fondo y las cuenta en las métricas."""
+        if self._ponder_thread is None:
+            return
+        start = _time.perf_counter()
+        super().stop_pondering()
+        self.metrics.observe("ponder_stop_seconds", _time.perf_counter() - start)
+        self.metrics.incr("ponder_playouts", self.pondered)
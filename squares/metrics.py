@@ -0,0 +1,197 @@
+"""
+metrics.py
+==========
+
+Contadores y temporizadores de los agentes y del motor de Cuadrito
+(Dots and Boxes).
+
+Cada agente tiene un Metrics (agent.metrics) que se pone a cero en init()
+y que el propio agente alimenta al terminar cada compute(), no en cada
+nodo: el costo es de unas pocas operaciones de diccionario por jugada,
+así que puede quedar siempre activo.
+
+1️⃣ Contadores: nodos buscados, jugadas aplicadas, evaluaciones, aciertos
+   y fallos de la tabla de transposición, jugadas del libro, etc.
+2️⃣ Observaciones: para cada nombre se guarda el número de muestras, la
+   suma y el máximo (tiempo por fase en segundos, profundidad alcanzada).
+3️⃣ MetricsRegistry: acumula las métricas de muchos agentes por nombre
+   (servidor web) y las escribe en el formato de texto de Prometheus.
+
+Ejemplo:
+
+    env = Environment(size=5, verbose=False)
+    record = env.play(SearchAgent(), MCTSAgent())
+    record["metrics"]["R"]["counters"]["nodes"]
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import threading
+import time as _time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Contadores y observaciones (muestras, suma, máximo) con nombre.
+    No es seguro entre hilos: cada agente escribe solo en el suyo.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.observations = {}   # nombre -> [muestras, suma, máximo]
+
+    def reset(self):
+        """Pone a cero todas las métricas."""
+        self.counters = {}
+        self.observations = {}
+
+    def incr(self, name: str, n=1):
+        """
+        Suma n a un contador.
+
+        :param name: Nombre del contador
+        :param n: Incremento
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float):
+        """
+        Registra una muestra (tiempo en segundos, profundidad, ...).
+
+        :param name: Nombre de la observación
+        :param value: Valor de la muestra
+        """
+        obs = self.observations.get(name)
+        if obs is None:
+            self.observations[name] = [1, value, value]
+        else:
+            obs[0] += 1
+            obs[1] += value
+            if value > obs[2]:
+                obs[2] = value
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Mide en segundos el bloque `with` y lo registra como observación.
+
+        :param name: Nombre de la observación (por convención, terminado en _seconds)
+        """
+        start = _time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, _time.perf_counter() - start)
+
+    def merge(self, other: "Metrics"):
+        """Suma a estas métricas las de otro Metrics."""
+        for name, n in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + n
+        for name, (count, total, peak) in other.observations.items():
+            obs = self.observations.get(name)
+            if obs is None:
+                self.observations[name] = [count, total, peak]
+            else:
+                obs[0] += count
+                obs[1] += total
+                if peak > obs[2]:
+                    obs[2] = peak
+
+    def snapshot(self) -> dict:
+        """
+        Copia serializable (JSON) de las métricas.
+
+        :return: {"counters": {...}, "observations": {nombre: {count, sum, max, mean}}}
+        """
+        return {
+            "counters": dict(self.counters),
+            "observations": {
+                name: {"count": count, "sum": total, "max": peak, "mean": total / count}
+                for name, (count, total, peak) in self.observations.items()
+            },
+        }
+
+
+class MetricsRegistry:
+    """
+    Métricas acumuladas por nombre de agente (seguro entre hilos).
+    """
+
+    def __init__(self, prefix: str = "cuadrito"):
+        """
+        :param prefix: Prefijo de las métricas en el formato de Prometheus
+        """
+        self.prefix = prefix
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def collect(self, name: str, metrics: Metrics, reset: bool = True):
+        """
+        Acumula las métricas de un agente bajo su nombre.
+
+        :param name: Nombre del agente (etiqueta agent="...")
+        :param metrics: Métricas del agente
+        :param reset: Las pone a cero tras acumularlas (para no contarlas dos veces)
+        """
+        with self._lock:
+            group = self._groups.get(name)
+            if group is None:
+                group = self._groups[name] = Metrics()
+            group.merge(metrics)
+        if reset:
+            metrics.reset()
+
+    def snapshot(self) -> dict:
+        """Copia serializable de las métricas por agente."""
+        with self._lock:
+            return {name: m.snapshot() for name, m in self._groups.items()}
+
+    def render(self, gauges: dict = None) -> str:
+        """
+        Texto en el formato de exposición de Prometheus (versión 0.0.4).
+
+        Contadores como `<prefijo>_<nombre>_total{agent="..."}` y cada
+        observación como un summary (`_count`, `_sum`) más un gauge `_max`.
+
+        :param gauges: Valores instantáneos adicionales {nombre: valor}
+        :return: Texto de la exposición
+        """
+        prefix = self.prefix
+        counters, observations = {}, {}
+        with self._lock:
+            for agent, m in sorted(self._groups.items()):
+                label = f'{{agent="{_escape(agent)}"}}'
+                for name, n in m.counters.items():
+                    counters.setdefault(name, []).append((label, n))
+                for name, obs in m.observations.items():
+                    observations.setdefault(name, []).append((label, tuple(obs)))
+
+        lines = []
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {_number(value)}")
+        for name in sorted(counters):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{label} {_number(n)}" for label, n in counters[name])
+        for name in sorted(observations):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            for label, (count, total, _) in observations[name]:
+                lines.append(f"{metric}_count{label} {count}")
+                lines.append(f"{metric}_sum{label} {_number(total)}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.extend(f"{metric}_max{label} {_number(peak)}" for label, (_, _, peak) in observations[name])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escapa el valor de una etiqueta de Prometheus."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    """Formatea un número para Prometheus."""
+    return str(int(value)) if isinstance(value, bool) or float(value).is_integer() else repr(float(value))
@@ -0,0 +1,138 @@
+"""
+ordering.py
+===========
+
+Ordenamiento de jugadas para las búsquedas alfa-beta de Cuadrito
+(Dots and Boxes).
+
+La poda alfa-beta corta más cuanto antes se prueba la mejor jugada.
+MoveOrderer ordena la lista de líneas legales de un BitBoard sin clonarlo
+ni aplicar jugadas, solo con las máscaras de líneas:
+
+1️⃣ La jugada sugerida (tabla de transposición o iteración anterior).
+2️⃣ Líneas seguras: no dejan ninguna casilla con tres lados, es decir,
+   no regalan nada. En esta variante quien cierra una casilla se la
+   entrega al rival, así que no hay "capturas" propias que adelantar:
+   lo mejor que puede hacer una jugada es no regalar.
+3️⃣ Líneas que regalan: primero las que tocan una sola casilla con dos
+   lados y al final las que abren dos a la vez.
+Dentro de cada grupo deciden las heurísticas aprendidas en la búsqueda:
+   - historia: cada corte beta suma depth² a la línea; se reduce a la
+     mitad entre jugadas para que pese más lo reciente.
+   - killer (opcional): las (hasta dos) líneas seguras que produjeron un
+     corte en la misma distancia a la raíz se prueban primero. En esta
+     variante casi todos los nodos son de la fase de líneas seguras y los
+     killers de ramas hermanas aumentan los nodos visitados, por eso
+     vienen desactivados.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+from squares.bitboard import BitBoard
+
+# Tope del puntaje de historia de una línea
+_HISTORY_CAP = 1 << 40
+
+
+class MoveOrderer:
+    """
+    Ordenador de jugadas con heurísticas killer e historia.
+    Una instancia por agente (guarda lo aprendido entre búsquedas).
+    """
+
+    def __init__(self, killers: bool = False, max_ply: int = 128):
+        """
+        :param killers: Usa la heurística killer
+        :param max_ply: Profundidad máxima (desde la raíz) con killers
+        """
+        self.use_killers = killers
+        self.max_ply = max_ply
+        self.killers = [[-1, -1] for _ in range(max_ply)]
+        self.history = []
+
+    def reset(self, n_edges: int = 0):
+        """
+        Olvida killers e historia (al empezar una partida).
+
+        :param n_edges: Número de líneas del tablero
+        """
+        for pair in self.killers:
+            pair[0] = pair[1] = -1
+        self.history = [0] * n_edges
+
+    def age(self):
+        """
+        Prepara una nueva búsqueda: la historia se reduce a la mitad y los
+        killers de la jugada anterior se descartan.
+        """
+        self.history = [h >> 1 for h in self.history]
+        for pair in self.killers:
+            pair[0] = pair[1] = -1
+
+    def cutoff(self, e: int, ply: int, depth: int):
+        """
+        Registra que la línea e produjo un corte beta.
+
+        :param e: Línea que cortó
+        :param ply: Distancia a la raíz
+        :param depth: Profundidad restante del nodo
+        """
+        if self.use_killers and ply < self.max_ply:
+            pair = self.killers[ply]
+            if pair[0] != e:
+                pair[1] = pair[0]
+                pair[0] = e
+        history = self.history
+        if e < len(history):
+            history[e] = min(history[e] + depth * depth, _HISTORY_CAP)
+
+    def order(self, bb: BitBoard, moves, ply: int = 0, first: int = -1):
+        """
+        Ordena las jugadas de mejor a peor candidata.
+
+        :param bb: Tablero actual (no se modifica)
+        :param moves: Lista de índices de línea legales
+        :param ply: Distancia a la raíz (para los killers)
+        :param first: Línea a probar primero (-1 si ninguna)
+        :return: Lista ordenada de índices de línea
+        """
+        edges = bb.edges
+        layout = bb.layout
+        cell_mask = layout.cell_mask
+        edge_cells = layout.edge_cells
+        history = self.history
+        if len(history) < layout.n_edges:
+            self.reset(layout.n_edges)
+            history = self.history
+        k0, k1 = self.killers[ply] if self.use_killers and ply < self.max_ply else (-1, -1)
+
+        # Grupos: seguras, regalan por un lado, regalan por dos
+        groups = ([], [], [])
+        promoted = []
+        found = False
+        for e in moves:
+            if e == first:
+                found = True
+                continue
+            opened = 0
+            for c in edge_cells[e]:
+                if (edges & cell_mask[c]).bit_count() >= 2:
+                    opened += 1
+            if opened == 0 and (e == k0 or e == k1):
+                promoted.append((opened, e))
+            else:
+                groups[opened].append(e)
+
+        key = history.__getitem__
+        for group in groups:
+            if len(group) > 1:
+                group.sort(key=key, reverse=True)
+        for opened, e in promoted:
+            groups[opened].insert(0, e)
+
+        ordered = [first] if found else []
+        ordered += groups[0]
+        ordered += groups[1]
+        ordered += groups[2]
+        return ordered
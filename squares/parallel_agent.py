@@ -0,0 +1,221 @@
+"""
+parallel_agent.py
+=================
+
+Búsqueda alfa-beta en varios núcleos (ParallelSearchAgent) para el juego
+Cuadrito (Dots and Boxes).
+
+Los hilos de Python no aceleran una búsqueda que usa la CPU (GIL), así que
+se reparte la raíz entre un pool de procesos:
+
+1️⃣ División de la raíz: las jugadas ya ordenadas (squares.ordering) se
+   reparten por turnos entre los procesos, para que cada uno reciba
+   líneas buenas y malas.
+2️⃣ Nada compartido: cada proceso reconstruye el BitBoard a partir de las
+   máscaras de líneas y dueños y busca con su propio SearchAgent, cuya
+   tabla de transposición se conserva entre jugadas (el valor de una
+   posición solo depende de las líneas, así que sirve entre partidas).
+3️⃣ Misma hora límite: el presupuesto sale de compute(board, time) como
+   en SearchAgent y se envía como hora absoluta; cada proceso profundiza
+   hasta ella y devuelve la mejor jugada de cada profundidad completa.
+4️⃣ Combinación: se toma la mayor profundidad que completaron todos los
+   procesos y, a esa profundidad, la jugada de mayor valor. Si algún
+   proceso no respondió a tiempo (o no completó ni la profundidad 1) no se
+   elige entre una parte de la raíz: se sigue en el propio proceso.
+5️⃣ Con un solo núcleo (o pocas jugadas) busca en el propio proceso,
+   exactamente como SearchAgent.
+
+Ejemplo:
+
+    python tournament.py --agents parallel search --sizes 7 --games 10 --workers 1
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import multiprocessing
+import os
+import time as _time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.util import Finalize
+
+from squares.bitboard import BitBoard
+from squares.search_agent import SearchAgent, _Timeout
+from squares.zobrist import hash_edges
+
+_POOLS = {}
+_POOLS_PID = None
+_WORKER_AGENTS = {}
+
+
+# --------------------------------------------------------------------------
+# Lado de los procesos del pool
+# --------------------------------------------------------------------------
+
+def _worker_agent(size: int, tt_mb: float) -> SearchAgent:
+    """SearchAgent propio del proceso para un tamaño de tablero."""
+    agent = _WORKER_AGENTS.get(size)
+    if agent is None:
+        agent = SearchAgent(tt_mb=tt_mb)
+        agent.init("R", BitBoard(size).grid, 10 ** 9)
+        _WORKER_AGENTS[size] = agent
+    return agent
+
+
+def _warmup(size: int, tt_mb: float) -> int:
+    """Crea el agente del proceso (tablas de líneas y claves Zobrist)."""
+    _worker_agent(size, tt_mb)
+    return os.getpid()
+
+
+def _search_part(task):
+    """
+    Profundización iterativa sobre una parte de las jugadas de la raíz.
+
+    :param task: Tupla (tamaño, líneas, rojas, amarillas, color, jugadas,
+                 hora límite (time.time()), profundidad máxima, MB de la tabla)
+    :return: Tupla ({profundidad: (mejor línea, valor)}, nodos visitados)
+    """
+    size, edges, red, yellow, color, part, deadline, max_depth, tt_mb = task
+    agent = _worker_agent(size, tt_mb)
+    agent.ply = color
+    agent.opp = -1 if color == -2 else -2
+    agent.orderer.age()
+    agent.nodes = 0
+    agent._deadline = _time.perf_counter() + (deadline - _time.time())
+
+    bb = BitBoard(size)
+    bb.edges, bb.red, bb.yellow = edges, red, yellow
+    bb.hash = hash_edges(size, edges, bb.layout.border)
+
+    results = {}
+    best = part[0]
+    for depth in range(1, min(max_depth, len(bb.legal_edges())) + 1):
+        try:
+            best, value = agent.search_root(bb, part, depth, best)
+        except _Timeout:
+            break
+        results[depth] = (best, value)
+    return results, agent.nodes
+
+
+# --------------------------------------------------------------------------
+# Pool de procesos compartido
+# --------------------------------------------------------------------------
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Pool de procesos compartido por todos los agentes del proceso.
+    Usa 'spawn' para no heredar hilos del proceso principal (servidor web).
+    """
+    global _POOLS_PID
+    if _POOLS_PID != os.getpid():
+        # Proceso nuevo (p. ej. un hijo del pool de tournament.py): los
+        # pools heredados por fork no le pertenecen
+        _POOLS.clear()
+        _POOLS_PID = os.getpid()
+        # Se cierran antes de que multiprocessing espere a los hijos al salir
+        # (en los procesos hijos no se ejecutan los manejadores de atexit) y
+        # antes de que cierre las colas del pool (prioridad 10)
+        Finalize(None, shutdown_pools, exitpriority=100)
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        _POOLS[workers] = pool
+    return pool
+
+
+def shutdown_pools():
+    """
+    Detiene los pools de procesos. Espera a que terminen: cada búsqueda en
+    curso acaba en su hora límite.
+    """
+    for pool in _POOLS.values():
+        pool.shutdown(wait=True, cancel_futures=True)
+    _POOLS.clear()
+
+
+class ParallelSearchAgent(SearchAgent):
+    """
+    SearchAgent que reparte las jugadas de la raíz entre varios procesos.
+    """
+
+    def __init__(self, color: str = None, workers: int = None, margin: int = 30,
+                 min_moves: int = 8, **kwargs):
+        """
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param workers: Procesos de búsqueda (None = todos los núcleos)
+        :param margin: Tiempo reservado para repartir y combinar (ms)
+        :param min_moves: Con menos jugadas en la raíz se busca en un solo proceso
+        :param kwargs: Parámetros de SearchAgent
+        """
+        super().__init__(color, **kwargs)
+        self.workers = workers or os.cpu_count() or 1
+        self.margin = margin
+        self.min_moves = min_moves
+        self.tt_mb = kwargs.get("tt_mb", 16)
+        self.parallel = self.workers > 1   # False si el pool falla
+
+    def init(self, color: str, board, time: int = 20000):
+        """
+        Inicializa el agente y arranca (una sola vez) los procesos del pool.
+        """
+        super().init(color, board, time)
+        if self.parallel:
+            try:
+                pool = _pool(self.workers)
+                wait([pool.submit(_warmup, self.size, self.tt_mb) for _ in range(self.workers)])
+            except Exception:
+                self.parallel = False
+
+    def deepen(self, bb: BitBoard, moves, best: int) -> int:
+        """
+        Búsqueda en paralelo hasta self._deadline; en un solo proceso si no
+        hay varios núcleos o la raíz tiene pocas jugadas.
+        """
+        if not self.parallel or len(moves) < max(self.min_moves, 2 * self.workers):
+            return super().deepen(bb, moves, best)
+
+        ordered = self.orderer.order(bb, moves, 0, best)
+        parts = [ordered[k::self.workers] for k in range(self.workers)]
+        remaining = self._deadline - _time.perf_counter() - self.margin / 1000.0
+        if remaining <= 0:
+            return best
+        deadline = _time.time() + remaining
+        tasks = [(bb.size, bb.edges, bb.red, bb.yellow, self.ply, part, deadline,
+                  self.max_depth, self.tt_mb) for part in parts]
+        try:
+            pool = _pool(self.workers)
+            futures = [pool.submit(_search_part, t) for t in tasks]
+        except Exception:
+            self.parallel = False
+            return super().deepen(bb, moves, best)
+
+        # Los procesos revisan la hora en cada nodo (también en el solver del
+        # final de las hojas): el margen cubre el reparto y la respuesta
+        done, not_done = wait(futures, timeout=remaining + self.margin / 1000.0)
+        for future in not_done:
+            future.cancel()
+        results = []
+        for future in done:
+            if future.exception() is None:
+                by_depth, nodes = future.result()
+                self.nodes += nodes
+                if by_depth:
+                    results.append(by_depth)
+        if len(results) < len(parts):
+            # Falta alguna parte de la raíz: sus jugadas no se compararon,
+            # así que no se elige entre las demás (búsqueda en este proceso
+            # con lo que quede de tiempo, o la jugada ya ordenada)
+            self.metrics.incr("parallel_fallbacks")
+            return super().deepen(bb, moves, best)
+        depth = min(max(r) for r in results)
+        self.depth_reached = depth
+        best_value = None
+        for r in results:
+            e, value = r[depth]
+            if best_value is None or value > best_value:
+                best, best_value = e, value
+        self.score = best_value
+        return best
@@ -39,7 +39,7 @@ class RandomAgent(Agent):
         :param time: Tiempo restante en milisegundos
         :return: Lista [fila, columna, lado]
         """
-        moves = board.valid_moves()
+        moves = board.legal_moves()
         if not moves:
             return [0, 0, 0]  # Fallback si no hay movimientos válidos
 
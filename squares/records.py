@@ -0,0 +1,174 @@
+"""
+records.py
+==========
+
+Registro de partidas de Cuadrito (Dots and Boxes) en disco.
+
+Cada partida se guarda como un registro con:
+    - tamaño, tiempo inicial y nombres de los agentes
+    - jugadas [fila, columna, lado] (empieza siempre el rojo y se alterna)
+    - tiempo usado en cada jugada y reloj restante tras ella (ms)
+    - ganador, motivo de fin ('score', 'timeout', 'invalid') y marcador
+
+Formatos:
+    - JSONL (.jsonl): una partida por línea, fácil de inspeccionar.
+    - Binario (.bin): compacto, con estructuras de tamaño fijo por jugada.
+      La última jugada de una partida que no terminó por marcador (la
+      inválida o la que agotó el reloj) puede traer cualquier coordenada,
+      así que va aparte con enteros de 32 bits.
+
+GameRecorder acumula partidas en memoria y las escribe en bloque para no
+pagar una escritura por jugada ni por partida.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import json
+import struct
+
+_MAGIC = b"CQ"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBBBBIHHH")   # magia, versión, tamaño, ganador, motivo, tiempo, marcador R/Y, jugadas
+_MOVE = struct.Struct("<BBBff")           # fila, columna, lado, ms usados, ms restantes
+_LAST = struct.Struct("<Biiiff")          # hay jugada final (0/1), fila, columna, lado, ms usados, ms restantes
+_INT32 = (-2 ** 31, 2 ** 31 - 1)
+
+_WINNERS = {" ": 0, "R": 1, "Y": 2}
+_REASONS = {"score": 0, "timeout": 1, "invalid": 2}
+
+
+def _infer_format(path: str) -> str:
+    return "bin" if str(path).endswith(".bin") else "jsonl"
+
+
+def _encode_binary(record: dict) -> bytes:
+    """Serializa una partida en el formato binario."""
+    names = b""
+    for key in ("red", "yellow"):
+        raw = record.get(key, "").encode("utf-8")[:255]
+        names += bytes([len(raw)]) + raw
+    rows = list(zip(record["moves"], record["times"], record["clock"]))
+    # La jugada que terminó la partida sin marcador no se validó (ni aplicó)
+    last = rows.pop() if rows and record["reason"] != "score" else None
+    parts = [_HEADER.pack(
+        _MAGIC, _VERSION, record["size"],
+        _WINNERS.get(record["winner"], 0), _REASONS.get(record["reason"], 0),
+        int(record["time_limit"]), record["score"][0], record["score"][1], len(rows),
+    ), names]
+    for (r, c, s), t, left in rows:
+        parts.append(_MOVE.pack(r, c, s, t, left))
+    if last is None:
+        parts.append(_LAST.pack(0, 0, 0, 0, 0.0, 0.0))
+    else:
+        move, t, left = last
+        # Coordenadas fuera de int32 (jugadas absurdas) se recortan
+        r, c, s = (min(max(int(v), _INT32[0]), _INT32[1]) for v in move)
+        parts.append(_LAST.pack(1, r, c, s, t, left))
+    return b"".join(parts)
+
+
+def _decode_binary(data: bytes):
+    """Genera las partidas contenidas en un bloque binario."""
+    winners = {v: k for k, v in _WINNERS.items()}
+    reasons = {v: k for k, v in _REASONS.items()}
+    pos = 0
+    while pos < len(data):
+        magic, version, size, winner, reason, time_limit, sr, sy, n = _HEADER.unpack_from(data, pos)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Registro binario inválido en el byte {pos}")
+        pos += _HEADER.size
+        names = []
+        for _ in range(2):
+            length = data[pos]
+            names.append(data[pos + 1:pos + 1 + length].decode("utf-8"))
+            pos += 1 + length
+        moves, times, clock = [], [], []
+        for _ in range(n):
+            r, c, s, t, left = _MOVE.unpack_from(data, pos)
+            pos += _MOVE.size
+            moves.append([r, c, s])
+            times.append(t)
+            clock.append(left)
+        present, r, c, s, t, left = _LAST.unpack_from(data, pos)
+        pos += _LAST.size
+        if present:
+            moves.append([r, c, s])
+            times.append(t)
+            clock.append(left)
+        yield {
+            "size": size, "time_limit": time_limit,
+            "red": names[0], "yellow": names[1],
+            "moves": moves, "times": times, "clock": clock,
+            "winner": winners[winner], "reason": reasons[reason], "score": [sr, sy],
+        }
+
+
+class GameRecorder:
+    """
+    Escritor de partidas con búfer. Se vacía al llenarse el búfer,
+    al llamar a flush() / close() o al salir de un bloque `with`.
+    """
+
+    def __init__(self, path: str, fmt: str = None, buffer_games: int = 256):
+        """
+        :param path: Archivo de salida (se abre en modo añadir)
+        :param fmt: 'jsonl' o 'bin' (por defecto según la extensión)
+        :param buffer_games: Partidas que se acumulan antes de escribir
+        """
+        self.path = path
+        self.fmt = fmt or _infer_format(path)
+        self.buffer_games = buffer_games
+        self._buffer = []
+        self.written = 0
+
+    def write(self, record: dict):
+        """Añade una partida al búfer (y escribe si está lleno)."""
+        if self.fmt == "bin":
+            self._buffer.append(_encode_binary(record))
+        else:
+            self._buffer.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if len(self._buffer) >= self.buffer_games:
+            self.flush()
+
+    def flush(self):
+        """Escribe en disco todas las partidas pendientes."""
+        if not self._buffer:
+            return
+        if self.fmt == "bin":
+            with open(self.path, "ab") as f:
+                f.write(b"".join(self._buffer))
+        else:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(self._buffer))
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Vacía el búfer."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_records(path: str, fmt: str = None):
+    """
+    Lee las partidas guardadas en un archivo.
+
+    :param path: Archivo JSONL o binario
+    :param fmt: 'jsonl' o 'bin' (por defecto según la extensión)
+    :return: Generador de diccionarios (uno por partida)
+    """
+    fmt = fmt or _infer_format(path)
+    if fmt == "bin":
+        with open(path, "rb") as f:
+            yield from _decode_binary(f.read())
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,72 @@
+"""
+registry.py
+===========
+
+Registro de agentes disponibles por nombre.
+
+Permite crear agentes a partir de una cadena (por ejemplo desde la línea
+de comandos, el torneo o la API web) sin importar cada clase a mano:
+
+    from squares.registry import make_agent
+    agent = make_agent("search", color="R")
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import inspect
+from functools import partial
+
+from squares.js_agent import JS_AGENTS, JSAgent, node_path
+from squares.random_agent import RandomAgent
+from squares.smart_agent import SmartAgent
+from squares.search_agent import SearchAgent
+from squares.mcts_agent import MCTSAgent
+from squares.parallel_agent import ParallelSearchAgent
+from squares.solver import PerfectAgent
+
+# Nombre corto -> clase de agente
+AGENTS = {
+    "random": RandomAgent,
+    "smart": SmartAgent,
+    "search": SearchAgent,
+    "mcts": MCTSAgent,
+    "parallel": ParallelSearchAgent,
+    "perfect": PerfectAgent,
+}
+
+# Agentes JavaScript de web/static (solo si Node.js está instalado)
+if node_path():
+    for _name in JS_AGENTS:
+        AGENTS[_name] = partial(JSAgent, _name)
+
+
+def register_agent(name: str, cls):
+    """
+    Registra (o reemplaza) un agente bajo un nombre.
+
+    :param name: Nombre corto del agente
+    :param cls: Subclase de Agent (o fábrica que acepte color=...)
+    """
+    AGENTS[name] = cls
+
+
+def make_agent(name: str, color: str = None, seed: int = None, **kwargs):
+    """
+    Crea una instancia del agente registrado con ese nombre.
+
+    :param name: Nombre corto del agente
+    :param color: Color opcional ('R' o 'Y')
+    :param seed: Semilla para los agentes con generador propio (los que
+                 aceptan `seed` en el constructor, como MCTSAgent); los
+                 demás la ignoran
+    :param kwargs: Parámetros adicionales para el constructor
+    :return: Instancia de Agent
+    """
+    try:
+        cls = AGENTS[name]
+    except KeyError:
+        raise ValueError(f"Agente desconocido: {name!r} (disponibles: {sorted(AGENTS)})")
+    if seed is not None and "seed" in inspect.signature(cls).parameters:
+        kwargs.setdefault("seed", seed)
+    return cls(color=color, **kwargs)
@@ -0,0 +1,426 @@
+"""
+search_agent.py
+================
+
+Implementa un agente de búsqueda (SearchAgent) para el juego Cuadrito
+(Dots and Boxes) con minimax (negamax) y poda alfa-beta.
+
+Características:
+----------------
+1️⃣ Profundización iterativa: busca a profundidad 1, 2, 3, ... y conserva
+   la mejor jugada de la última iteración completa.
+2️⃣ Ordenamiento de jugadas (squares.ordering): primero la mejor jugada
+   de la iteración anterior o de la tabla, luego las líneas "seguras"
+   (no dejan casillas con 3 lados), con heurísticas killer e historia.
+3️⃣ Gestor de tiempo: reparte el tiempo restante que llega en compute()
+   entre las jugadas que faltan, para no perder nunca por reloj. La hora
+   límite se revisa en cada nodo de la búsqueda y del solver del final.
+4️⃣ Tabla de transposición (opcional) indexada por clave Zobrist, que se
+   conserva entre jugadas de la misma partida.
+5️⃣ Final exacto: cuando no quedan líneas seguras juega (y evalúa las hojas)
+   con el EndgameSolver de squares.chains en lugar de buscar. El solver
+   recibe la hora límite de la jugada y, en las hojas, un límite de nodos
+   pequeño (leaf_nodes): si no termina, la hoja se estima.
+6️⃣ Libro de aperturas (opcional, squares.book): si la posición está en el
+   libro se juega sin buscar.
+7️⃣ Pondering (opcional): durante el turno del rival sigue profundizando en
+   un hilo de fondo sobre la posición tras su jugada. Como el valor de una
+   posición no depende de quién mueve, lo guardado en la tabla de
+   transposición sirve tal cual en la siguiente búsqueda.
+8️⃣ Métricas (agent.metrics): por jugada se acumulan nodos, evaluaciones,
+   aciertos de la tabla, profundidad alcanzada y tiempo de cada fase
+   (libro, final exacto, búsqueda), sin costo extra por nodo.
+
+Recordatorio de reglas (igual que squares.js): quien cierra una casilla
+se la entrega al rival y el turno siempre pasa al otro jugador.
+
+Se apoya en BitBoard para aplicar y deshacer jugadas sin clonar.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import time as _time
+
+from squares.agent_base import Agent
+from squares.bitboard import BitBoard
+from squares.book import open_book
+from squares.chains import EndgameSolver, Timeout, has_safe_edge
+from squares.ordering import MoveOrderer
+from squares.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+# Se lanza cuando se agota el tiempo de la jugada (la misma que usa el
+# solver del final, para que una hoja lenta corte también la búsqueda)
+_Timeout = Timeout
+
+
+class SearchAgent(Agent):
+    """
+    Agente que decide con alfa-beta y profundización iterativa,
+    respetando el tiempo disponible en cada llamada a compute().
+    """
+
+    # Tope de cada iteración de la búsqueda en el turno del rival (s)
+    MAX_PONDER_SECONDS = 60.0
+
+    def __init__(self, color: str = None, max_depth: int = 64,
+                 max_move_time: int = 2000, reserve: int = 250, tt_mb: float = 16,
+                 book=None, ponder: bool = False, leaf_nodes: int = 64):
+        """
+        Inicializa el agente con color opcional y parámetros de búsqueda.
+
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param max_depth: Profundidad máxima de la profundización iterativa
+        :param max_move_time: Tope de tiempo por jugada (ms)
+        :param reserve: Tiempo que nunca se gasta del reloj (ms)
+        :param tt_mb: Memoria de la tabla de transposición en MB (0 = sin tabla)
+        :param book: Libro de aperturas (OpeningBook o ruta) opcional
+        :param ponder: Busca también durante el turno del rival
+        :param leaf_nodes: Nodos del solver exacto en cada hoja sin líneas seguras
+        """
+        super().__init__(color)
+        self.ponder = ponder
+        self.ply = None  # código interno del jugador (-1 o -2)
+        self.opp = None  # código del oponente
+        self.max_depth = max_depth
+        self.max_move_time = max_move_time
+        self.reserve = reserve
+        self.tt = TranspositionTable(tt_mb) if tt_mb else None
+        self.endgame = EndgameSolver(max_nodes=2000)
+        self.leaf_nodes = leaf_nodes
+        self.book = open_book(book)
+        self.orderer = MoveOrderer()
+
+        # Estadísticas de la última búsqueda
+        self.nodes = 0
+        self.evals = 0
+        self.depth_reached = 0
+        self.score = None  # valor de la jugada elegida (None si no se conoce)
+        self._deadline = 0.0
+        self._iteration = 0
+
+        # Búsqueda en el turno del rival
+        self.ponder_nodes = 0
+        self.ponder_depth = 0
+        self._ponder_best = -1
+
+    def init(self, color: str, board, time: int = 20000):
+        """
+        Inicializa el agente con su color y tiempo total.
+
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param board: Tablero inicial (instancia Board o matriz)
+        :param time: Tiempo total en milisegundos
+        """
+        self.stop_pondering()
+        super().init(color, board, time)
+        self.ply = -1 if color == "R" else -2
+        self.opp = -2 if color == "R" else -1
+        if self.tt is not None:
+            self.tt.clear()
+        self.endgame.memo.clear()
+        self.orderer.reset()
+
+    # ----------------------------------------------------------------------
+    # Gestor de tiempo
+    # ----------------------------------------------------------------------
+
+    def budget(self, free_edges: int, time: int) -> float:
+        """
+        Calcula el tiempo (ms) que se puede usar en esta jugada.
+
+        Se estima que quedan free_edges / 2 jugadas propias y se reparte
+        el reloj entre ellas, dejando siempre una reserva de seguridad.
+
+        :param free_edges: Líneas libres en el tablero
+        :param time: Tiempo restante del reloj (ms)
+        :return: Presupuesto en milisegundos
+        """
+        usable = max(0.0, time - self.reserve)
+        my_moves = max(1, (free_edges + 1) // 2)
+        return min(usable / my_moves, usable * 0.5, self.max_move_time)
+
+    # ----------------------------------------------------------------------
+    # Búsqueda
+    # ----------------------------------------------------------------------
+
+    def order_moves(self, bb: BitBoard, moves, first: int = -1, ply: int = 0):
+        """
+        Ordena las jugadas con el MoveOrderer del agente.
+
+        :param bb: Tablero actual
+        :param moves: Lista de índices de línea
+        :param first: Línea a probar primero (-1 si ninguna)
+        :param ply: Distancia a la raíz
+        :return: Lista ordenada de índices de línea
+        """
+        return self.orderer.order(bb, moves, ply, first)
+
+    def evaluate(self, bb: BitBoard) -> int:
+        """
+        Estimación del resto de la partida para quien mueve en una hoja.
+        Si ya no quedan líneas seguras el final se resuelve de forma exacta;
+        si eso excede leaf_nodes, quien mueve tendrá que regalar al menos
+        una casilla. Pasada la hora límite se corta la búsqueda (_Timeout).
+
+        :param bb: Tablero en la hoja
+        :return: Valor estimado (casillas, desde el punto de vista de quien mueve)
+        """
+        if has_safe_edge(bb):
+            return 0
+        value = self.endgame.value(bb, max_nodes=self.leaf_nodes, deadline=self._deadline)
+        return -1 if value is None else value
+
+    def negamax(self, bb: BitBoard, depth: int, alpha: int, beta: int, color: int) -> int:
+        """
+        Negamax con poda alfa-beta.
+
+        El valor es la diferencia de casillas (propias - rivales) que
+        obtendrá desde aquí quien mueve.
+
+        :param bb: Tablero (se modifica y se restaura)
+        :param depth: Profundidad restante
+        :param alpha: Cota inferior
+        :param beta: Cota superior
+        :param color: Código de quien mueve (-1 o -2)
+        :return: Valor de la posición
+        """
+        self.nodes += 1
+        if _time.perf_counter() >= self._deadline:
+            raise _Timeout
+
+        if depth == 0:
+            self.evals += 1
+            return 0 if bb.edges == bb.layout.full else self.evaluate(bb)
+        moves = bb.legal_edges()
+        if not moves:
+            return 0
+
+        tt = self.tt
+        tt_move = -1
+        if tt is not None:
+            entry = tt.probe(bb.hash)
+            if entry is not None:
+                tt_depth, tt_value, flag, tt_move = entry
+                if tt_depth >= depth:
+                    if flag == EXACT:
+                        return tt_value
+                    if flag == LOWER and tt_value >= beta:
+                        return tt_value
+                    if flag == UPPER and tt_value <= alpha:
+                        return tt_value
+
+        alpha0 = alpha
+        other = -1 if color == -2 else -2
+        best = -bb.layout.n_cells - 1
+        best_move = -1
+        ply = self._iteration - depth
+        for e in self.orderer.order(bb, moves, ply, tt_move):
+            given = bb.make_move(e, color)
+            value = -given - self.negamax(bb, depth - 1, -beta - given, -alpha - given, other)
+            bb.unmake_move()
+            if value > best:
+                best = value
+                best_move = e
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.orderer.cutoff(e, ply, depth)
+                        break
+
+        if tt is not None:
+            flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+            tt.store(bb.hash, depth, best, flag, best_move)
+        return best
+
+    def search_root(self, bb: BitBoard, moves, depth: int, first: int, color: int = None):
+        """
+        Busca todas las jugadas de la raíz a la profundidad indicada.
+
+        :param color: Código de quien mueve en la raíz (por defecto el agente)
+        :return: Tupla (mejor línea, valor)
+        """
+        color = self.ply if color is None else color
+        alpha = -bb.layout.n_cells - 1
+        beta = bb.layout.n_cells + 1
+        other = -1 if color == -2 else -2
+        best_move, best_value = first, alpha
+        self._iteration = depth
+        for e in self.orderer.order(bb, moves, 0, first):
+            given = bb.make_move(e, color)
+            value = -given - self.negamax(bb, depth - 1, -beta - given, -alpha - given, other)
+            bb.unmake_move()
+            if value > best_value:
+                best_move, best_value = e, value
+                alpha = max(alpha, value)
+        return best_move, best_value
+
+    def deepen(self, bb: BitBoard, moves, best: int) -> int:
+        """
+        Profundización iterativa hasta la hora límite (self._deadline).
+
+        :param bb: Tablero de la raíz
+        :param moves: Líneas libres
+        :param best: Jugada a probar primero
+        :return: Mejor línea de la última iteración completa
+        """
+        for depth in range(1, min(self.max_depth, len(moves)) + 1):
+            try:
+                best, self.score = self.search_root(bb, moves, depth, best)
+            except _Timeout:
+                break
+            self.depth_reached = depth
+        return best
+
+    # ----------------------------------------------------------------------
+    # Métricas
+    # ----------------------------------------------------------------------
+
+    def _record(self, phase: str, start: float):
+        """
+        Acumula en self.metrics lo hecho en la jugada.
+
+        :param phase: Fase que decidió la jugada ('book', 'endgame' o 'search')
+        :param start: Inicio de compute() (perf_counter)
+        """
+        m = self.metrics
+        m.incr("moves")
+        m.incr(phase + "_moves")
+        m.observe(phase + "_seconds", _time.perf_counter() - start)
+        if phase == "search":
+            m.incr("nodes", self.nodes)
+            m.incr("evaluations", self.evals)
+            m.observe("depth", self.depth_reached)
+
+    # ----------------------------------------------------------------------
+    # Método principal de decisión
+    # ----------------------------------------------------------------------
+
+    def compute(self, board, time: int):
+        """
+        Selecciona una jugada con profundización iterativa dentro del
+        presupuesto de tiempo.
+
+        :param board: Estado actual del tablero (Board, BitBoard o matriz)
+        :param time: Tiempo restante en milisegundos
+        :return: Lista [fila, columna, lado]
+        """
+        start = _time.perf_counter()
+        self.stop_pondering()
+        if self.ply is None:
+            self.init(self.color or "R", getattr(board, "grid", board), time)
+        bb = BitBoard.from_board(board)
+        moves = bb.legal_edges()
+        if not moves:
+            return [0, 0, 0]
+
+        self.nodes = 0
+        self.evals = 0
+        self.depth_reached = 0
+        self.score = None
+        if self.book is not None:
+            e = self.book.lookup(bb)
+            if e is not None:
+                self._record("book", start)
+                return list(bb.layout.moves[e])
+        self.orderer.age()
+        best = self.orderer.order(bb, moves)[0]
+
+        # Sin líneas seguras: el final se resuelve sin búsqueda (con la misma
+        # hora límite; si no termina, se juega la primera jugada ordenada)
+        self._deadline = start + self.budget(len(moves), time) / 1000.0
+        try:
+            solved = self.endgame.best_move(bb, self.ply, deadline=self._deadline)
+        except _Timeout:
+            self.metrics.incr("endgame_timeouts")
+            solved = None
+        if solved is not None:
+            self.score = solved[1]
+            self.metrics.incr("endgame_nodes", self.endgame.nodes)
+            self._record("endgame", start)
+            return list(bb.layout.moves[solved[0]])
+
+        if len(moves) > 1:
+            tt = self.tt
+            hits, misses = (tt.hits, tt.misses) if tt is not None else (0, 0)
+            best = self.deepen(bb, moves, best)
+            if tt is not None:
+                self.metrics.incr("tt_hits", tt.hits - hits)
+                self.metrics.incr("tt_misses", tt.misses - misses)
+        self._record("search", start)
+
+        if self.ponder:
+            after = bb.clone()
+            after.make_move(best, self.ply)
+            if after.legal_edges() and not self.endgame.applicable(after):
+                self.ponder_nodes = 0
+                self.ponder_depth = 0
+                self._ponder_best = -1
+                self.start_pondering(after)
+        return list(bb.layout.moves[best])
+
+    def analyze(self, board, move_time: int, max_depth: int = None) -> dict:
+        """
+        Analiza una posición suelta: busca hasta move_time ms (sin reparto
+        del reloj) y como mucho hasta max_depth.
+
+        :return: Diccionario con move, score (diferencia de casillas que
+                 obtendrá desde aquí quien mueve; None si no se completó
+                 ninguna iteración) y depth
+        """
+        saved = self.max_depth, self.max_move_time, self.ponder
+        if max_depth is not None:
+            self.max_depth = min(self.max_depth, max_depth)
+        self.max_move_time, self.ponder = move_time, False
+        try:
+            move = self.compute(board, float("inf"))
+        finally:
+            self.max_depth, self.max_move_time, self.ponder = saved
+        return {"move": [int(v) for v in move], "score": self.score,
+                "depth": self.depth_reached}
+
+    # ----------------------------------------------------------------------
+    # Pondering
+    # ----------------------------------------------------------------------
+
+    def ponder_step(self, board: BitBoard) -> bool:
+        """
+        Una iteración más de la profundización sobre la posición tras la
+        jugada propia (mueve el rival); los resultados quedan en la tabla.
+
+        :param board: Posición tras la jugada propia
+        :return: False al llegar a la profundidad máxima o al ser interrumpida
+        """
+        moves = board.legal_edges()
+        depth = self.ponder_depth + 1
+        if depth > min(self.max_depth, len(moves)):
+            return False
+        self._deadline = self.step_deadline(self.MAX_PONDER_SECONDS)
+        if self._ponder_stop.is_set():
+            return False
+        self.nodes = 0
+        try:
+            self._ponder_best, _ = self.search_root(board, moves, depth, self._ponder_best, self.opp)
+        except _Timeout:
+            return False
+        finally:
+            self.ponder_nodes += self.nodes
+        self.ponder_depth = depth
+        return True
+
+    def cancel_pondering(self):
+        """Corta la búsqueda de fondo en el próximo nodo, sin esperarla."""
+        self._ponder_stop.set()
+        self._deadline = 0.0
+        super().cancel_pondering()
+
+    def stop_pondering(self):
+        """Interrumpe la búsqueda de fondo en el próximo control de tiempo."""
+        if self._ponder_thread is None:
+            return
+        start = _time.perf_counter()
+        self._ponder_stop.set()
+        self._deadline = 0.0
+        super().stop_pondering()
+        self.metrics.observe("ponder_stop_seconds", _time.perf_counter() - start)
+        self.metrics.incr("ponder_nodes", self.ponder_nodes)
@@ -10,6 +10,12 @@ Estrategia principal:
 1️⃣ Prioriza movimientos que cierren cuadros (maximiza su puntuación).
 2️⃣ Evita movimientos que dejen casillas con 3 lados (riesgo de regalar punto).
 3️⃣ En caso de empate, prefiere movimientos en los bordes.
+4️⃣ Cuando ya no quedan líneas seguras, juega el final de forma exacta
+   (EndgameSolver de squares.chains) en lugar de regalar cadenas a ciegas,
+   con una parte del reloj como límite; si no termina a tiempo vuelve a la
+   heurística.
+5️⃣ Métricas (agent.metrics): copias del tablero, jugadas probadas,
+   evaluaciones y tiempo de cada fase, acumuladas una vez por jugada.
 
 Basado en la guía del profesor (squares.js) y adaptado a Python.
 
@@ -18,7 +24,9 @@ Fecha: 2025
 """
 
 from squares.agent_base import Agent
+from squares.chains import EndgameSolver, Timeout
 import math
+import time as _time
 
 
 class SmartAgent(Agent):
@@ -27,6 +35,10 @@ class SmartAgent(Agent):
     para decidir el siguiente movimiento.
     """
 
+    # Tope del final exacto por jugada (ms) y tiempo que nunca se gasta
+    MAX_ENDGAME_TIME = 2000
+    RESERVE = 250
+
     def __init__(self, color: str = None):
         """
         Inicializa el agente con color opcional.
@@ -34,6 +46,7 @@ class SmartAgent(Agent):
         super().__init__(color)
         self.ply = None  # código interno del jugador (-1 o -2)
         self.opp = None  # código del oponente
+        self.endgame = EndgameSolver()
 
     def init(self, color: str, board, time: int = 20000):
         """
@@ -52,28 +65,15 @@ class SmartAgent(Agent):
     # ----------------------------------------------------------------------
 
     def count_color(self, b, code: int) -> int:
-        """Cuenta cuántas casillas pertenecen a un color."""
-        count = 0
-        for i in range(b.size):
-            for j in range(b.size):
-                if b.grid[i][j] == code:
-                    count += 1
-        return count
+        """Cuenta cuántas casillas pertenecen a un color (contador del Board)."""
+        return b.boxes(code)
 
     def count_three_sides(self, b) -> int:
         """
         Cuenta las casillas con exactamente tres lados marcados.
         Estas casillas son 'peligrosas' (pueden regalar punto).
         """
-        n = 0
-        for i in range(b.size):
-            for j in range(b.size):
-                v = b.grid[i][j]
-                if v >= 0:
-                    bits = ((v & 1) > 0) + ((v & 2) > 0) + ((v & 4) > 0) + ((v & 8) > 0)
-                    if bits == 3:
-                        n += 1
-        return n
+        return b.three_sided
 
     def evaluate(self, before, after) -> float:
         """
@@ -93,6 +93,19 @@ class SmartAgent(Agent):
 
         return 1000 * gain - 5 * risk_delta
 
+    def endgame_budget(self, free_edges: int, time: int) -> float:
+        """
+        Tiempo (ms) para el final exacto: el reloj repartido entre las
+        jugadas propias que faltan, con el mismo esquema que SearchAgent.
+
+        :param free_edges: Líneas libres en el tablero
+        :param time: Tiempo restante del reloj (ms)
+        :return: Presupuesto en milisegundos
+        """
+        usable = max(0.0, time - self.RESERVE)
+        my_moves = max(1, (free_edges + 1) // 2)
+        return min(usable / my_moves, usable * 0.5, self.MAX_ENDGAME_TIME)
+
     # ----------------------------------------------------------------------
     # Método principal de decisión
     # ----------------------------------------------------------------------
@@ -105,27 +118,51 @@ class SmartAgent(Agent):
         :param time: Tiempo restante en milisegundos
         :return: Lista [fila, columna, lado]
         """
-        moves = board.valid_moves()
-        if not moves:
+        start = _time.perf_counter()
+        edges = sorted(board.free_edge_ids())
+        if not edges:
             return [0, 0, 0]
 
+        layout = board.layout
+        metrics = self.metrics
+        metrics.incr("moves")
+        deadline = start + self.endgame_budget(len(edges), time) / 1000.0
+        try:
+            solved = self.endgame.best_move(board, self.ply, deadline=deadline)
+        except Timeout:
+            metrics.incr("endgame_timeouts")
+            solved = None
+        if solved is not None:
+            metrics.incr("endgame_moves")
+            metrics.incr("endgame_nodes", self.endgame.nodes)
+            metrics.observe("endgame_seconds", _time.perf_counter() - start)
+            return list(layout.moves[solved[0]])
+
         best_move = None
         best_score = -math.inf
 
-        for (i, j, s) in moves:
-            simulated = board.clone()
+        # Una sola copia: cada jugada se prueba y se deshace con undo()
+        simulated = board.clone()
+        for e in edges:
+            i, j, s = layout.moves[e]
             ok = simulated.move(i, j, s, self.ply)
             if not ok:
                 continue
 
             score = self.evaluate(board, simulated)
+            simulated.undo()
 
-            # Bonificación leve si el movimiento está en el borde
-            if i == 0 or j == 0 or i == board.size - 1 or j == board.size - 1:
+            # Bonificación leve si la línea toca una casilla del borde
+            if layout.touches_border[e]:
                 score += 1
 
             if score > best_score:
                 best_score = score
                 best_move = (i, j, s)
 
+        metrics.incr("search_moves")
+        metrics.incr("clones")
+        metrics.incr("moves_applied", len(edges))
+        metrics.incr("evaluations", len(edges))
+        metrics.observe("search_seconds", _time.perf_counter() - start)
         return list(best_move)
@@ -0,0 +1,267 @@
+"""
+solver.py
+=========
+
+Solución exacta de tableros pequeños de Cuadrito (Dots and Boxes).
+
+Para 3x3 y 4x4 todas las posiciones alcanzables caben en memoria: se
+calculan sus valores exactos una sola vez y se guardan en una tabla
+compacta (claves ordenadas + valores de un byte) que puede escribirse
+en disco y abrirse con mmap.
+
+Reducción del espacio de estados:
+    - Simetrías: cada posición se guarda con su forma canónica bajo las
+      8 simetrías del tablero (ver squares.book).
+    - Marcador: el valor es la diferencia de casillas que obtendrá desde
+      ahí quien mueve, que solo depende de las líneas dibujadas; el
+      marcador ya conseguido (y de quién es el turno) no forma parte de
+      la clave.
+    - Solo se alcanzan conjuntos de líneas "cerrados": ninguna casilla
+      libre queda con tres lados, porque squares.js la completa sola.
+
+Recordatorio de reglas (igual que squares.js): quien cierra una casilla
+se la entrega al rival y el turno siempre pasa al otro jugador.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+
+from squares.agent_base import Agent
+from squares.bitboard import BitBoard
+from squares.book import MAX_BOOK_SIZE, canonical
+from squares.search_agent import SearchAgent
+
+_MAGIC = b"CQDB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHQ")   # magia, versión, tamaño, relleno, posiciones
+
+# Tamaños que se resuelven en segundos con Python puro
+MAX_SOLVE_SIZE = 4
+
+_TABLES = {}
+
+
+def solve(size: int) -> dict:
+    """
+    Calcula el valor exacto de todas las posiciones alcanzables.
+
+    :param size: Tamaño del tablero (hasta MAX_BOOK_SIZE; 5x5 es muy lento)
+    :return: Diccionario {máscara canónica de líneas: valor para quien mueve}
+    """
+    if size > MAX_BOOK_SIZE:
+        raise ValueError(f"Solo se pueden resolver tableros de hasta {MAX_BOOK_SIZE}x{MAX_BOOK_SIZE}")
+    values = {}
+    bb = BitBoard(size)
+
+    def value(bb):
+        key = canonical(size, bb.edges)[0]
+        best = values.get(key)
+        if best is not None:
+            return best
+        moves = bb.legal_edges()
+        best = 0 if not moves else -bb.layout.n_cells - 1
+        for e in moves:
+            given = bb.make_move(e, -1)
+            v = -given - value(bb)
+            bb.unmake_move()
+            if v > best:
+                best = v
+        values[key] = best
+        return best
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 4 * bb.layout.n_edges + 100))
+    try:
+        value(bb)
+    finally:
+        sys.setrecursionlimit(limit)
+    return values
+
+
+class SolutionTable:
+    """
+    Tabla de valores exactos: claves canónicas ordenadas (64 bits) y
+    valores (8 bits con signo) en arreglos paralelos.
+    """
+
+    def __init__(self, size: int, keys, values):
+        """
+        :param size: Tamaño del tablero
+        :param keys: Secuencia ordenada de máscaras canónicas
+        :param values: Valores, en el mismo orden
+        """
+        self.size = size
+        self.keys = keys
+        self.values = values
+        self._map = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, size: int):
+        """Resuelve el tamaño dado y construye la tabla en memoria."""
+        solved = solve(size)
+        keys = array("Q", sorted(solved))
+        return cls(size, keys, array("b", (solved[k] for k in keys)))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Abre una tabla guardada con save() usando mmap (solo lectura).
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, _, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            data.close()
+            raise ValueError(f"{path!r} no es una tabla de soluciones válida")
+        view = memoryview(data)
+        start = _HEADER.size
+        table = cls(size, view[start:start + 8 * count].cast("Q"),
+                    view[start + 8 * count:start + 9 * count].cast("b"))
+        table._map = data
+        return table
+
+    def save(self, path: str):
+        """Escribe la tabla en disco."""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.size, 0, len(self.keys)))
+            f.write(struct.pack(f"<{len(self.keys)}Q", *self.keys))
+            f.write(struct.pack(f"<{len(self.values)}b", *self.values))
+
+    # ----------------------------------------------------------------------
+    # Consultas
+    # ----------------------------------------------------------------------
+
+    def value(self, board):
+        """
+        Valor exacto de la posición para quien mueve.
+
+        :param board: Board, BitBoard o matriz (del tamaño de la tabla)
+        :return: Diferencia de casillas (propias - rivales) desde aquí con juego perfecto
+        """
+        bb = board if isinstance(board, BitBoard) else BitBoard.from_board(board)
+        if bb.size != self.size:
+            raise ValueError(f"La tabla es de {self.size}x{self.size}")
+        key = canonical(self.size, bb.edges)[0]
+        pos = bisect.bisect_left(self.keys, key)
+        if pos == len(self.keys) or self.keys[pos] != key:
+            raise KeyError("Posición no alcanzable (alguna casilla libre tiene tres lados)")
+        return self.values[pos]
+
+    def move_values(self, board):
+        """
+        Valor exacto de cada jugada legal.
+
+        :param board: Board, BitBoard o matriz
+        :return: Lista de tuplas (línea, valor para quien mueve)
+        """
+        bb = BitBoard.from_board(board)
+        out = []
+        for e in bb.legal_edges():
+            given = bb.make_move(e, -1)
+            out.append((e, -given - self.value(bb)))
+            bb.unmake_move()
+        return out
+
+    def best_move(self, board):
+        """
+        Jugada perfecta.
+
+        :param board: Board, BitBoard o matriz
+        :return: Tupla (línea, valor) o None si no quedan líneas libres
+        """
+        scored = self.move_values(board)
+        if not scored:
+            return None
+        return max(scored, key=lambda m: m[1])
+
+    def close(self):
+        """Libera el mapeo si la tabla se abrió con load()."""
+        if self._map is not None:
+            self.keys.release()
+            self.values.release()
+            self._map.close()
+            self._map = None
+
+
+def table(size: int, path: str = None) -> SolutionTable:
+    """
+    Tabla de soluciones de un tamaño (se resuelve o carga una sola vez).
+
+    :param size: Tamaño del tablero
+    :param path: Archivo guardado con SolutionTable.save (opcional)
+    :return: SolutionTable compartida
+    """
+    t = _TABLES.get(size)
+    if t is None:
+        t = SolutionTable.load(path) if path else SolutionTable.build(size)
+        if t.size != size:
+            raise ValueError(f"{path!r} es una tabla de {t.size}x{t.size}, no de {size}x{size}")
+        _TABLES[size] = t
+    return t
+
+
+def best_move(board):
+    """
+    Jugada perfecta en un tablero pequeño.
+
+    :param board: Board, BitBoard o matriz de tamaño <= MAX_SOLVE_SIZE
+    :return: Lista [fila, columna, lado] o None si no quedan líneas libres
+    """
+    bb = BitBoard.from_board(board)
+    best = table(bb.size).best_move(bb)
+    return None if best is None else list(bb.layout.moves[best[0]])
+
+
+class PerfectAgent(Agent):
+    """
+    Agente de juego perfecto para tableros pequeños. En tableros mayores
+    que MAX_SOLVE_SIZE delega en SearchAgent.
+    """
+
+    def __init__(self, color: str = None, path: str = None):
+        """
+        :param color: 'R' (rojo) o 'Y' (amarillo)
+        :param path: Tabla guardada en disco (opcional; si no, se resuelve al iniciar)
+        """
+        super().__init__(color)
+        self.path = path
+        self.table = None
+        self.fallback = None
+
+    def init(self, color: str, board, time: int = 20000):
+        """
+        Prepara la tabla del tamaño de la partida (o el agente de respaldo).
+        """
+        super().init(color, board, time)
+        if self.size <= MAX_SOLVE_SIZE:
+            self.table = table(self.size, self.path)
+            self.fallback = None
+        else:
+            self.table = None
+            self.fallback = SearchAgent(color)
+            self.fallback.init(color, board, time)
+
+    def compute(self, board, time: int):
+        """
+        :param board: Estado actual del tablero (Board, BitBoard o matriz)
+        :param time: Tiempo restante en milisegundos
+        :return: Lista [fila, columna, lado]
+        """
+        if self.table is None and self.fallback is None:
+            self.init(self.color or "R", getattr(board, "grid", board), time)
+        if self.fallback is not None:
+            return self.fallback.compute(board, time)
+        bb = BitBoard.from_board(board)
+        best = self.table.best_move(bb)
+        if best is None:
+            return [0, 0, 0]
+        return list(bb.layout.moves[best[0]])
@@ -0,0 +1,163 @@
+"""
+transposition.py
+================
+
+Tabla de transposición de tamaño fijo para los agentes de búsqueda.
+
+La tabla se organiza en cubetas de dos entradas:
+    - Entrada "por profundidad": solo se reemplaza por una búsqueda
+      igual o más profunda.
+    - Entrada "siempre": se reemplaza en cada almacenamiento que no
+      cabe en la anterior.
+
+La memoria se reserva al crear la tabla con arreglos compactos
+(módulo array), a partir de un tope en MB, y no crece después.
+
+Uso típico dentro de una búsqueda negamax:
+
+    entry = tt.probe(bb.hash)
+    ...
+    tt.store(bb.hash, depth, value, flag, best_move)
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+from array import array
+
+# Tipos de cota almacenada
+EXACT = 0
+LOWER = 1   # el valor real es >= value (corte beta)
+UPPER = 2   # el valor real es <= value (ninguna jugada superó alfa)
+
+# Bytes por entrada: clave (8) + valor (2) + profundidad (1) + cota (1) + jugada (2)
+ENTRY_BYTES = 14
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición acotada en memoria con política de reemplazo
+    por profundidad / siempre, y estadísticas de uso.
+    """
+
+    def __init__(self, mb: float = 16):
+        """
+        Reserva la tabla.
+
+        :param mb: Memoria máxima en megabytes
+        """
+        buckets = 1
+        while (buckets * 2) * 2 * ENTRY_BYTES <= mb * (1 << 20):
+            buckets *= 2
+        self.buckets = buckets
+        self.mask = buckets - 1
+        size = 2 * buckets
+        self.keys = array("Q", bytes(8 * size))
+        self.values = array("h", bytes(2 * size))
+        self.depths = array("b", [-1]) * size
+        self.flags = array("b", bytes(size))
+        self.moves = array("h", bytes(2 * size))
+        self.reset_stats()
+
+    # ----------------------------------------------------------------------
+
+    def reset_stats(self):
+        """Pone a cero los contadores de aciertos, fallos y colisiones."""
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def clear(self):
+        """Vacía la tabla (la memoria reservada se conserva)."""
+        size = 2 * self.buckets
+        self.depths = array("b", [-1]) * size
+        self.reset_stats()
+
+    @property
+    def capacity(self) -> int:
+        """Número máximo de entradas."""
+        return 2 * self.buckets
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memoria ocupada por los arreglos de la tabla."""
+        return self.capacity * ENTRY_BYTES
+
+    def stats(self) -> dict:
+        """
+        Estadísticas de uso desde el último reset_stats().
+
+        :return: Diccionario con hits, misses, collisions, stores y hit_rate
+        """
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "capacity": self.capacity,
+        }
+
+    # ----------------------------------------------------------------------
+
+    def probe(self, key: int):
+        """
+        Busca una posición en la tabla.
+
+        :param key: Clave Zobrist de 64 bits
+        :return: Tupla (profundidad, valor, cota, jugada) o None
+        """
+        slot = (key & self.mask) << 1
+        depths = self.depths
+        for i in (slot, slot + 1):
+            if depths[i] >= 0 and self.keys[i] == key:
+                self.hits += 1
+                return depths[i], self.values[i], self.flags[i], self.moves[i]
+        self.misses += 1
+        if depths[slot] >= 0 or depths[slot + 1] >= 0:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: int = -1):
+        """
+        Guarda el resultado de una búsqueda.
+
+        Si la posición ya está en la cubeta se actualiza en su lugar;
+        si no, ocupa la entrada por profundidad cuando la nueva búsqueda
+        es al menos igual de profunda (lo desplazado baja a la entrada
+        "siempre") y, en otro caso, la entrada "siempre".
+
+        :param key: Clave Zobrist de 64 bits
+        :param depth: Profundidad de la búsqueda (0..127)
+        :param value: Valor obtenido
+        :param flag: EXACT, LOWER o UPPER
+        :param move: Mejor línea encontrada (-1 si ninguna)
+        """
+        slot = (key & self.mask) << 1
+        depths = self.depths
+        if depths[slot] >= 0 and self.keys[slot] == key:
+            if depth < depths[slot]:
+                return
+            i = slot
+        elif depths[slot + 1] >= 0 and self.keys[slot + 1] == key:
+            i = slot + 1
+        elif depth >= depths[slot]:
+            i = slot
+            if depths[slot] >= 0:
+                # La entrada desplazada pasa a la entrada "siempre"
+                j = slot + 1
+                self.keys[j] = self.keys[slot]
+                depths[j] = depths[slot]
+                self.values[j] = self.values[slot]
+                self.flags[j] = self.flags[slot]
+                self.moves[j] = self.moves[slot]
+        else:
+            i = slot + 1
+        self.keys[i] = key
+        depths[i] = min(depth, 127)
+        self.values[i] = value
+        self.flags[i] = flag
+        self.moves[i] = move
+        self.stores += 1
@@ -0,0 +1,238 @@
+"""
+wire.py
+=======
+
+Formato compacto del estado del tablero de Cuadrito (Dots and Boxes)
+para la API web.
+
+La matriz Board.grid / squares.js en JSON ocupa varios bytes por casilla
+y hay que recorrerla entera al leerla. Este formato guarda los mismos
+datos como enteros empaquetados:
+
+    byte 0      versión del formato (1)
+    byte 1      tamaño n del tablero (1..255)
+    líneas      ceil(2·n·(n+1) / 8) bytes: bit e = línea e dibujada
+                (índice canónico de squares.edges, little-endian)
+    rojas       ceil(n² / 8) bytes: bit b = casilla b = i·n + j del rojo
+    amarillas   ceil(n² / 8) bytes: ídem para el amarillo
+
+Para JSON se envía en base64 (un 4x4 ocupa 16 caracteres; un 64x64,
+unos 2.8 KB frente a ~14 KB de la matriz). BitBoard lo lee y escribe
+directamente (to_bytes / from_bytes). Para Board, encode_grid y
+decode_grid pasan de la matriz a los bits con operaciones sobre bytes y
+enteros grandes (bytes.translate, int(texto, 2), casillas en carriles de
+8 bits), sin recorrer las casillas una a una en Python.
+
+Al leer, el tamaño del byte 1 se compara con `max_size` antes de tocar
+nada más: squares.edges.layout calcula y guarda en caché las tablas de
+cada tamaño, y un dato recibido de fuera no debe llegar a generarlas para
+tableros que no se van a aceptar (el servidor web pasa su tope).
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import base64
+import binascii
+from array import array
+from itertools import chain
+
+from squares.edges import layout
+
+VERSION = 1
+
+# Mayor tamaño que cabe en el byte 1
+MAX_SIZE = 255
+
+# Casilla (byte con signo de la matriz: 0..15, 0xFF = -1, 0xFE = -2) -> '0' / '1'
+def _char_table(test) -> bytes:
+    return bytes(49 if test(v) else 48 for v in range(256))
+
+
+_TOP = _char_table(lambda v: v >= 0xFE or v & 1)
+_RIGHT = _char_table(lambda v: v >= 0xFE or v & 2)
+_BOTTOM = _char_table(lambda v: v >= 0xFE or v & 4)
+_LEFT = _char_table(lambda v: v >= 0xFE or v & 8)
+_RED = _char_table(lambda v: v == 0xFF)
+_YELLOW = _char_table(lambda v: v == 0xFE)
+
+# '0' / '1' -> 0 / 1
+_DIGIT = bytes(v - 48 if v in (48, 49) else 0 for v in range(256))
+
+
+def _nbytes(bits: int) -> int:
+    return (bits + 7) >> 3
+
+
+def _bits(chars: bytes) -> int:
+    """Texto de '0' / '1' (el carácter k es el bit k) -> entero."""
+    return int(chars[::-1], 2) if chars else 0
+
+
+def _lanes(value: int, count: int) -> bytes:
+    """Bits 0..count-1 de value -> un byte 0 / 1 por bit."""
+    return format(value, f"0{count}b").encode("ascii")[::-1].translate(_DIGIT)
+
+
+def packed_size(size: int) -> int:
+    """
+    Bytes que ocupa un tablero del tamaño indicado.
+
+    :param size: Tamaño del tablero
+    :return: Longitud del bloque empaquetado
+    """
+    return 2 + _nbytes(2 * size * (size + 1)) + 2 * _nbytes(size * size)
+
+
+# --------------------------------------------------------------------------
+# Enteros empaquetados
+# --------------------------------------------------------------------------
+
+def pack(size: int, edges: int, red: int, yellow: int) -> bytes:
+    """
+    Empaqueta un estado del tablero (el borde exterior siempre va dibujado).
+
+    :param size: Tamaño del tablero
+    :param edges: Entero con un bit por línea dibujada
+    :param red: Entero con un bit por casilla del rojo
+    :param yellow: Entero con un bit por casilla del amarillo
+    :return: Bytes en el formato del módulo
+    """
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"Tamaño fuera de rango para el formato compacto: {size}")
+    lay = layout(size)
+    nb_edges = _nbytes(lay.n_edges)
+    nb_cells = _nbytes(lay.n_cells)
+    return (bytes((VERSION, size))
+            + (edges | lay.border).to_bytes(nb_edges, "little")
+            + red.to_bytes(nb_cells, "little")
+            + yellow.to_bytes(nb_cells, "little"))
+
+
+def unpack(data: bytes, max_size: int = MAX_SIZE):
+    """
+    Lee y valida un estado empaquetado.
+
+    El borde exterior se considera siempre dibujado (igual que Board.init).
+
+    :param data: Bytes en el formato del módulo
+    :param max_size: Mayor tamaño aceptado
+    :return: Tupla (tamaño, líneas, rojas, amarillas)
+    :raises ValueError: Si los datos no son un tablero válido o su tamaño
+                        pasa de max_size
+    """
+    size, edges, red, yellow = _read(data, max_size)
+    _cell_values(size, edges, red, yellow)
+    return size, edges, red, yellow
+
+
+def _read(data: bytes, max_size: int):
+    """
+    Separa los campos y comprueba longitudes y rangos (el tamaño, antes de
+    pedir las tablas de squares.edges).
+    """
+    if len(data) < 2 or data[0] != VERSION:
+        raise ValueError("Formato compacto desconocido")
+    size = data[1]
+    if not 1 <= size <= max_size:
+        raise ValueError(f"Tamaño del tablero compacto fuera de rango (1..{max_size}): {size}")
+    if len(data) != packed_size(size):
+        raise ValueError("Longitud del tablero compacto incorrecta")
+    lay = layout(size)
+    nb_edges = _nbytes(lay.n_edges)
+    nb_cells = _nbytes(lay.n_cells)
+    pos = 2
+    edges = int.from_bytes(data[pos:pos + nb_edges], "little")
+    pos += nb_edges
+    red = int.from_bytes(data[pos:pos + nb_cells], "little")
+    pos += nb_cells
+    yellow = int.from_bytes(data[pos:pos + nb_cells], "little")
+    if edges > lay.full or (red | yellow) >> lay.n_cells:
+        raise ValueError("Bits fuera del tablero")
+    if red & yellow:
+        raise ValueError("Casilla con dos dueños")
+    return size, edges | lay.border, red, yellow
+
+
+def _cell_values(size: int, edges: int, red: int, yellow: int) -> int:
+    """
+    Valores de la matriz en carriles de 8 bits (byte b = casilla b, con
+    -1 / -2 como 0xFF / 0xFE). Comprueba que las casillas con dueño tengan
+    sus cuatro lados.
+    """
+    n = size
+    cells = n * n
+    stride = n + 1
+    horizontal = _lanes(edges & ((1 << (n * stride)) - 1), n * stride)
+    vertical = _lanes(edges >> (n * stride), n * stride)
+    left = b"".join(vertical[i * stride:i * stride + n] for i in range(n))
+    right = b"".join(vertical[i * stride + 1:(i + 1) * stride] for i in range(n))
+    values = (int.from_bytes(horizontal[:cells], "little")
+              | int.from_bytes(right, "little") << 1
+              | int.from_bytes(horizontal[n:], "little") << 2
+              | int.from_bytes(left, "little") << 3)
+    reds = int.from_bytes(_lanes(red, cells), "little")
+    yellows = int.from_bytes(_lanes(yellow, cells), "little")
+    owned = (reds | yellows) * 15
+    if values & owned != owned:
+        raise ValueError("Casilla con dueño a la que le faltan lados")
+    return values ^ reds * 0xF0 ^ yellows * 0xF1
+
+
+# --------------------------------------------------------------------------
+# Matriz Board.grid
+# --------------------------------------------------------------------------
+
+def encode_grid(grid) -> bytes:
+    """
+    Empaqueta una matriz al estilo Board.grid / squares.js.
+
+    :param grid: Lista de listas con valores 0..15, -1 o -2
+    :return: Bytes en el formato del módulo
+    """
+    n = len(grid)
+    flat = array("b", chain.from_iterable(grid)).tobytes()
+    left = flat.translate(_LEFT)
+    right = flat.translate(_RIGHT)
+    edges = _bits(flat.translate(_TOP)) | _bits(flat.translate(_BOTTOM)) << n
+    vertical = (_bits(b"".join(left[i * n:(i + 1) * n] + b"0" for i in range(n)))
+                | _bits(b"".join(b"0" + right[i * n:(i + 1) * n] for i in range(n))))
+    edges |= vertical << (n * (n + 1))
+    return pack(n, edges, _bits(flat.translate(_RED)), _bits(flat.translate(_YELLOW)))
+
+
+def decode_grid(data: bytes, max_size: int = MAX_SIZE):
+    """
+    Lee un tablero empaquetado como matriz al estilo Board.grid.
+
+    :param data: Bytes en el formato del módulo
+    :param max_size: Mayor tamaño aceptado
+    :return: Tupla (tamaño, matriz)
+    :raises ValueError: Si los datos no son un tablero válido o su tamaño
+                        pasa de max_size
+    """
+    size, edges, red, yellow = _read(data, max_size)
+    values = _cell_values(size, edges, red, yellow)
+    flat = array("b", values.to_bytes(size * size, "little")).tolist()
+    return size, [flat[i * size:(i + 1) * size] for i in range(size)]
+
+
+# --------------------------------------------------------------------------
+# Texto para JSON
+# --------------------------------------------------------------------------
+
+def to_base64(data: bytes) -> str:
+    """Bytes empaquetados -> texto base64 (para JSON)."""
+    return base64.b64encode(data).decode("ascii")
+
+
+def from_base64(text: str) -> bytes:
+    """
+    Texto base64 -> bytes empaquetados.
+
+    :raises ValueError: Si el texto no es base64 válido
+    """
+    try:
+        return base64.b64decode(text, validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError(f"base64 inválido: {exc}") from exc
@@ -0,0 +1,61 @@
+"""
+zobrist.py
+==========
+
+Claves Zobrist para las posiciones de Cuadrito (Dots and Boxes).
+
+Cada línea del tablero (índice canónico de squares.edges) recibe un
+entero aleatorio de 64 bits; la clave de una posición es el XOR de las
+claves de sus líneas interiores dibujadas. Board y BitBoard la mantienen
+de forma incremental en cada jugada.
+
+La clave solo depende de las líneas dibujadas: el valor del resto de la
+partida no depende de quién es dueño de las casillas ya cerradas ni de
+qué color mueve (las reglas son simétricas), así que dos posiciones con
+las mismas líneas pueden compartir entrada en la tabla de transposición.
+
+Las claves se generan con una semilla fija para que sean idénticas en
+todos los procesos.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+ZOBRIST_SEED = 0xC0AD21
+
+_KEYS = {}
+
+
+def zobrist_keys(size: int):
+    """
+    Devuelve (y memoriza) las claves Zobrist de un tablero de tamaño dado.
+
+    :param size: Tamaño del tablero
+    :return: Tupla con una clave de 64 bits por línea
+    """
+    keys = _KEYS.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        keys = _KEYS[size] = tuple(rng.getrandbits(64) for _ in range(2 * size * (size + 1)))
+    return keys
+
+
+def hash_edges(size: int, edges: int, border: int = 0) -> int:
+    """
+    Calcula desde cero la clave de un conjunto de líneas.
+
+    :param size: Tamaño del tablero
+    :param edges: Entero con un bit por línea dibujada
+    :param border: Máscara de líneas que no cuentan (el borde exterior)
+    :return: Clave Zobrist de 64 bits
+    """
+    keys = zobrist_keys(size)
+    h = 0
+    rest = edges & ~border
+    while rest:
+        low = rest & -rest
+        h ^= keys[low.bit_length() - 1]
+        rest ^= low
+    return h
@@ -0,0 +1,336 @@
+"""
+test_api.py
+===========
+
+Pruebas de los endpoints del servidor web: jugadas y validación,
+formato compacto (packed), límites de tamaño del tablero, análisis por
+lotes (NDJSON), partidas con sesión, partidas entre agentes (con su
+WebSocket y sus errores) y métricas del servidor.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import base64
+import json
+from functools import partial
+
+import pytest
+from fastapi.testclient import TestClient
+
+from squares import edges, wire, zobrist
+from squares.agent_base import Agent
+from squares.board import Board
+from squares.edges import edge_id
+from squares.registry import AGENTS
+from web import api
+from web.api import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def ndjson(response):
+    """Líneas NDJSON de la respuesta, como diccionarios."""
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def empty_grid(size):
+    """Matriz vacía sin pasar por Board (no calcula las tablas del tamaño)."""
+    return [[0] * size for _ in range(size)]
+
+
+def empty_packed(size):
+    """Tablero compacto vacío sin pasar por Board."""
+    return base64.b64encode(bytes((wire.VERSION, size)) + bytes(wire.packed_size(size) - 2)).decode()
+
+
+# --------------------------------------------------------------------------
+# Jugada y formato compacto
+# --------------------------------------------------------------------------
+
+def test_move_with_grid_and_packed_board_agree(client):
+    board = Board(4)
+    board.move(1, 1, 0, -1)
+    by_grid = client.post("/api/move", json={"board": board.grid, "color": "Y", "agent": "smart"})
+    by_packed = client.post("/api/move", json={"packed": board.to_base64(), "color": "Y",
+                                               "agent": "smart"})
+    assert by_grid.status_code == by_packed.status_code == 200
+    move = by_grid.json()["move"]
+    assert by_packed.json()["move"] == move
+    assert board.check(*move)
+    assert by_grid.json()["edge"] == edge_id(4, *move)
+
+
+@pytest.mark.parametrize("body, status", [
+    ({"board": Board(3).grid, "time": 0}, 422),
+    ({"board": Board(3).grid, "time": -5}, 422),
+    ({"board": empty_grid(65)}, 400),
+    ({"board": [[0]]}, 400),
+    ({"board": Board(3).grid, "packed": Board(3).to_base64()}, 400),
+    ({"packed": "no es base64"}, 400),
+    ({"packed": "AQ=="}, 400),
+    ({"board": Board(3).grid, "agent": "nadie"}, 400),
+])
+def test_move_rejects_invalid_requests(client, body, status):
+    assert client.post("/api/move", json=body).status_code == status
+
+
+# --------------------------------------------------------------------------
+# Límite de tamaño antes de crear el tablero
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("body", [
+    {"board": empty_grid(150)},
+    {"packed": empty_packed(200)},
+])
+def test_oversized_move_is_rejected_before_building_tables(client, body):
+    response = client.post("/api/move", json=body)
+    assert response.status_code == 400
+    assert "Tamaño" in response.json()["detail"]
+    assert 150 not in edges._LAYOUTS and 200 not in edges._LAYOUTS
+    assert 150 not in zobrist._KEYS and 200 not in zobrist._KEYS
+
+
+@pytest.mark.parametrize("size", [1, 65, 255])
+def test_packed_board_outside_the_accepted_sizes_is_rejected(client, size):
+    response = client.post("/api/move", json={"packed": empty_packed(size)})
+    assert response.status_code == 400
+    assert "Tamaño" in response.json()["detail"]
+    if size > 64:
+        assert size not in edges._LAYOUTS
+
+
+def test_oversized_batch_position_is_rejected_before_building_tables(client):
+    lines = [{"board": empty_grid(150), "color": "R"}, {"packed": empty_packed(200), "color": "R"}]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+    response = client.post("/api/analyze/batch", params={"agent": "smart"}, content=body)
+    results = ndjson(response)
+    assert [r["index"] for r in results] == [0, 1]
+    assert all("Tamaño" in r["error"] for r in results)
+    assert 150 not in edges._LAYOUTS and 200 not in edges._LAYOUTS
+
+
+# --------------------------------------------------------------------------
+# Análisis por lotes
+# --------------------------------------------------------------------------
+
+def batch(client, lines, **params):
+    """Envía las posiciones como NDJSON y devuelve los resultados por índice."""
+    body = "".join(line if isinstance(line, str) else json.dumps(line) + "\n" for line in lines)
+    response = client.post("/api/analyze/batch", params=params, content=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return {r["index"]: r for r in ndjson(response)}
+
+
+def test_batch_streams_one_result_per_line(client):
+    board = Board(3)
+    board.move(0, 0, 1, -1)
+    full = Board(2)
+    for i, j, s in full.legal_moves():
+        full.move(i, j, s, -1)
+    lines = [
+        {"packed": board.to_base64(), "color": "Y"},
+        {"board": Board(4).grid, "color": "R"},
+        {"board": full.grid, "color": "R"},
+        {"board": Board(3).grid, "color": "X"},
+        "\nno es json\n",
+    ]
+    results = batch(client, lines, agent="search", time=200, depth=4)
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert board.check(*results[0]["move"])
+    assert results[0]["edge"] == edge_id(3, *results[0]["move"])
+    assert 1 <= results[0]["depth"] <= 4 and results[0]["score"] is not None
+    assert Board(4).check(*results[1]["move"])
+    assert "No quedan jugadas" in results[2]["error"]
+    assert "color" in results[3]["error"]
+    assert "error" in results[4]
+
+
+def test_batch_accepts_a_chunked_body(client):
+    line = (json.dumps({"board": Board(3).grid, "color": "R"}) + "\n").encode()
+
+    def chunks():
+        for _ in range(20):
+            yield line[:10]
+            yield line[10:]
+
+    response = client.post("/api/analyze/batch", params={"agent": "smart"}, content=chunks())
+    results = ndjson(response)
+    assert sorted(r["index"] for r in results) == list(range(20))
+    assert all("move" in r for r in results)
+
+
+def test_batch_stops_at_the_position_limit(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BATCH_POSITIONS", 3)
+    results = batch(client, [{"board": Board(3).grid, "color": "R"}] * 5, agent="random")
+    assert sorted(results) == [0, 1, 2, 3]
+    assert all("move" in results[k] for k in range(3))
+    assert "Lote de más de 3" in results[3]["error"]
+
+
+@pytest.mark.parametrize("last", ["completa", "sin terminar"])
+def test_batch_stops_at_an_oversized_line(client, monkeypatch, last):
+    monkeypatch.setattr(api, "MAX_LINE_BYTES", 200)
+    big = json.dumps({"board": Board(12).grid, "color": "R"})
+    lines = [{"board": Board(3).grid, "color": "R"}, big + ("\n" if last == "completa" else ""),
+             {"board": Board(3).grid, "color": "R"}][:3 if last == "completa" else 2]
+    results = batch(client, lines, agent="random")
+    assert sorted(results) == [0, 1]
+    assert "move" in results[0]
+    assert "Línea de más de 200 bytes" in results[1]["error"]
+
+
+@pytest.mark.parametrize("params", [{"time": 0}, {"time": 10001}, {"depth": 0}, {"depth": 99},
+                                    {"agent": "nadie"}])
+def test_batch_rejects_invalid_limits(client, params):
+    assert client.post("/api/analyze/batch", params=params, content=b"").status_code == 400
+
+
+# --------------------------------------------------------------------------
+# Partidas con sesión
+# --------------------------------------------------------------------------
+
+def test_session_game_flow(client):
+    state = client.post("/api/games", json={"size": 3, "agent": "smart", "agent_color": "Y"}).json()
+    game_id = state["game_id"]
+    assert state["turn"] == "R" and state["board"] == Board(3).grid
+
+    assert client.post(f"/api/games/{game_id}/agent-move", json={"time": 5000}).status_code == 409
+    state = client.post(f"/api/games/{game_id}/moves", json={"move": [1, 1, 0]}).json()
+    assert state["moves"] == 1 and state["turn"] == "Y"
+    assert client.post(f"/api/games/{game_id}/moves", json={"edge": 0}).status_code == 409
+
+    assert client.post(f"/api/games/{game_id}/agent-move", json={"time": 0}).status_code == 422
+    state = client.post(f"/api/games/{game_id}/agent-move", params={"packed": True},
+                        json={"time": 5000}).json()
+    assert state["moves"] == 2
+    board = Board.from_base64(state["packed"])
+    assert client.get(f"/api/games/{game_id}").json()["board"] == board.grid
+
+    assert client.delete(f"/api/games/{game_id}").json()["closed"]
+    assert client.get(f"/api/games/{game_id}").status_code == 404
+
+
+@pytest.mark.parametrize("body, status", [
+    ({"size": 1}, 400),
+    ({"size": 65}, 400),
+    ({"agent": "nadie"}, 400),
+    ({"agent_color": "X"}, 400),
+    ({"time": 0}, 422),
+    ({"time": -1}, 422),
+])
+def test_session_rejects_invalid_games(client, body, status):
+    assert client.post("/api/games", json=body).status_code == status
+
+
+
+# --------------------------------------------------------------------------
+# Partidas entre agentes
+# --------------------------------------------------------------------------
+
+class FailingAgent(Agent):
+    """Agente que falla al calcular su jugada (o al crearse, con broken=True)."""
+
+    def __init__(self, color=None, broken=False):
+        if broken:
+            raise RuntimeError("no se pudo crear el agente")
+        super().__init__(color)
+
+    def compute(self, board, time_left):
+        raise RuntimeError("fallo del agente")
+
+
+def watch(client, match_id):
+    """Eventos del WebSocket de la partida hasta el de fin."""
+    events = []
+    with client.websocket_connect(f"/ws/matches/{match_id}") as ws:
+        while not events or events[-1]["type"] != "end":
+            events.append(ws.receive_json())
+    return events
+
+
+def test_match_is_played_and_streamed(client):
+    started = client.post("/api/matches", json={"size": 3, "red": "smart", "yellow": "random",
+                                                "time": 20000}).json()["matches"]
+    match_id = started[0]["match_id"]
+    events = watch(client, match_id)
+    assert events[0]["type"] == "state"
+    end = events[-1]
+    assert end["reason"] == "score"
+    assert end["score"]["R"] + end["score"]["Y"] == 9
+
+    state = client.get(f"/api/matches/{match_id}").json()
+    assert state["status"] == "finished"
+    assert match_id in [m["match_id"] for m in client.get("/api/matches").json()["matches"]]
+    assert client.delete(f"/api/matches/{match_id}").json()["cancelled"]
+    assert client.get(f"/api/matches/{match_id}").status_code == 404
+
+
+@pytest.mark.parametrize("failing, winner", [("yellow", "R"), ("red", "Y")])
+def test_agent_error_ends_the_match_for_the_opponent(client, monkeypatch, failing, winner):
+    monkeypatch.setitem(AGENTS, "falla", FailingAgent)
+    body = {"size": 3, "red": "random", "yellow": "random", failing: "falla"}
+    match_id = client.post("/api/matches", json=body).json()["matches"][0]["match_id"]
+    end = watch(client, match_id)[-1]
+    assert (end["winner"], end["reason"]) == (winner, "error")
+    state = client.get(f"/api/matches/{match_id}").json()
+    assert (state["status"], state["reason"]) == ("finished", "error")
+
+
+def test_agent_that_cannot_be_created_ends_the_match_without_winner(client, monkeypatch):
+    monkeypatch.setitem(AGENTS, "roto", partial(FailingAgent, broken=True))
+    body = {"size": 3, "red": "random", "yellow": "roto"}
+    match_id = client.post("/api/matches", json=body).json()["matches"][0]["match_id"]
+    end = watch(client, match_id)[-1]
+    assert (end["winner"], end["reason"], end["moves"]) == (" ", "error", 0)
+
+
+@pytest.mark.parametrize("body", [{"size": 65}, {"count": 0}, {"red": "nadie"}])
+def test_match_rejects_invalid_requests(client, body):
+    assert client.post("/api/matches", json=body).status_code == 400
+
+
+@pytest.mark.parametrize("body", [{"time": 0}, {"time": -100}, {"delay": -1}])
+def test_match_rejects_invalid_clock(client, body):
+    assert client.post("/api/matches", json=body).status_code == 422
+
+
+# --------------------------------------------------------------------------
+# Métricas
+# --------------------------------------------------------------------------
+
+def metric(text, line_start):
+    """Valor de la línea de la exposición que empieza por `line_start` (0 si no está)."""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_report_gauges_and_agent_counters(client):
+    before = client.get("/api/metrics").text
+    for _ in range(2):
+        client.post("/api/move", json={"board": Board(4).grid, "color": "R", "agent": "smart"})
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    for gauge in ("sessions", "sessions_bytes", "matches", "matches_running", "agent_pool_workers"):
+        assert f"# TYPE cuadrito_{gauge} gauge" in text
+    moves = 'cuadrito_moves_total{agent="smart"}'
+    count = 'cuadrito_compute_seconds_count{agent="smart"}'
+    assert metric(text, moves) == metric(before, moves) + 2
+    assert metric(text, count) == metric(before, count) + 2
+
+
+def test_metrics_gauges_follow_the_sessions(client):
+    sessions = metric(client.get("/api/metrics").text, "cuadrito_sessions")
+    game = client.post("/api/games", json={"size": 3, "agent": "random"}).json()
+    assert metric(client.get("/api/metrics").text, "cuadrito_sessions") == sessions + 1
+    client.delete(f"/api/games/{game['game_id']}")
+    assert metric(client.get("/api/metrics").text, "cuadrito_sessions") == sessions
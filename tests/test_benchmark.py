@@ -0,0 +1,105 @@
+"""
+test_benchmark.py
+=================
+
+Pruebas del método de medición de benchmark.py con un reloj simulado:
+tiempo medio por llamada de cada lote, percentiles y ops/s de la mediana,
+p99 por lote y detección de regresiones con el umbral de cada benchmark.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import pytest
+
+import benchmark
+from squares.board import Board
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj simulado: cada lectura avanza `step` ns (se puede cambiar)."""
+    state = {"now": 0, "step": 1000}
+
+    def perf_counter_ns():
+        state["now"] += state["step"]
+        return state["now"]
+
+    monkeypatch.setattr(benchmark.time, "perf_counter_ns", perf_counter_ns)
+    return state
+
+
+def test_timed_returns_the_mean_of_a_batch(clock):
+    calls = []
+    clock["step"] = 5000    # una lectura antes y otra después del lote
+    assert benchmark.timed(calls.append, 1, number=10) == 500
+    assert calls == [1] * 10
+
+
+def test_timed_moves_applies_the_move_once_per_copy(clock):
+    board = Board(3)
+    copies = [board.clone() for _ in range(4)]
+    clock["step"] = 4000
+    assert benchmark.timed_moves(copies, (1, 1, 0), -1) == 1000
+    assert all(not c.check(1, 1, 0) for c in copies)
+    assert board.check(1, 1, 0)
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = list(range(1, 101))
+    assert benchmark.percentile(values, 50) == 50
+    assert benchmark.percentile(values, 99) == 99
+    assert benchmark.percentile(values, 100) == 100
+    assert benchmark.percentile([7], 99) == 7
+    assert benchmark.percentile([], 50) == 0.0
+
+
+def test_summary_reports_the_median_and_the_batch_tail():
+    samples = [1000] * 98 + [5000, 90000]       # ns por llamada de cada lote
+    row = benchmark.summarize("move", 4, samples, inner=20)
+    assert (row["bench"], row["size"], row["n"], row["inner"]) == ("move", 4, 100, 20)
+    assert row["p50_us"] == 1.0
+    assert row["ops_per_sec"] == pytest.approx(1e6)
+    assert row["p99_batch_us"] == 5.0
+    assert row["mean_us"] == pytest.approx(sum(samples) / 100 / 1000)
+
+
+def test_a_slow_call_is_diluted_in_its_batch(clock):
+    """Una llamada de 1 ms en un lote de 20 llamadas de 1 µs: el lote mide ~51 µs."""
+    durations = iter([1000] * 19 + [1000000])
+
+    def call():
+        clock["now"] += next(durations)
+
+    clock["step"] = 0        # solo avanzan las llamadas
+    mean = benchmark.timed(call, number=20)
+    assert mean == (19 * 1000 + 1000000) / 20
+    row = benchmark.summarize("winner", 3, [1000] * 99 + [mean], inner=20)
+    assert row["p99_batch_us"] == 1.0        # la llamada de 1 ms no aparece en el p99
+
+
+def test_board_samples_have_one_mean_per_batch():
+    boards = benchmark.positions(3, 4, seed=1)
+    times = benchmark.bench_board(3, boards, samples=8, inner=5)
+    assert set(times) == {"move", "clone", "valid_moves", "winner"}
+    for name in ("clone", "valid_moves", "winner"):
+        assert len(times[name]) == 8
+    assert all(t > 0 for t in times["clone"])
+
+
+def test_run_records_the_batch_size_of_each_bench():
+    results = benchmark.run([3], samples=4, smart_samples=2, games=1,
+                            positions_per_size=2, inner=3)
+    inner = {r["bench"]: r["inner"] for r in results}
+    assert inner == {"move": 3, "clone": 3, "valid_moves": 3, "winner": 3,
+                     "smart_compute": 1, "game": 1}
+
+
+def test_compare_uses_the_game_threshold_for_games(capsys):
+    baseline = [benchmark.summarize("move", 3, [1000]), benchmark.summarize("game", 3, [1000])]
+    current = [benchmark.summarize("move", 3, [1200]), benchmark.summarize("game", 3, [1200])]
+    regressions = benchmark.compare(current, baseline, threshold=0.1, game_threshold=0.25)
+    assert regressions == [("move", 3, 1.0, 1.2)]
+    current[1] = benchmark.summarize("game", 3, [1300])
+    assert [r[0] for r in benchmark.compare(current, baseline, 0.1, 0.25)] == ["move", "game"]
+    assert "Comparación" in capsys.readouterr().out
@@ -0,0 +1,203 @@
+"""
+test_board.py
+=============
+
+Pruebas del tablero: equivalencia entre Board y BitBoard bajo juego al
+azar, contadores incrementales, Board.undo() y make_move / unmake_move.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.board import Board
+from squares.smart_agent import SmartAgent
+
+
+def random_game(size: int, seed: int):
+    """
+    Genera las jugadas de una partida al azar hasta llenar el tablero.
+
+    :return: Lista de tuplas (fila, columna, lado, color)
+    """
+    rng = random.Random(seed)
+    board = Board(size)
+    color = -1
+    moves = []
+    while board.free_edge_ids():
+        i, j, s = rng.choice(board.valid_moves())
+        assert board.move(i, j, s, color)
+        moves.append((i, j, s, color))
+        color = -2 if color == -1 else -1
+    return moves
+
+
+def recount(grid):
+    """Contadores de Board calculados desde cero a partir de la matriz."""
+    red = sum(v == -1 for row in grid for v in row)
+    yellow = sum(v == -2 for row in grid for v in row)
+    sides = [0] * 5
+    for row in grid:
+        for v in row:
+            if v >= 0:
+                sides[bin(v).count("1")] += 1
+    return red, yellow, sides
+
+
+# --------------------------------------------------------------------------
+# Board contra BitBoard
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 7])
+@pytest.mark.parametrize("seed", range(8))
+def test_bitboard_matches_board_under_random_play(size, seed):
+    board = Board(size)
+    bb = BitBoard(size)
+    for i, j, s, color in random_game(size, seed):
+        assert board.move(i, j, s, color)
+        assert bb.move(i, j, s, color)
+        assert bb.grid == board.grid
+        assert bb.hash == board.hash
+        assert (bb.red_boxes, bb.yellow_boxes) == (board.red_boxes, board.yellow_boxes)
+        assert bb.free_edges == board.free_edges
+        assert bb.sides_histogram == board.sides_histogram
+        assert bb.three_sided == board.three_sided
+        assert sorted(bb.legal_edges()) == sorted(board.free_edge_ids())
+        assert bb.valid_moves() == board.valid_moves()
+        assert bb.winner() == board.winner()
+    assert bb.filled == board.filled == size * size
+
+
+def test_bitboard_rejects_the_same_moves_as_board():
+    board = Board(4)
+    bb = BitBoard(4)
+    board.move(0, 0, 1, -1)
+    bb.move(0, 0, 1, -1)
+    for move in [(0, 0, 0), (0, 0, 1), (0, 1, 3), (-1, 0, 0), (4, 0, 0), (0, 0, 4), (0, 300, 7)]:
+        assert bb.check(*move) == board.check(*move)
+        assert not bb.move(*move, -2)
+        assert not board.move(*move, -2)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bitboard_from_grid_rebuilds_the_same_state(seed):
+    board = Board(5)
+    bb = BitBoard(5)
+    for i, j, s, color in random_game(5, seed)[:8]:
+        board.move(i, j, s, color)
+        bb.move(i, j, s, color)
+    copy = BitBoard.from_grid(board.grid)
+    assert (copy.edges, copy.red, copy.yellow, copy.hash) == (bb.edges, bb.red, bb.yellow, bb.hash)
+    clone = bb.clone()
+    clone.make_move(clone.legal_edges()[0], -1)
+    assert clone.edges != bb.edges
+
+
+# --------------------------------------------------------------------------
+# Contadores incrementales
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_counters_match_a_full_recount(seed):
+    board = Board(6)
+    for i, j, s, color in random_game(6, seed):
+        board.move(i, j, s, color)
+        red, yellow, sides = recount(board.grid)
+        assert (board.red_boxes, board.yellow_boxes) == (red, yellow)
+        assert board.filled == red + yellow
+        assert board.sides_histogram == tuple(sides[:4])
+        assert board.three_sided == sides[3]
+        assert board.free_edges == len(board.free_edge_ids())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_smart_heuristic_gives_the_same_scores_on_bitboard(seed):
+    agent = SmartAgent("R")
+    agent.init("R", Board(5).grid)
+    board = Board(5)
+    bb = BitBoard(5)
+    for i, j, s, color in random_game(5, seed):
+        before, bb_before = board.clone(), bb.clone()
+        board.move(i, j, s, color)
+        bb.move(i, j, s, color)
+        assert agent.evaluate(bb_before, bb) == agent.evaluate(before, board)
+
+
+# --------------------------------------------------------------------------
+# Deshacer jugadas
+# --------------------------------------------------------------------------
+
+def snapshot(board: Board):
+    """Estado observable completo de un Board."""
+    return ([row[:] for row in board.grid], board.hash, board.red_boxes, board.yellow_boxes,
+            board.sides_histogram, board.last_captured[:], board.free_edges)
+
+
+@pytest.mark.parametrize("size", [2, 3, 5, 8])
+@pytest.mark.parametrize("seed", range(4))
+def test_undo_restores_every_intermediate_state(size, seed):
+    board = Board(size)
+    snapshots = []
+    for i, j, s, color in random_game(size, seed):
+        snapshots.append((snapshot(board), sorted(board.free_edge_ids())))
+        board.move(i, j, s, color)
+    for state, free in reversed(snapshots):
+        assert board.undo()
+        assert snapshot(board) == state
+        assert sorted(board.free_edge_ids()) == free
+    assert not board.undo()
+    assert board.grid == Board(size).grid
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_undo_without_the_free_edge_set(seed):
+    """Sin consultar free_edge_ids() durante la partida (conjunto sin crear)."""
+    board = Board(5)
+    moves = random_game(5, seed)
+    for i, j, s, color in moves:
+        board.move(i, j, s, color)
+    for _ in moves[len(moves) // 2:]:
+        assert board.undo()
+    fresh = Board(5)
+    for i, j, s, color in moves[:len(moves) // 2]:
+        fresh.move(i, j, s, color)
+    assert snapshot(board)[:5] == snapshot(fresh)[:5]
+    assert sorted(board.free_edge_ids()) == sorted(fresh.free_edge_ids())
+
+
+def test_undo_ignores_invalid_moves():
+    board = Board(3)
+    board.move(0, 0, 1, -1)
+    assert not board.move(0, 0, 1, -2)
+    assert board.undo()
+    assert not board.undo()
+    assert board.grid == Board(3).grid
+
+
+def test_clone_does_not_share_the_undo_history():
+    board = Board(4)
+    board.move(1, 1, 0, -1)
+    copy = board.clone()
+    copy.move(2, 2, 1, -2)
+    assert copy.undo()
+    assert board.undo() and not board.undo()
+    assert copy.grid != board.grid
+
+@pytest.mark.parametrize("seed", range(4))
+def test_unmake_move_restores_bitboard_state_and_hash(seed):
+    rng = random.Random(seed)
+    bb = BitBoard(5)
+    states = []
+    color = -1
+    while bb.legal_edges():
+        states.append((bb.edges, bb.red, bb.yellow, bb.hash))
+        bb.make_move(rng.choice(bb.legal_edges()), color)
+        color = -2 if color == -1 else -1
+    for state in reversed(states):
+        bb.unmake_move()
+        assert (bb.edges, bb.red, bb.yellow, bb.hash) == state
+    assert bb.hash == 0
@@ -0,0 +1,162 @@
+"""
+test_book.py
+============
+
+Pruebas del libro de aperturas: las 8 simetrías del tablero, la forma
+canónica (igual para toda posición simétrica), la consulta de una
+posición guardada desde cualquiera de sus orientaciones y el uso del
+libro desde SearchAgent.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.book import (MAX_BOOK_SIZE, OpeningBook, _permute, canonical, generate,
+                          symmetries, write_book)
+from squares.edges import layout
+from squares.search_agent import SearchAgent
+
+
+def played(size: int, moves, perm=None) -> BitBoard:
+    """BitBoard tras jugar las líneas dadas (imagen por `perm` si se indica)."""
+    bb = BitBoard(size)
+    color = -1
+    for e in moves:
+        bb.make_move(perm[e] if perm else e, color)
+        color = -2 if color == -1 else -1
+    return bb
+
+
+def random_line(size: int, plies: int, seed: int):
+    """Primeras `plies` líneas de una partida al azar (sin llenar el tablero)."""
+    rng = random.Random(seed)
+    bb = BitBoard(size)
+    moves = []
+    for _ in range(plies):
+        e = rng.choice(bb.legal_edges())
+        bb.make_move(e, -1)
+        if not bb.legal_edges():
+            break
+        moves.append(e)
+    return moves
+
+
+def after(bb: BitBoard, e: int) -> int:
+    """Forma canónica de la posición tras jugar e (jugadas equivalentes por simetría coinciden)."""
+    bb = bb.clone()
+    bb.make_move(e, -1)
+    return canonical(bb.size, bb.edges)[0]
+
+
+# --------------------------------------------------------------------------
+# Simetrías y forma canónica
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5])
+def test_symmetries_are_distinct_permutations_of_the_board(size):
+    lay = layout(size)
+    perms = symmetries(size)
+    assert len(perms) == 8
+    assert perms[0] == list(range(lay.n_edges))
+    assert len({tuple(p) for p in perms}) == 8
+    cells = {frozenset(edges) for edges in lay.cell_edges}
+    for perm in perms:
+        assert sorted(perm) == list(range(lay.n_edges))
+        assert _permute(lay.border, perm) == lay.border
+        for edges in cells:
+            assert frozenset(perm[e] for e in edges) in cells
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_canonical_form_is_shared_by_every_symmetric_position(size):
+    for seed in range(10):
+        moves = random_line(size, 2 + seed, seed)
+        key, k = canonical(size, played(size, moves).edges)
+        assert key == _permute(played(size, moves).edges, symmetries(size)[k])
+        for perm in symmetries(size):
+            assert canonical(size, played(size, moves, perm).edges)[0] == key
+
+
+# --------------------------------------------------------------------------
+# Lectura
+# --------------------------------------------------------------------------
+
+@pytest.fixture
+def small_book(tmp_path):
+    """Libro de 4x4 con unas pocas posiciones y su jugada (en la orientación original)."""
+    size = 4
+    positions = {}
+    entries = {}
+    for seed in range(6):
+        moves = random_line(size, 1 + seed % 3, seed)
+        bb = played(size, moves)
+        best = bb.legal_edges()[seed % len(bb.legal_edges())]
+        key, k = canonical(size, bb.edges)
+        entries[key] = symmetries(size)[k][best]
+        positions[tuple(moves)] = best
+    path = tmp_path / "libro4.book"
+    write_book(str(path), size, entries)
+    with OpeningBook(str(path)) as book:
+        yield book, positions
+
+
+def test_lookup_finds_each_position_in_every_orientation(small_book):
+    book, positions = small_book
+    assert len(book) == len(positions)
+    for moves, best in positions.items():
+        for perm in symmetries(4):
+            bb = played(4, moves, perm)
+            e = book.lookup(bb)
+            # La imagen de la jugada guardada (u otra equivalente si la
+            # posición es simétrica en sí misma)
+            assert after(bb, e) == after(bb, perm[best])
+            assert book.move(bb) == list(bb.layout.moves[e])
+            assert book.lookup(bb.grid) == e
+
+
+def test_lookup_misses_unknown_positions_and_other_sizes(small_book):
+    book, positions = small_book
+    assert book.lookup(BitBoard(4)) is None
+    known = {canonical(4, played(4, m).edges)[0] for m in positions}
+    for seed in range(20):
+        bb = played(4, random_line(4, 6, 100 + seed))
+        if canonical(4, bb.edges)[0] not in known:
+            assert book.lookup(bb) is None
+            assert book.move(bb) is None
+    assert book.lookup(BitBoard(3)) is None
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "roto.book"
+    path.write_bytes(b"XXXX" + bytes(12))
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+
+# --------------------------------------------------------------------------
+# Generación y uso desde un agente
+# --------------------------------------------------------------------------
+
+def test_generated_book_is_played_by_search_agent(tmp_path):
+    entries = generate(3, 2, time_ms=20)
+    assert canonical(3, BitBoard(3).edges)[0] in entries
+    path = tmp_path / "libro3.book"
+    write_book(str(path), 3, entries)
+
+    agent = SearchAgent("R", book=str(path))
+    board = BitBoard(3)
+    agent.init("R", board.grid, 20000)
+    move = agent.compute(board, 20000)
+    assert board.edge_of(*move) == agent.book.lookup(board)
+    assert agent.metrics.counters.get("book_moves") == 1
+    agent.book.close()
+
+
+def test_generate_rejects_boards_without_64_bit_keys():
+    with pytest.raises(ValueError):
+        generate(MAX_BOOK_SIZE + 1, 1)
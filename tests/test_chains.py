@@ -0,0 +1,111 @@
+"""
+test_chains.py
+==============
+
+Pruebas de la descomposición en cadenas y ciclos (todas las líneas de una
+cadena dan el mismo resultado) y del evaluador exacto del final
+(EndgameSolver) contra una búsqueda por fuerza bruta sobre todas las
+líneas libres en tableros pequeños, con sus límites de nodos y de tiempo.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+import time
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.chains import EndgameSolver, Timeout, decompose, has_safe_edge, safe_edges
+from tests.test_search_agent import brute_force
+
+
+def endgames(count: int, seed: int, sizes=(2, 3, 4), max_free: int = 16):
+    """
+    Posiciones sin líneas seguras obtenidas jugando al azar.
+
+    :return: Lista de tuplas (BitBoard, color que mueve)
+    """
+    rng = random.Random(seed)
+    solver = EndgameSolver()
+    out = []
+    while len(out) < count:
+        bb = BitBoard(rng.choice(sizes))
+        color = -1
+        while bb.legal_edges() and not solver.applicable(bb):
+            bb.make_move(rng.choice(bb.legal_edges()), color)
+            color = -2 if color == -1 else -1
+        if bb.legal_edges() and bb.free_edges <= max_free:
+            out.append((bb.clone(), color))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_value_matches_brute_force(seed):
+    solver = EndgameSolver()
+    for bb, color in endgames(40, seed):
+        assert solver.value(bb, color) == brute_force(bb.clone(), color, {})
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_best_move_reaches_the_exact_value(seed):
+    solver = EndgameSolver()
+    for bb, color in endgames(30, seed):
+        e, value = solver.best_move(bb, color)
+        assert value == brute_force(bb.clone(), color, {})
+        other = -1 if color == -2 else -2
+        given = bb.make_move(e, color)
+        assert -given - brute_force(bb, other, {}) == value
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_every_edge_of_a_chain_gives_the_same_result(seed):
+    for bb, color in endgames(20, seed, sizes=(3, 4, 5), max_free=60):
+        groups = decompose(bb).all()
+        assert sorted(e for g in groups for e in g.edges) == sorted(bb.legal_edges())
+        for group in groups:
+            results = set()
+            for e in group.edges:
+                given = bb.make_move(e, color)
+                results.add((given, bb.edges, bb.red, bb.yellow))
+                bb.unmake_move()
+            assert len(results) == 1
+
+
+def test_not_applicable_with_safe_edges_or_full_board():
+    solver = EndgameSolver()
+    bb = BitBoard(4)
+    assert has_safe_edge(bb) and safe_edges(bb)
+    assert not solver.applicable(bb)
+    assert solver.value(bb) is None
+    assert solver.best_move(bb) is None
+    for e in bb.legal_edges():
+        bb.make_move(e, -1)
+    assert not solver.applicable(bb)
+
+
+def large_endgame(seed: int):
+    """Un final de 5x5 con al menos tres cadenas o ciclos."""
+    solver = EndgameSolver()
+    return next((bb, color) for bb, color in endgames(50, seed, sizes=(5,), max_free=60)
+                if len(solver.representatives(bb)) >= 3)
+
+
+def test_node_budget_gives_up_instead_of_searching_on():
+    bb, color = large_endgame(0)
+    solver = EndgameSolver(max_nodes=1)
+    assert solver.value(bb, color) is None
+    assert solver.best_move(bb, color) is None
+    assert solver.nodes == 2
+    assert EndgameSolver().value(bb, color, max_nodes=10 ** 6) is not None
+
+
+def test_deadline_raises_timeout():
+    bb, color = large_endgame(1)
+    solver = EndgameSolver()
+    with pytest.raises(Timeout):
+        solver.value(bb, color, deadline=time.perf_counter() - 1)
+    with pytest.raises(Timeout):
+        solver.best_move(bb, color, deadline=time.perf_counter() - 1)
+    assert solver.value(bb, color, deadline=time.perf_counter() + 60) is not None
@@ -0,0 +1,71 @@
+"""
+test_js_agent.py
+================
+
+Pruebas de los agentes JavaScript en el proceso Node.js: jugadas legales
+de un agente de web/static y plazo de cada jugada (el reloj restante),
+que al vencer termina el proceso y cuenta como jugada fuera de tiempo.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import shutil
+import time
+
+import pytest
+
+from main import Environment
+from squares.board import Board
+from squares.js_agent import JS_AGENTS, STATIC_DIR, JSAgent, JSRuntime, JSTimeoutError, node_path
+from squares.random_agent import RandomAgent
+
+pytestmark = pytest.mark.skipif(node_path() is None, reason="requiere Node.js")
+
+SLOW_AGENT = """
+class SlowAgent extends Agent {
+  compute(board, time) {
+    while (true) {}
+  }
+}
+"""
+
+
+@pytest.fixture
+def slow_runtime(tmp_path, monkeypatch):
+    """Proceso Node.js con un agente que nunca responde ('js-lento')."""
+    shutil.copy(f"{STATIC_DIR}/squares.js", tmp_path / "squares.js")
+    (tmp_path / "slow_agent.js").write_text(SLOW_AGENT, encoding="utf-8")
+    monkeypatch.setitem(JS_AGENTS, "js-lento", ("slow_agent.js", "SlowAgent", []))
+    rt = JSRuntime(static_dir=str(tmp_path))
+    yield rt
+    rt.close()
+
+
+def test_js_agent_plays_a_legal_move():
+    board = Board(4)
+    agent = JSAgent("js-random", "R")
+    agent.init("R", board.grid, 20000)
+    assert board.check(*agent.compute(board, 20000))
+    assert agent.metrics.counters["moves"] == 1
+    assert len(agent.latencies) == len(agent.roundtrips) == 1
+
+
+def test_request_past_its_timeout_stops_the_process(slow_runtime):
+    agent_id = slow_runtime.request("create", file="slow_agent.js", cls="SlowAgent", args=[])["id"]
+    start = time.perf_counter()
+    with pytest.raises(JSTimeoutError):
+        slow_runtime.request("compute", timeout=0.2, id=agent_id, board=Board(3).grid, time=200)
+    assert time.perf_counter() - start < 2
+    assert not slow_runtime.alive
+
+
+def test_slow_move_is_a_timeout_for_the_environment(slow_runtime):
+    agent = JSAgent("js-lento", "R", runtime=slow_runtime)
+    env = Environment(size=3, time_limit=300, verbose=False)
+    start = time.perf_counter()
+    record = env.play(agent, RandomAgent("Y"))
+    assert time.perf_counter() - start < 2
+    assert (record["winner"], record["reason"]) == ("Y", "timeout")
+    assert agent.metrics.counters["timeouts"] == 1
+    assert agent._id is None
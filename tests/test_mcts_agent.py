@@ -0,0 +1,121 @@
+"""
+test_mcts_agent.py
+==================
+
+Pruebas de MCTSAgent: jugadas legales dentro del presupuesto de tiempo,
+simulaciones reproducibles con semilla, reutilización del subárbol entre
+turnos y final exacto acotado por el plazo de la jugada.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import time
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.board import Board
+from squares.mcts_agent import MCTSAgent
+from tests.test_chains import endgames, large_endgame
+from tests.test_search_agent import brute_force, position
+
+
+def new_agent(color: str, board, time_limit: int = 20000, **kwargs) -> MCTSAgent:
+    agent = MCTSAgent(color, **kwargs)
+    agent.init(color, board.grid, time_limit)
+    return agent
+
+
+@pytest.mark.parametrize("size", [3, 5, 8])
+@pytest.mark.parametrize("seed", range(3))
+def test_compute_returns_a_legal_move_within_budget(size, seed):
+    board, color = position(size, seed * size, seed)
+    clock = 1500
+    agent = new_agent(color, board, clock, seed=seed)
+    budget = agent.budget(len(board.free_edge_ids()), clock)
+    start = time.perf_counter()
+    move = agent.compute(board, clock)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert board.check(*move)
+    assert elapsed < budget + 50
+    assert agent.metrics.counters["moves"] == 1
+
+
+def test_compute_does_not_modify_the_board():
+    board, color = position(5, 12, 1)
+    grid = [row[:] for row in board.grid]
+    h = board.hash
+    new_agent(color, board, max_move_time=100).compute(board, 20000)
+    assert board.grid == grid
+    assert board.hash == h
+
+
+def test_rollouts_are_reproducible_and_restore_the_board():
+    board, color = position(6, 20, 3)
+    code = -1 if color == "R" else -2
+    results = []
+    for _ in range(2):
+        agent = new_agent(color, board, seed=5)
+        bb = BitBoard.from_board(board)
+        key = (bb.edges, bb.red, bb.yellow, bb.hash)
+        results.append([agent.rollout(bb, code) for _ in range(20)])
+        assert (bb.edges, bb.red, bb.yellow, bb.hash) == key
+    assert results[0] == results[1]
+    assert all(-36 <= diff <= 36 for diff in results[0])
+
+
+def test_subtree_of_the_opponent_reply_is_reused():
+    board = Board(4)
+    agent = new_agent("R", board, max_move_time=300, seed=1)
+    i, j, s = agent.compute(board, 20000)
+    board.move(i, j, s, -1)
+    assert agent.playouts > 0
+    # Respuesta del rival: la más visitada del subárbol conservado
+    reply = max(agent.root.children.values(), key=lambda n: n.visits)
+    visits = reply.visits
+    assert visits > 0
+    board.move(*board.layout.moves[reply.move], -2)
+    agent.compute(board, 20000)
+    assert agent.reused == visits
+    assert agent.metrics.counters["reused_visits"] == visits
+
+
+def test_unknown_position_starts_a_new_tree():
+    board, color = position(4, 6, 2)
+    agent = new_agent(color, board, max_move_time=100, seed=2)
+    agent.compute(board, 20000)
+    other, other_color = position(4, 9, 7)
+    agent.compute(other, 20000)
+    assert agent.reused == 0
+
+
+def test_endgame_move_reaches_the_exact_value():
+    for bb, code in endgames(10, 5, sizes=(3, 4)):
+        board = Board.from_grid(bb.grid)
+        agent = new_agent("R" if code == -1 else "Y", board)
+        i, j, s = agent.compute(board, 20000)
+        assert agent.metrics.counters.get("endgame_moves") == 1
+        best = brute_force(bb.clone(), code, {})
+        other = -1 if code == -2 else -2
+        given = bb.make_move(bb.edge_of(i, j, s), code)
+        assert -given - brute_force(bb, other, {}) == best
+
+
+def test_exhausted_clock_skips_the_endgame_solve():
+    bb, code = large_endgame(1)
+    board = Board.from_grid(bb.grid)
+    agent = new_agent("R" if code == -1 else "Y", board, seed=3)
+    start = time.perf_counter()
+    move = agent.compute(board, agent.reserve)
+    assert time.perf_counter() - start < 0.5
+    assert board.check(*move)
+    assert agent.metrics.counters.get("endgame_timeouts") == 1
+    assert agent.metrics.counters.get("search_moves") == 1
+
+
+def test_analyze_returns_a_legal_move_without_score():
+    board, color = position(5, 10, 4)
+    result = new_agent(color, board, seed=4).analyze(board, 100)
+    assert board.check(*result["move"])
+    assert result["score"] is None and result["depth"] is None
@@ -0,0 +1,77 @@
+"""
+test_metrics.py
+===============
+
+Pruebas de las métricas de los agentes: contadores y observaciones
+(muestras, suma y máximo), acumulación por nombre en MetricsRegistry,
+texto en el formato de Prometheus y métricas de una partida completa.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+from main import Environment
+from squares.metrics import Metrics, MetricsRegistry
+from squares.search_agent import SearchAgent
+
+
+def test_counters_and_observations():
+    m = Metrics()
+    m.incr("nodes", 10)
+    m.incr("nodes")
+    m.observe("depth", 3)
+    m.observe("depth", 5)
+    m.observe("depth", 4)
+    with m.timer("search_seconds"):
+        pass
+    snap = m.snapshot()
+    assert snap["counters"] == {"nodes": 11}
+    assert snap["observations"]["depth"] == {"count": 3, "sum": 12, "max": 5, "mean": 4.0}
+    assert snap["observations"]["search_seconds"]["count"] == 1
+    m.reset()
+    assert m.snapshot() == {"counters": {}, "observations": {}}
+
+
+def test_registry_accumulates_by_name_and_resets_the_agent():
+    registry = MetricsRegistry()
+    for depth in (2, 6):
+        m = Metrics()
+        m.incr("moves")
+        m.observe("depth", depth)
+        registry.collect("search", m)
+        assert m.counters == {} and m.observations == {}
+    kept = Metrics()
+    kept.incr("moves", 4)
+    registry.collect("mcts", kept, reset=False)
+    assert kept.counters == {"moves": 4}
+    snap = registry.snapshot()
+    assert snap["search"]["counters"] == {"moves": 2}
+    assert snap["search"]["observations"]["depth"]["max"] == 6
+    assert snap["mcts"]["counters"] == {"moves": 4}
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = MetricsRegistry(prefix="test")
+    m = Metrics()
+    m.incr("moves", 3)
+    m.observe("compute_seconds", 0.25)
+    m.observe("compute_seconds", 0.5)
+    registry.collect('js"raro\n', m)
+    lines = registry.render({"sessions": 2, "ratio": 0.5}).splitlines()
+    label = '{agent="js\\"raro\\n"}'
+    assert lines[:4] == ["# TYPE test_ratio gauge", "test_ratio 0.5",
+                         "# TYPE test_sessions gauge", "test_sessions 2"]
+    assert "# TYPE test_moves_total counter" in lines
+    assert f"test_moves_total{label} 3" in lines
+    assert "# TYPE test_compute_seconds summary" in lines
+    assert f"test_compute_seconds_count{label} 2" in lines
+    assert f"test_compute_seconds_sum{label} 0.75" in lines
+    assert f"test_compute_seconds_max{label} 0.5" in lines
+
+
+def test_game_record_counts_the_moves_of_each_agent():
+    env = Environment(size=3, time_limit=20000, verbose=False)
+    record = env.play(SearchAgent("R"), SearchAgent("Y"))
+    red, yellow = (record["metrics"][c]["counters"] for c in ("R", "Y"))
+    assert red["moves"] + yellow["moves"] == len(record["moves"])
+    assert red["moves"] >= yellow["moves"] >= 1
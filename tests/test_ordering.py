@@ -0,0 +1,146 @@
+"""
+test_ordering.py
+================
+
+Pruebas de MoveOrderer: la jugada sugerida primero, líneas seguras antes
+de las que regalan (una casilla y luego dos), orden por historia dentro
+de cada grupo, killers de la misma distancia a la raíz y envejecimiento
+de lo aprendido entre búsquedas.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.ordering import MoveOrderer
+from tests.test_search_agent import position
+
+
+def opened(bb: BitBoard, e: int) -> int:
+    """Casillas de la línea e que ya tienen dos lados (o más)."""
+    lay = bb.layout
+    return sum((bb.edges & lay.cell_mask[c]).bit_count() >= 2 for c in lay.edge_cells[e])
+
+
+def mixed_position(size: int = 5):
+    """Tablero con líneas de los tres grupos (seguras, regalan una, regalan dos)."""
+    for seed in range(50):
+        board, _ = position(size, 2 * size, seed)
+        bb = BitBoard.from_board(board)
+        groups = [opened(bb, e) for e in bb.legal_edges()]
+        if groups.count(0) >= 3 and groups.count(1) and groups.count(2):
+            return bb
+    raise AssertionError("sin posición con los tres grupos")
+
+
+def safe_moves(bb: BitBoard):
+    return [e for e in bb.legal_edges() if opened(bb, e) == 0]
+
+
+# --------------------------------------------------------------------------
+# Grupos
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(5))
+def test_safe_moves_come_before_moves_that_give_boxes(seed):
+    board, _ = position(5, 15 + seed, seed)
+    bb = BitBoard.from_board(board)
+    key = (bb.edges, bb.red, bb.yellow, bb.hash)
+    ordered = MoveOrderer().order(bb, bb.legal_edges())
+    assert (bb.edges, bb.red, bb.yellow, bb.hash) == key
+    assert sorted(ordered) == sorted(bb.legal_edges())
+    groups = [opened(bb, e) for e in ordered]
+    assert groups == sorted(groups)
+    for e in ordered:
+        # Las seguras no cierran nada; las demás regalan al menos una casilla
+        given = bb.make_move(e, -1)
+        bb.unmake_move()
+        assert (given == 0) == (opened(bb, e) == 0)
+
+
+def test_suggested_move_is_first_even_if_it_gives_boxes():
+    bb = mixed_position()
+    worst = next(e for e in bb.legal_edges() if opened(bb, e) == 2)
+    ordered = MoveOrderer().order(bb, bb.legal_edges(), first=worst)
+    assert ordered[0] == worst
+    assert ordered.count(worst) == 1
+    assert [opened(bb, e) for e in ordered[1:]] == sorted(opened(bb, e) for e in ordered[1:])
+
+
+def test_unknown_suggestion_is_ignored():
+    bb = mixed_position()
+    moves = bb.legal_edges()
+    played = next(e for e in range(bb.layout.n_edges) if e not in moves)
+    orderer = MoveOrderer()
+    assert orderer.order(bb, moves, first=played) == orderer.order(bb, moves)
+
+
+# --------------------------------------------------------------------------
+# Historia y killers
+# --------------------------------------------------------------------------
+
+def test_history_orders_moves_inside_their_group():
+    bb = mixed_position()
+    orderer = MoveOrderer()
+    safe = safe_moves(bb)
+    last = orderer.order(bb, bb.legal_edges())[len(safe) - 1]
+    giving = next(e for e in bb.legal_edges() if opened(bb, e) == 1)
+    orderer.cutoff(last, ply=3, depth=2)
+    orderer.cutoff(giving, ply=3, depth=5)
+    ordered = orderer.order(bb, bb.legal_edges())
+    assert ordered[0] == last
+    # La historia no saca a una jugada de su grupo
+    assert ordered[len(safe)] == giving
+    assert orderer.history[last] == 4 and orderer.history[giving] == 25
+
+
+def test_age_halves_the_history():
+    bb = mixed_position()
+    orderer = MoveOrderer()
+    orderer.order(bb, bb.legal_edges())
+    a, b = safe_moves(bb)[:2]
+    orderer.cutoff(a, 0, 3)
+    orderer.cutoff(b, 0, 2)
+    orderer.age()
+    assert (orderer.history[a], orderer.history[b]) == (4, 2)
+    assert orderer.order(bb, [b, a]) == [a, b]
+
+
+def test_killers_are_promoted_only_at_their_ply():
+    bb = mixed_position()
+    orderer = MoveOrderer(killers=True)
+    safe = orderer.order(bb, bb.legal_edges())[:len(safe_moves(bb))]
+    strong, killer = safe[0], safe[-1]
+    orderer.cutoff(strong, ply=0, depth=6)
+    orderer.history[killer] = 0
+    orderer.cutoff(killer, ply=2, depth=1)
+    assert orderer.order(bb, bb.legal_edges(), ply=2)[0] == killer
+    assert orderer.order(bb, bb.legal_edges(), ply=1)[0] == strong
+    # Un killer que regala no sale de su grupo
+    giving = next(e for e in bb.legal_edges() if opened(bb, e) == 2)
+    orderer.cutoff(giving, ply=4, depth=1)
+    assert orderer.order(bb, bb.legal_edges(), ply=4)[-1] in {
+        e for e in bb.legal_edges() if opened(bb, e) == 2}
+    orderer.age()
+    assert orderer.order(bb, bb.legal_edges(), ply=2)[0] == strong
+
+
+def test_killers_are_off_by_default():
+    bb = mixed_position()
+    orderer = MoveOrderer()
+    last = orderer.order(bb, bb.legal_edges())[len(safe_moves(bb)) - 1]
+    orderer.cutoff(last, ply=2, depth=1)
+    orderer.history[last] = 0
+    assert orderer.order(bb, bb.legal_edges(), ply=2) == orderer.order(bb, bb.legal_edges())
+
+
+def test_history_grows_with_the_board():
+    orderer = MoveOrderer()
+    small = BitBoard(3)
+    orderer.order(small, small.legal_edges())
+    big = BitBoard(6)
+    ordered = orderer.order(big, big.legal_edges())
+    assert len(orderer.history) == big.layout.n_edges
+    assert sorted(ordered) == sorted(big.legal_edges())
@@ -0,0 +1,122 @@
+"""
+test_parallel_agent.py
+======================
+
+Pruebas de ParallelSearchAgent: combinación de las partes de la raíz (la
+mayor profundidad que completaron todas y, en ella, la jugada de mayor
+valor), búsqueda en este proceso si falta alguna parte y valor exacto de
+la búsqueda completa repartida entre procesos.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from squares import parallel_agent
+from squares.bitboard import BitBoard
+from squares.parallel_agent import ParallelSearchAgent
+from squares.search_agent import SearchAgent
+from tests.test_search_agent import brute_force, position
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Pool de hilos en lugar de procesos (para sustituir _search_part)."""
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(parallel_agent, "_pool", lambda workers: pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def root(board, color: str, **kwargs):
+    """Agente de 2 procesos listo para deepen() sobre `board`."""
+    agent = ParallelSearchAgent(color, workers=2, min_moves=2, **kwargs)
+    agent.init(color, board.grid, 20000)
+    agent.ply = -1 if color == "R" else -2
+    agent.opp = -1 if agent.ply == -2 else -2
+    agent._deadline = time.perf_counter() + 5
+    bb = BitBoard.from_board(board)
+    return agent, bb, bb.legal_edges()
+
+
+# --------------------------------------------------------------------------
+# Combinación
+# --------------------------------------------------------------------------
+
+def test_merge_takes_the_best_move_at_the_deepest_common_depth(thread_pool, monkeypatch):
+    board, color = position(5, 8, 1)
+    agent, bb, moves = root(board, color)
+    parts = {}
+
+    def fake_search_part(task):
+        part = task[5]
+        k = len(parts)
+        parts[k] = part
+        if k == 0:
+            # Llega más hondo, pero la profundidad 3 no se compara
+            return {1: (part[0], 1), 2: (part[1], 5), 3: (part[2], 99)}, 100
+        return {1: (part[0], 2), 2: (part[0], 7)}, 50
+
+    monkeypatch.setattr(parallel_agent, "_search_part", fake_search_part)
+    best = agent.deepen(bb, moves, moves[0])
+    assert sorted(parts[0] + parts[1]) == sorted(moves)
+    assert best == parts[1][0]
+    assert (agent.depth_reached, agent.score) == (2, 7)
+    assert agent.nodes >= 150
+    assert "parallel_fallbacks" not in agent.metrics.counters
+
+
+@pytest.mark.parametrize("missing", ["empty", "error"])
+def test_missing_part_falls_back_to_this_process(thread_pool, monkeypatch, missing):
+    board, color = position(5, 8, 2)
+    agent, bb, moves = root(board, color, max_depth=2)
+    calls = []
+
+    def fake_search_part(task):
+        calls.append(task[5])
+        if len(calls) == 2:
+            if missing == "error":
+                raise RuntimeError("proceso caído")
+            return {}, 0
+        return {1: (task[5][0], 100)}, 10
+
+    monkeypatch.setattr(parallel_agent, "_search_part", fake_search_part)
+    best = agent.deepen(bb, moves, moves[0])
+    assert agent.metrics.counters["parallel_fallbacks"] == 1
+    assert best in moves
+    assert agent.score != 100     # no sale de una sola parte de la raíz
+
+
+def test_few_root_moves_search_in_this_process(thread_pool, monkeypatch):
+    board, color = position(3, 0, 0)
+    agent, bb, moves = root(board, color)
+    agent.min_moves = len(moves) + 1
+    monkeypatch.setattr(parallel_agent, "_search_part", lambda task: pytest.fail("repartida"))
+    assert agent.deepen(bb, moves, moves[0]) in moves
+
+
+# --------------------------------------------------------------------------
+# Procesos reales
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(2))
+def test_full_depth_parallel_search_finds_the_exact_value(monkeypatch, seed):
+    board, color = position(3, seed, seed)
+    bb = BitBoard.from_board(board)
+    code = -1 if color == "R" else -2
+    agent = ParallelSearchAgent(color, workers=2, min_moves=2)
+    agent.init(color, board.grid, 20000)
+    assert agent.parallel
+
+    def serial(*args):
+        pytest.fail("búsqueda en un solo proceso")
+
+    monkeypatch.setattr(SearchAgent, "deepen", serial)
+    result = agent.analyze(board, 60000)
+    assert result["depth"] == len(bb.legal_edges())
+    assert result["score"] == brute_force(bb.clone(), code, {})
+    assert bb.edge_of(*result["move"]) in bb.legal_edges()
@@ -0,0 +1,125 @@
+"""
+test_records.py
+===============
+
+Pruebas del registro de partidas: ida y vuelta en JSONL y en binario
+(partidas reales, jugada final inválida fuera de rango y fin por reloj),
+búfer de GameRecorder y rechazo de bloques binarios corruptos.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+from main import Environment
+from squares.agent_base import Agent
+from squares.records import GameRecorder, _decode_binary, _encode_binary, read_records
+from squares.registry import make_agent
+
+FIELDS = ("size", "time_limit", "red", "yellow", "moves", "winner", "reason", "score")
+
+
+class FixedAgent(Agent):
+    """Agente que siempre devuelve la misma jugada (válida o no)."""
+
+    def __init__(self, color=None, move=(0, 0, 0)):
+        super().__init__(color)
+        self.move = move
+
+    def compute(self, board, time_left):
+        return self.move
+
+
+def played(seed, size=3):
+    random.seed(seed)
+    env = Environment(size=size, time_limit=20000, verbose=False)
+    return env.play(make_agent("smart", color="R"), make_agent("random", color="Y"))
+
+
+def invalid_game():
+    env = Environment(size=3, time_limit=20000, verbose=False)
+    return env.play(FixedAgent(color="R", move=(10 ** 12, -5, 7)), make_agent("random", color="Y"))
+
+
+def timeout_game():
+    env = Environment(size=3, time_limit=0, verbose=False)
+    return env.play(make_agent("random", color="R"), make_agent("random", color="Y"))
+
+
+def assert_same_game(loaded, record):
+    for key in FIELDS:
+        assert loaded[key] == record[key], key
+    assert loaded["times"] == pytest.approx(record["times"], rel=1e-6)
+    assert loaded["clock"] == pytest.approx(record["clock"], rel=1e-6)
+
+
+# --------------------------------------------------------------------------
+# Ida y vuelta
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("ext", ["jsonl", "bin"])
+def test_recorded_games_read_back_unchanged(tmp_path, ext):
+    records = [played(seed, size) for seed, size in ((1, 3), (2, 4), (3, 5))]
+    path = tmp_path / f"partidas.{ext}"
+    with GameRecorder(str(path)) as recorder:
+        for record in records:
+            recorder.write(record)
+    loaded = list(read_records(str(path)))
+    assert len(loaded) == len(records)
+    for got, record in zip(loaded, records):
+        assert_same_game(got, record)
+
+
+def test_invalid_final_move_is_kept_in_binary():
+    record = invalid_game()
+    assert record["reason"] == "invalid"
+    [loaded] = _decode_binary(_encode_binary(record))
+    assert loaded["moves"] == [[2 ** 31 - 1, -5, 7]]   # recortada a int32
+    assert (loaded["winner"], loaded["reason"]) == ("Y", "invalid")
+
+
+def test_timeout_game_round_trips_in_binary():
+    record = timeout_game()
+    assert record["reason"] == "timeout" and len(record["moves"]) == 1
+    [loaded] = _decode_binary(_encode_binary(record))
+    assert_same_game(loaded, record)
+
+
+def test_invalid_final_move_round_trips_in_jsonl(tmp_path):
+    record = invalid_game()
+    path = tmp_path / "partidas.jsonl"
+    with GameRecorder(str(path)) as recorder:
+        recorder.write(record)
+    [loaded] = read_records(str(path))
+    assert loaded["moves"] == [[10 ** 12, -5, 7]]
+    assert_same_game(loaded, record)
+
+
+# --------------------------------------------------------------------------
+# Búfer y errores
+# --------------------------------------------------------------------------
+
+def test_recorder_writes_in_blocks(tmp_path):
+    path = tmp_path / "partidas.bin"
+    recorder = GameRecorder(str(path), buffer_games=2)
+    record = played(4)
+    recorder.write(record)
+    assert recorder.written == 0 and not path.exists()
+    recorder.write(record)
+    assert recorder.written == 2
+    recorder.write(record)
+    recorder.close()
+    assert recorder.written == 3
+    assert len(list(read_records(str(path)))) == 3
+
+
+def test_unknown_binary_version_is_rejected():
+    data = bytearray(_encode_binary(played(5)))
+    data[2] = 2
+    with pytest.raises(ValueError):
+        list(_decode_binary(bytes(data)))
+    with pytest.raises(ValueError):
+        list(_decode_binary(b"XX" + bytes(data[2:])))
@@ -0,0 +1,124 @@
+"""
+test_search_agent.py
+====================
+
+Pruebas de SearchAgent: jugadas legales dentro del presupuesto de tiempo,
+reparto del reloj y valor exacto de la búsqueda completa comparado con
+una búsqueda por fuerza bruta en tableros pequeños.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+import time
+
+import pytest
+
+from squares.bitboard import BitBoard
+from squares.board import Board
+from squares.search_agent import SearchAgent
+
+
+def brute_force(bb: BitBoard, color: int, memo: dict) -> int:
+    """
+    Negamax completo (todas las líneas) con memoria por clave Zobrist:
+    diferencia de casillas que obtendrá quien mueve hasta el final.
+    """
+    if bb.hash in memo:
+        return memo[bb.hash]
+    edges = bb.legal_edges()
+    if not edges:
+        return 0
+    other = -1 if color == -2 else -2
+    best = None
+    for e in edges:
+        given = bb.make_move(e, color)
+        value = -given - brute_force(bb, other, memo)
+        bb.unmake_move()
+        if best is None or value > best:
+            best = value
+    memo[bb.hash] = best
+    return best
+
+
+def position(size: int, moves: int, seed: int):
+    """
+    Tablero tras `moves` jugadas al azar (como mucho: se para antes de
+    la jugada que llenaría el tablero).
+
+    :return: Tupla (Board, color que mueve: 'R' o 'Y')
+    """
+    rng = random.Random(seed)
+    board = Board(size)
+    color = -1
+    for _ in range(moves):
+        board.move(*rng.choice(board.legal_moves()), color)
+        if not board.free_edge_ids():
+            board.undo()
+            break
+        color = -2 if color == -1 else -1
+    return board, "R" if color == -1 else "Y"
+
+
+def new_agent(color: str, board, time_limit: int = 20000, **kwargs) -> SearchAgent:
+    agent = SearchAgent(color, **kwargs)
+    agent.init(color, board.grid, time_limit)
+    return agent
+
+
+@pytest.mark.parametrize("size", [3, 5, 8])
+@pytest.mark.parametrize("seed", range(3))
+def test_compute_returns_a_legal_move_within_budget(size, seed):
+    board, color = position(size, 2 * seed * size, seed)
+    clock = 1500
+    agent = new_agent(color, board, clock)
+    budget = agent.budget(len(board.free_edge_ids()), clock)
+    start = time.perf_counter()
+    move = agent.compute(board, clock)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert board.check(*move)
+    assert elapsed < budget + 50
+    assert agent.metrics.counters["moves"] == 1
+
+
+def test_budget_splits_the_clock_and_keeps_the_reserve():
+    agent = SearchAgent("R", max_move_time=2000, reserve=250)
+    assert agent.budget(30, 250) == 0
+    assert agent.budget(30, 100) == 0
+    assert agent.budget(30, 3250) == pytest.approx(3000 / 15)
+    assert agent.budget(1, 10 ** 9) == 2000
+    assert agent.budget(2, 1250) == pytest.approx(500)
+
+
+def test_tiny_clock_still_returns_a_legal_move():
+    board, color = position(10, 20, 1)
+    agent = new_agent(color, board, 1)
+    start = time.perf_counter()
+    move = agent.compute(board, 1)
+    assert time.perf_counter() - start < 0.1
+    assert board.check(*move)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_full_depth_search_finds_the_exact_value(seed):
+    board, color = position(3, seed % 3, seed)
+    bb = BitBoard.from_board(board)
+    code = -1 if color == "R" else -2
+    agent = new_agent(color, board)
+    result = agent.analyze(board, 60000)
+    assert agent.metrics.counters["search_moves"] == 1
+    assert result["depth"] == len(bb.legal_edges())
+    assert result["score"] == brute_force(bb.clone(), code, {})
+    e = bb.edge_of(*result["move"])
+    other = -1 if code == -2 else -2
+    given = bb.make_move(e, code)
+    assert -given - brute_force(bb, other, {}) == result["score"]
+
+
+def test_max_depth_limits_the_iterations():
+    board, color = position(6, 10, 2)
+    agent = new_agent(color, board, max_depth=2)
+    result = agent.analyze(board, 10000)
+    assert result["depth"] <= 2
+    assert board.check(*result["move"])
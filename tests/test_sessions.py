@@ -0,0 +1,92 @@
+"""
+test_sessions.py
+================
+
+Pruebas del almacén de sesiones del servidor web: memoria estimada al
+día con las jugadas, descarte LRU por número de sesiones y por memoria y
+búsqueda de fondo (ponder) acotada y cancelada sin esperarla.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import time
+
+from web.sessions import NODE_BYTES, SessionStore
+
+
+def play_agent_move(session):
+    """Jugada del humano (rojo) y respuesta del agente, como hace la API."""
+    move = session.board.legal_moves()[0]
+    assert session.apply(move, "R")
+    assert session.apply(session.agent_compute(200), "Y")
+
+
+def test_memory_estimate_is_refreshed_on_get():
+    store = SessionStore()
+    session = store.create(4, "mcts", "Y", 20000)
+    before = store.total_bytes
+    play_agent_move(session)
+    assert store.total_bytes == before      # aún no se ha vuelto a consultar
+    assert store.get(session.id) is session
+    assert store.total_bytes == session.estimate_bytes()
+    assert store.total_bytes >= before + NODE_BYTES * session.agent.root.visits
+
+
+def test_growing_session_evicts_the_least_recently_used():
+    store = SessionStore(max_bytes=1 << 20)
+    old = store.create(4, "mcts", "Y", 20000)
+    new = store.create(4, "mcts", "Y", 20000)
+    assert len(store) == 2
+    play_agent_move(new)
+    store.max_bytes = store.total_bytes - 1   # el árbol ya no cabe con la otra sesión
+    assert store.get(new.id) is new
+    assert store.get(old.id) is None
+    assert (len(store), store.evicted) == (1, 1)
+
+
+def test_max_sessions_keeps_the_most_recent():
+    store = SessionStore(max_sessions=2)
+    a = store.create(3, "random", "Y", 20000)
+    b = store.create(3, "random", "Y", 20000)
+    store.get(a.id)
+    c = store.create(3, "random", "Y", 20000)
+    assert store.get(b.id) is None
+    assert store.get(a.id) is a and store.get(c.id) is c
+
+
+# --------------------------------------------------------------------------
+# Búsqueda de fondo
+# --------------------------------------------------------------------------
+
+def pondering_session(store):
+    """Sesión de SearchAgent con ponder que ya está buscando en el turno del rival."""
+    session = store.create(8, "search", "Y", 20000, ponder=True)
+    play_agent_move(session)
+    assert session.agent.pondering
+    return session
+
+
+def test_pondering_stops_at_the_limit_inside_a_step():
+    store = SessionStore(ponder_limit=1.0)
+    session = pondering_session(store)
+    thread = session.agent._ponder_thread
+    # En 8x8 la quinta iteración de la profundización dura varios segundos
+    thread.join(timeout=store.ponder_limit + 0.5)
+    assert not thread.is_alive()
+    assert session.agent.ponder_nodes > 0
+
+
+def test_evicting_a_pondering_session_does_not_wait_for_it():
+    store = SessionStore(max_sessions=1, ponder_limit=30.0)
+    session = pondering_session(store)
+    thread = session.agent._ponder_thread
+    start = time.perf_counter()
+    store.create(3, "random", "Y", 20000)
+    assert time.perf_counter() - start < 0.2
+    assert store.get(session.id) is None
+    # Cancelada: acaba en su próximo nodo y suelta su referencia
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert session.agent._ponder_thread is None
+    assert not session.agent.pondering
@@ -0,0 +1,92 @@
+"""
+test_smart_agent.py
+===================
+
+Pruebas de SmartAgent: jugadas legales, final exacto y presupuesto de
+tiempo del final.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+import time
+
+import pytest
+
+from squares.board import Board
+from squares.smart_agent import SmartAgent
+from tests.test_chains import endgames, large_endgame
+from tests.test_search_agent import brute_force
+
+
+def played(size: int, moves: int, seed: int):
+    """
+    Tablero tras `moves` jugadas al azar.
+
+    :return: Tupla (Board, color que mueve: 'R' o 'Y')
+    """
+    rng = random.Random(seed)
+    board = Board(size)
+    color = -1
+    for _ in range(moves):
+        if not board.free_edge_ids():
+            break
+        board.move(*rng.choice(board.valid_moves()), color)
+        color = -2 if color == -1 else -1
+    return board, "R" if color == -1 else "Y"
+
+
+def new_agent(color: str, board, time_limit: int = 20000) -> SmartAgent:
+    agent = SmartAgent(color)
+    agent.init(color, board.grid, time_limit)
+    return agent
+
+
+@pytest.mark.parametrize("size", [3, 5, 8])
+@pytest.mark.parametrize("seed", range(4))
+def test_compute_returns_a_legal_move(size, seed):
+    board, color = played(size, seed, seed)
+    move = new_agent(color, board).compute(board, 20000)
+    assert board.check(*move)
+
+
+def test_compute_does_not_modify_the_board():
+    board, color = played(5, 12, 1)
+    grid = [row[:] for row in board.grid]
+    h = board.hash
+    new_agent(color, board).compute(board, 20000)
+    assert board.grid == grid
+    assert board.hash == h
+
+
+def test_endgame_move_reaches_the_exact_value():
+    for bb, code in endgames(20, 4, sizes=(3, 4)):
+        board = Board.from_grid(bb.grid)
+        agent = new_agent("R" if code == -1 else "Y", board)
+        i, j, s = agent.compute(board, 20000)
+        assert agent.metrics.counters.get("endgame_moves") == 1
+        best = brute_force(bb.clone(), code, {})
+        other = -1 if code == -2 else -2
+        given = bb.make_move(bb.edge_of(i, j, s), code)
+        assert -given - brute_force(bb, other, {}) == best
+
+
+def test_endgame_budget_follows_the_clock():
+    agent = SmartAgent("R")
+    assert agent.endgame_budget(10, SmartAgent.RESERVE) == 0
+    assert agent.endgame_budget(1, 10 ** 9) == SmartAgent.MAX_ENDGAME_TIME
+    assert agent.endgame_budget(40, 2250) == pytest.approx(2000 / 20)
+
+
+def test_exhausted_clock_falls_back_to_the_heuristic():
+    bb, code = large_endgame(0)
+    board = Board.from_grid(bb.grid)
+    agent = new_agent("R" if code == -1 else "Y", board)
+    start = time.perf_counter()
+    move = agent.compute(board, SmartAgent.RESERVE)
+    assert time.perf_counter() - start < 0.5
+    assert board.check(*move)
+    assert agent.metrics.counters.get("endgame_timeouts") == 1
+    assert agent.metrics.counters.get("search_moves") == 1
+
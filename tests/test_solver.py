@@ -0,0 +1,121 @@
+"""
+test_solver.py
+==============
+
+Pruebas de la solución exacta de tableros pequeños: valores de la tabla
+contra la búsqueda por fuerza bruta, jugadas de PerfectAgent de acuerdo
+con la tabla, guardado y lectura con mmap y partidas completas que
+nunca quedan por debajo del valor del tablero vacío.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+from main import Environment
+from squares.bitboard import BitBoard
+from squares.board import Board
+from squares.registry import make_agent
+from squares.search_agent import SearchAgent
+from squares.solver import MAX_SOLVE_SIZE, PerfectAgent, SolutionTable, best_move, table
+from tests.test_search_agent import brute_force
+
+
+def reachable(size: int, count: int, seed: int):
+    """
+    Posiciones de partidas al azar (todas con líneas libres).
+
+    :return: Lista de tuplas (BitBoard, color que mueve)
+    """
+    rng = random.Random(seed)
+    out = []
+    while len(out) < count:
+        bb = BitBoard(size)
+        color = -1
+        while bb.legal_edges() and len(out) < count:
+            out.append((bb.clone(), color))
+            bb.make_move(rng.choice(bb.legal_edges()), color)
+            color = -2 if color == -1 else -1
+    return out
+
+
+# --------------------------------------------------------------------------
+# Tabla exacta
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [2, 3, 4])
+def test_table_values_match_brute_force(size):
+    solved = table(size)
+    memo = {}
+    for bb, color in reachable(size, 60, size):
+        assert solved.value(bb) == brute_force(bb.clone(), color, memo)
+
+
+def test_unreachable_position_and_wrong_size_are_rejected():
+    grid = Board(3).grid
+    grid[1][1] = 7   # tres lados sin cerrar: squares.js la habría completado
+    with pytest.raises(KeyError):
+        table(3).value(grid)
+    with pytest.raises(ValueError):
+        table(3).value(BitBoard(4))
+
+
+def test_saved_table_is_read_back_with_mmap(tmp_path):
+    built = table(3)
+    path = tmp_path / "tabla3.db"
+    built.save(str(path))
+    loaded = SolutionTable.load(str(path))
+    try:
+        assert loaded.size == 3
+        assert list(loaded.keys) == list(built.keys)
+        assert list(loaded.values) == list(built.values)
+        for bb, _ in reachable(3, 20, 1):
+            assert loaded.value(bb) == built.value(bb)
+    finally:
+        loaded.close()
+
+
+# --------------------------------------------------------------------------
+# PerfectAgent
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [3, 4])
+def test_perfect_agent_plays_a_move_with_the_table_value(size):
+    solved = table(size)
+    for bb, color in reachable(size, 40, 10 + size):
+        name = "R" if color == -1 else "Y"
+        agent = PerfectAgent(name)
+        agent.init(name, bb.grid, 20000)
+        i, j, s = agent.compute(Board.from_grid(bb.grid), 20000)
+        e = bb.edge_of(i, j, s)
+        assert e in bb.legal_edges()
+        assert dict(solved.move_values(bb))[e] == solved.value(bb)
+        assert best_move(bb) is not None
+
+
+@pytest.mark.parametrize("size", [3, 4])
+@pytest.mark.parametrize("seed", range(3))
+def test_perfect_agent_never_scores_below_the_game_value(size, seed):
+    value = table(size).value(BitBoard(size))
+    for perfect in ("R", "Y"):
+        random.seed(seed)
+        env = Environment(size=size, time_limit=20000, verbose=False)
+        other = "Y" if perfect == "R" else "R"
+        agents = {perfect: make_agent("perfect", color=perfect),
+                  other: make_agent("random", color=other)}
+        record = env.play(agents["R"], agents["Y"])
+        red, yellow = record["score"]
+        margin = red - yellow if perfect == "R" else yellow - red
+        # El rojo empieza: el valor del tablero vacío es el suyo
+        assert margin >= (value if perfect == "R" else -value)
+
+
+def test_large_boards_fall_back_to_search():
+    board = Board(MAX_SOLVE_SIZE + 2)
+    agent = PerfectAgent("R")
+    agent.init("R", board.grid, 20000)
+    assert agent.table is None and isinstance(agent.fallback, SearchAgent)
+    assert board.check(*agent.compute(board, 2000))
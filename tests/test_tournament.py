@@ -0,0 +1,104 @@
+"""
+test_tournament.py
+==================
+
+Pruebas del torneo sin interfaz: calendario con colores alternados,
+resumen por asiento (también con un agente contra sí mismo), semillas
+reproducibles y fin de partida del Environment con el tablero completo.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+import tournament
+from main import Environment
+from squares.registry import make_agent
+
+
+def fake_record(red, yellow, red_seat, winner, times, size=3):
+    """Registro mínimo con los campos que usa tournament.summarize."""
+    return {"red": red, "yellow": yellow, "red_seat": red_seat, "size": size,
+            "winner": winner, "reason": "score", "times": times}
+
+
+def test_schedule_alternates_colors_and_seeds():
+    tasks = tournament.schedule(["smart", "random"], [3, 4], 4, 1000, 10)
+    assert len(tasks) == 8
+    assert [t[4] for t in tasks] == list(range(10, 18))
+    for k, (red, yellow, size, time_limit, seed, seat) in enumerate(tasks):
+        assert (red, yellow, seat) == (("smart", "random", "a") if k % 2 == 0 else
+                                       ("random", "smart", "b"))
+
+
+def test_summary_counts_each_seat_in_self_play():
+    results = [
+        fake_record("random", "random", "a", "R", [1.0, 10.0, 1.0]),
+        fake_record("random", "random", "b", "Y", [10.0, 1.0, 10.0]),
+        fake_record("random", "random", "a", "Y", [1.0, 10.0]),
+        fake_record("random", "random", "b", " ", [10.0, 1.0]),
+    ]
+    [row] = tournament.summarize(results)
+    assert (row["a"], row["b"], row["games"]) == ("random", "random", 4)
+    assert (row["wins_a"], row["wins_b"], row["draws"]) == (2, 1, 1)
+    assert row["win_rate_a"] == pytest.approx(2.5 / 4)
+    assert row["avg_move_ms"] == {"a": 1.0, "b": 10.0}
+    assert row["max_move_ms"] == {"a": 1.0, "b": 10.0}
+    assert row["avg_clock_ms"] == {"a": pytest.approx(5 / 4), "b": pytest.approx(50 / 4)}
+
+
+def test_summary_keeps_names_with_their_seats():
+    results = [
+        fake_record("smart", "random", "a", "R", [2.0, 4.0]),
+        fake_record("random", "smart", "b", "R", [4.0, 2.0]),
+    ]
+    [row] = tournament.summarize(results)
+    assert (row["a"], row["b"]) == ("smart", "random")
+    assert (row["wins_a"], row["wins_b"]) == (1, 1)
+    assert row["avg_move_ms"] == {"a": 2.0, "b": 4.0}
+
+
+def test_self_play_tournament_runs_both_seats():
+    results, [row] = tournament.run(["random", "random"], [3], 6, seed=3, workers=1)
+    assert row["games"] == 6
+    assert row["wins_a"] + row["wins_b"] + row["draws"] == 6
+    assert [r["red_seat"] for r in results] == ["a", "b"] * 3
+
+
+def test_play_game_is_reproducible():
+    task = ("random", "smart", 4, 20000, 7, "a")
+    first = tournament.play_game(task)
+    second = tournament.play_game(task)
+    assert first["moves"] == second["moves"]
+    assert first["winner"] == second["winner"]
+
+
+def test_seed_reaches_agents_with_their_own_generator():
+    agent = make_agent("mcts", color="R", seed=11)
+    assert agent.rng.random() == random.Random(11).random()
+    make_agent("smart", color="R", seed=11)   # sin generador propio: se ignora
+
+
+# --------------------------------------------------------------------------
+# Fin de partida del Environment
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [3, 4, 6])
+def test_full_game_against_random_ends_by_score(size):
+    random.seed(size)
+    env = Environment(size=size, time_limit=20000, verbose=False)
+    record = env.play(make_agent("smart", color="R"), make_agent("random", color="Y"))
+    assert record["reason"] == "score"
+    assert sum(record["score"]) == size * size
+    assert record["metrics"]["R"]["counters"]["moves"] > 0
+
+
+def test_drawn_full_board_ends_by_score():
+    random.seed(24)
+    env = Environment(size=4, time_limit=20000, verbose=False)
+    record = env.play(make_agent("random", color="R"), make_agent("smart", color="Y"))
+    assert record["score"] == [8, 8]
+    assert (record["winner"], record["reason"]) == (" ", "score")
@@ -0,0 +1,112 @@
+"""
+test_transposition.py
+=====================
+
+Pruebas de las claves Zobrist (incrementales contra calculadas desde
+cero) y de la tabla de transposición: store / probe, reemplazo en la
+cubeta de dos entradas, estadísticas y tope de memoria.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+from squares.bitboard import BitBoard
+from squares.board import Board
+from squares.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from squares.zobrist import hash_edges, zobrist_keys
+
+
+def test_incremental_hash_matches_a_full_recompute():
+    rng = random.Random(5)
+    board = Board(5)
+    bb = BitBoard(5)
+    assert board.hash == bb.hash == 0
+    color = -1
+    while bb.legal_edges():
+        i, j, s = rng.choice(bb.legal_moves())
+        board.move(i, j, s, color)
+        bb.move(i, j, s, color)
+        assert bb.hash == board.hash == hash_edges(5, bb.edges, bb.layout.border)
+        assert Board.from_grid(board.grid).hash == board.hash
+        color = -2 if color == -1 else -1
+
+
+def test_hash_ignores_who_owns_the_boxes():
+    red = BitBoard(3)
+    yellow = BitBoard(3)
+    for e in red.legal_edges()[:6]:
+        red.make_move(e, -1)
+        yellow.make_move(e, -2)
+    assert red.edges == yellow.edges
+    assert red.hash == yellow.hash
+
+
+def test_keys_are_fixed_and_distinct():
+    keys = zobrist_keys(6)
+    assert keys is zobrist_keys(6)
+    assert len(set(keys)) == len(keys) == 2 * 6 * 7
+
+
+def same_bucket(tt: TranspositionTable, key: int, count: int):
+    """Claves distintas que caen en la misma cubeta que `key`."""
+    return [key + k * tt.buckets for k in range(count)]
+
+
+def test_probe_returns_what_was_stored():
+    tt = TranspositionTable(mb=1)
+    key = 0xFEDC_BA98_7654_3210
+    assert tt.probe(key) is None
+    tt.store(key, 6, -13, LOWER, 42)
+    assert tt.probe(key) == (6, -13, LOWER, 42)
+    tt.store(key + 1, 0, 0, EXACT)
+    assert tt.probe(key + 1) == (0, 0, EXACT, -1)
+    assert tt.stats()["hits"] == 2
+    assert tt.stats()["misses"] == 1
+
+
+def test_shallower_result_does_not_overwrite_the_same_position():
+    tt = TranspositionTable(mb=1)
+    tt.store(7, 8, 3, EXACT, 1)
+    tt.store(7, 2, -5, UPPER, 2)
+    assert tt.probe(7) == (8, 3, EXACT, 1)
+    tt.store(7, 9, 4, LOWER, 3)
+    assert tt.probe(7) == (9, 4, LOWER, 3)
+
+
+def test_bucket_keeps_deepest_entry_and_latest_store():
+    tt = TranspositionTable(mb=1)
+    a, b, c, d = same_bucket(tt, 123, 4)
+    tt.store(a, 5, 1, EXACT)
+    tt.store(b, 2, 2, EXACT)          # menos profunda: entrada "siempre"
+    assert tt.probe(a) == (5, 1, EXACT, -1)
+    assert tt.probe(b) == (2, 2, EXACT, -1)
+
+    tt.store(c, 1, 3, EXACT)          # reemplaza la entrada "siempre"
+    assert tt.probe(a) is not None
+    assert tt.probe(b) is None
+    assert tt.probe(c) == (1, 3, EXACT, -1)
+
+    tt.store(d, 7, 4, EXACT)          # más profunda: `a` baja a "siempre"
+    assert tt.probe(d) == (7, 4, EXACT, -1)
+    assert tt.probe(a) == (5, 1, EXACT, -1)
+    assert tt.probe(c) is None
+    assert tt.stats()["collisions"] >= 2
+
+
+def test_clear_empties_the_table_and_stats():
+    tt = TranspositionTable(mb=1)
+    for key in range(100):
+        tt.store(key, 3, key, EXACT)
+    tt.clear()
+    assert tt.stats()["stores"] == 0
+    assert all(tt.probe(key) is None for key in range(100))
+
+
+def test_memory_stays_within_the_budget():
+    for mb in (0.5, 1, 4):
+        tt = TranspositionTable(mb=mb)
+        assert tt.memory_bytes <= mb * (1 << 20)
+        assert tt.memory_bytes * 2 > mb * (1 << 20)
+        assert tt.capacity == 2 * tt.buckets
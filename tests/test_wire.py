@@ -0,0 +1,108 @@
+"""
+test_wire.py
+============
+
+Pruebas del formato compacto del tablero (squares.wire): ida y vuelta
+desde Board y BitBoard en posiciones con casillas de los dos colores,
+rechazo de datos inválidos y tope de tamaño comprobado antes de crear
+las tablas del tamaño.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import random
+
+import pytest
+
+from squares import edges, wire, zobrist
+from squares.bitboard import BitBoard
+from squares.board import Board
+
+
+def played(size: int, seed: int) -> Board:
+    """Board tras una partida al azar a medias (con casillas de los dos colores)."""
+    rng = random.Random(seed)
+    board = Board(size)
+    color = -1
+    while board.free_edge_ids() and len(board.free_edge_ids()) > size:
+        board.move(*rng.choice(board.legal_moves()), color)
+        color = -2 if color == -1 else -1
+    return board
+
+
+def raw(size: int, body: bytes = b"") -> bytes:
+    """Bloque con la cabecera de `size` sin pasar por pack (no crea tablas)."""
+    return bytes((wire.VERSION, size)) + (body or bytes(wire.packed_size(size) - 2))
+
+
+# --------------------------------------------------------------------------
+# Ida y vuelta
+# --------------------------------------------------------------------------
+
+@pytest.mark.parametrize("size", [2, 3, 5, 8, 13])
+@pytest.mark.parametrize("seed", range(3))
+def test_board_round_trip(size, seed):
+    board = played(size, seed)
+    data = board.to_bytes()
+    assert len(data) == wire.packed_size(size)
+    assert Board.from_bytes(data).grid == board.grid
+    assert Board.from_base64(board.to_base64()).grid == board.grid
+    bb = BitBoard.from_bytes(data)
+    ref = BitBoard.from_board(board)
+    assert (bb.edges, bb.red, bb.yellow, bb.hash) == (ref.edges, ref.red, ref.yellow, ref.hash)
+    assert bb.to_bytes() == data
+
+
+def test_empty_board_is_small():
+    assert len(Board(4).to_base64()) == 16
+    assert len(wire.to_base64(raw(64))) < 2800
+
+
+# --------------------------------------------------------------------------
+# Datos inválidos
+# --------------------------------------------------------------------------
+
+def test_invalid_data_is_rejected():
+    good = bytearray(Board(3).to_bytes())     # 3 bytes de líneas y 2 por color
+    cases = {
+        "versión": bytes((9,)) + bytes(good[1:]),
+        "corto": bytes(good[:-1]),
+        "vacío": b"",
+        "tamaño cero": raw(0, b"\0"),
+    }
+    owners = bytearray(good)
+    owners[2 + 3] |= 1                      # roja
+    owners[2 + 3 + 2] |= 1                  # y amarilla
+    missing = bytearray(good)
+    missing[2 + 3] |= 1                     # roja sin sus cuatro lados
+    cases["dos dueños"] = bytes(owners)
+    cases["faltan lados"] = bytes(missing)
+    cells = bytearray(good)
+    cells[2 + 3 + 1] |= 0x02                # casilla 9 de un 3x3 (no existe)
+    cases["fuera del tablero"] = bytes(cells)
+    for name, data in cases.items():
+        with pytest.raises(ValueError):
+            Board.from_bytes(data)
+        with pytest.raises(ValueError):
+            BitBoard.from_bytes(data)
+    with pytest.raises(ValueError):
+        wire.from_base64("no es base64!")
+
+
+def test_oversized_header_is_rejected_before_building_tables():
+    for size in (100, 200):
+        assert size not in edges._LAYOUTS
+        for read in (Board.from_bytes, BitBoard.from_bytes):
+            with pytest.raises(ValueError, match="fuera de rango"):
+                read(raw(size), max_size=64)
+        with pytest.raises(ValueError, match="fuera de rango"):
+            Board.from_base64(wire.to_base64(raw(size)), max_size=64)
+        assert size not in edges._LAYOUTS and size not in zobrist._KEYS
+
+
+def test_max_size_accepts_boards_up_to_the_limit():
+    data = Board(6).to_bytes()
+    assert Board.from_bytes(data, max_size=6).size == 6
+    with pytest.raises(ValueError):
+        Board.from_bytes(data, max_size=5)
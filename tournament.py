@@ -0,0 +1,200 @@
+"""
+tournament.py
+=============
+
+Torneo sin interfaz entre agentes de Cuadrito (Dots and Boxes).
+
+Juega muchas partidas entre los agentes registrados (squares.registry),
+repartidas entre todos los núcleos con un pool de procesos, con semillas
+reproducibles, alternancia de colores y varios tamaños de tablero.
+Al final muestra (y opcionalmente guarda en JSON) un resumen con
+porcentaje de victorias, latencia media por jugada y uso del reloj.
+Con --record se guardan además todas las partidas (squares.records).
+
+Ejemplo:
+
+    python tournament.py --agents smart search --sizes 4 5 --games 200
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main import Environment
+from squares.records import GameRecorder
+from squares.registry import AGENTS, make_agent
+
+
+def play_game(task):
+    """
+    Juega una partida completa sin salida por consola.
+    Se ejecuta dentro de los procesos del pool (debe ser importable).
+
+    La semilla fija el generador global (RandomAgent, desempates) y se
+    pasa a los agentes que tienen el suyo propio (ver make_agent).
+
+    :param task: Tupla (rojo, amarillo, tamaño, tiempo_ms, semilla, asiento
+                 del rojo: 'a' o 'b')
+    :return: Registro de la partida (ver Environment.result) con los
+             nombres de registro de los agentes, la semilla y el asiento
+             del rojo
+    """
+    red_name, yellow_name, size, time_limit, seed, red_seat = task
+    random.seed(seed)
+    env = Environment(size=size, time_limit=time_limit, verbose=False)
+    record = env.play(make_agent(red_name, color="R", seed=2 * seed),
+                      make_agent(yellow_name, color="Y", seed=2 * seed + 1))
+    record["red"] = red_name
+    record["yellow"] = yellow_name
+    record["seed"] = seed
+    record["red_seat"] = red_seat
+    return record
+
+
+def schedule(agents, sizes, games, time_limit, seed):
+    """
+    Genera las partidas de un todos-contra-todos con colores alternados.
+
+    :param agents: Nombres de los agentes
+    :param sizes: Tamaños de tablero
+    :param games: Partidas por pareja y tamaño (la mitad con cada color)
+    :param time_limit: Tiempo por jugador (ms)
+    :param seed: Semilla base
+    :return: Lista de tareas para play_game
+    """
+    tasks = []
+    n = 0
+    for size in sizes:
+        for a, b in itertools.combinations(agents, 2):
+            for g in range(games):
+                red, yellow, seat = (a, b, "a") if g % 2 == 0 else (b, a, "b")
+                tasks.append((red, yellow, size, time_limit, seed + n, seat))
+                n += 1
+    return tasks
+
+
+def summarize(results):
+    """
+    Agrega los resultados por (tamaño, agente A, agente B).
+
+    Las estadísticas se llevan por asiento ('a' / 'b'), no por nombre, para
+    que un agente contra sí mismo (--agents random random) cuente cada
+    lado por separado.
+
+    :param results: Lista de diccionarios de play_game
+    :return: Lista de filas del resumen (latencias y reloj por asiento)
+    """
+    table = {}
+    for r in results:
+        seat_color = {"a": "R", "b": "Y"} if r["red_seat"] == "a" else {"a": "Y", "b": "R"}
+        a = r["red"] if r["red_seat"] == "a" else r["yellow"]
+        b = r["yellow"] if r["red_seat"] == "a" else r["red"]
+        row = table.setdefault((r["size"], a, b), {
+            "size": r["size"], "a": a, "b": b, "games": 0,
+            "wins_a": 0, "wins_b": 0, "draws": 0,
+            "timeouts": 0, "invalid": 0,
+            "_lat": {"a": [], "b": []}, "_clock": {"a": [], "b": []},
+        })
+        row["games"] += 1
+        if r["winner"] == " ":
+            row["draws"] += 1
+        elif r["winner"] == seat_color["a"]:
+            row["wins_a"] += 1
+        else:
+            row["wins_b"] += 1
+        if r["reason"] == "timeout":
+            row["timeouts"] += 1
+        elif r["reason"] == "invalid":
+            row["invalid"] += 1
+        # Las jugadas pares son del rojo y las impares del amarillo
+        times = {"R": r["times"][0::2], "Y": r["times"][1::2]}
+        for seat, color in seat_color.items():
+            row["_lat"][seat].extend(times[color])
+            row["_clock"][seat].append(sum(times[color]))
+
+    rows = []
+    for key in sorted(table):
+        row = table[key]
+        lat = row.pop("_lat")
+        clock = row.pop("_clock")
+        games = row["games"]
+        row["win_rate_a"] = (row["wins_a"] + 0.5 * row["draws"]) / games
+        row["avg_move_ms"] = {s: (sum(v) / len(v) if v else 0.0) for s, v in lat.items()}
+        row["max_move_ms"] = {s: (max(v) if v else 0.0) for s, v in lat.items()}
+        row["avg_clock_ms"] = {s: sum(v) / len(v) for s, v in clock.items()}
+        rows.append(row)
+    return rows
+
+
+def run(agents, sizes, games, time_limit=20000, seed=0, workers=None):
+    """
+    Ejecuta el torneo completo.
+
+    :param workers: Procesos del pool (None = todos los núcleos, 1 = sin pool)
+    :return: Tupla (resultados por partida, resumen)
+    """
+    tasks = schedule(agents, sizes, games, time_limit, seed)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [play_game(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(play_game, tasks, chunksize=chunk))
+    return results, summarize(results)
+
+
+def print_summary(rows, elapsed):
+    """Muestra el resumen del torneo en consola."""
+    print(f"\n🏆 Torneo ({elapsed:.1f} s)")
+    print("-" * 78)
+    for row in rows:
+        a, b = row["a"], row["b"]
+        print(f"{row['size']}x{row['size']}  {a} vs {b}: {row['games']} partidas  "
+              f"{row['wins_a']}-{row['draws']}-{row['wins_b']}  "
+              f"({100 * row['win_rate_a']:.1f}% {a})")
+        for seat, n in (("a", a), ("b", b)):
+            print(f"    {seat} {n:>10}: {row['avg_move_ms'][seat]:8.2f} ms/jugada  "
+                  f"máx {row['max_move_ms'][seat]:8.2f} ms  reloj {row['avg_clock_ms'][seat]:9.1f} ms")
+        if row["timeouts"] or row["invalid"]:
+            print(f"      ⏰ {row['timeouts']} por tiempo  ❌ {row['invalid']} inválidas")
+    print("-" * 78)
+
+
+# --------------------------------------------------------------------------
+# Punto de entrada principal
+# --------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneo entre agentes de Cuadrito")
+    parser.add_argument("--agents", nargs="+", default=["smart", "random"],
+                        help=f"Agentes registrados: {', '.join(sorted(AGENTS))}")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[4])
+    parser.add_argument("--games", type=int, default=100, help="Partidas por pareja y tamaño")
+    parser.add_argument("--time", type=int, default=20000, help="Tiempo por jugador (ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", default=None, help="Archivo donde guardar el resumen")
+    parser.add_argument("--record", default=None,
+                        help="Archivo .jsonl o .bin donde guardar todas las partidas")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, rows = run(args.agents, args.sizes, args.games, args.time, args.seed, args.workers)
+    print_summary(rows, time.perf_counter() - start)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": rows}, f, indent=1)
+
+    if args.record:
+        with GameRecorder(args.record) as recorder:
+            for record in results:
+                recorder.write(record)
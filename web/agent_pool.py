@@ -0,0 +1,151 @@
+"""
+agent_pool.py
+=============
+
+Pool de agentes Python "calientes" para el servidor web.
+
+Crear un agente puede ser costoso (p. ej. SearchAgent reserva su tabla
+de transposición), así que las instancias se reutilizan entre peticiones
+en lugar de construirse en cada llamada a /api/move.
+
+El cálculo de la jugada se ejecuta en un pool de hilos, fuera del bucle
+de eventos de FastAPI, para que una búsqueda lenta no bloquee al resto
+de peticiones.
+
+Tras cada jugada calculada en el servidor (/api/move, sesiones y partidas
+entre agentes) las métricas del agente se acumulan por nombre en
+AgentPool.metrics, que /api/metrics publica en formato Prometheus.
+
+analyze() es la versión para posiciones sueltas (/api/analyze/batch): la
+jugada con su valoración, con topes de tiempo y profundidad por posición.
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from squares.metrics import MetricsRegistry
+from squares.registry import make_agent
+
+
+class AgentPool:
+    """
+    Pool de instancias de agente por nombre, con un ejecutor compartido
+    para las búsquedas.
+    """
+
+    def __init__(self, max_idle: int = 4, workers: int = None):
+        """
+        :param max_idle: Instancias ociosas que se conservan por agente
+        :param workers: Hilos del ejecutor (por defecto, núcleos disponibles)
+        """
+        self.max_idle = max_idle
+        self.workers = workers or os.cpu_count() or 1
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self.metrics = MetricsRegistry()
+
+    @property
+    def executor(self):
+        """Ejecutor de las búsquedas (se crea al primer uso)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="agent")
+        return self._executor
+
+    # ----------------------------------------------------------------------
+
+    def acquire(self, name: str, color: str, board, time: int):
+        """
+        Toma una instancia ociosa del agente (o crea una nueva) y la deja
+        preparada para jugar con ese color y tamaño de tablero.
+
+        :param name: Nombre registrado del agente
+        :param color: 'R' o 'Y'
+        :param board: Tablero actual (Board)
+        :param time: Tiempo restante (ms)
+        :return: Instancia de Agent
+        """
+        with self._lock:
+            idle = self._idle.get(name)
+            agent = idle.pop() if idle else None
+        if agent is None:
+            agent = make_agent(name, color=color)
+        if agent.color != color or agent.size != board.size:
+            agent.init(color, board.grid, time)
+        return agent
+
+    def release(self, name: str, agent):
+        """Devuelve una instancia al pool."""
+        with self._lock:
+            idle = self._idle.setdefault(name, [])
+            if len(idle) < self.max_idle:
+                idle.append(agent)
+
+    def record(self, name: str, agent, seconds: float):
+        """
+        Acumula (y pone a cero) las métricas de un agente tras una jugada.
+
+        :param name: Nombre registrado del agente
+        :param agent: Instancia que calculó la jugada
+        :param seconds: Tiempo total de la jugada en el servidor
+        """
+        agent.metrics.observe("compute_seconds", seconds)
+        self.metrics.collect(name, agent.metrics)
+
+    def compute(self, name: str, board, color: str, time: int):
+        """
+        Calcula la jugada de un agente del pool (llamada bloqueante).
+
+        :return: Lista [fila, columna, lado]
+        """
+        agent = self.acquire(name, color, board, time)
+        try:
+            start = perf_counter()
+            move = [int(v) for v in agent.compute(board, time)]
+            self.record(name, agent, perf_counter() - start)
+            return move
+        finally:
+            self.release(name, agent)
+
+    def analyze(self, name: str, board, color: str, move_time: int, max_depth: int = None):
+        """
+        Analiza una posición suelta con un agente del pool (llamada bloqueante).
+
+        :param name: Nombre registrado del agente
+        :param board: Tablero a analizar (Board)
+        :param color: Color que mueve ('R' o 'Y')
+        :param move_time: Tiempo máximo para la posición (ms)
+        :param max_depth: Profundidad máxima (None = la del agente)
+        :return: Diccionario con move, score y depth (ver Agent.analyze)
+        """
+        agent = self.acquire(name, color, board, move_time)
+        try:
+            start = perf_counter()
+            result = agent.analyze(board, move_time, max_depth)
+            self.record(name, agent, perf_counter() - start)
+            return result
+        finally:
+            self.release(name, agent)
+
+    async def compute_async(self, name: str, board, color: str, time: int):
+        """
+        Igual que compute(), pero ejecutado en el pool de hilos
+        sin bloquear el bucle de eventos.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.compute, name, board, color, time)
+
+    def shutdown(self):
+        """Detiene el ejecutor y descarta las instancias ociosas."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        with self._lock:
+            self._idle.clear()
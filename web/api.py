@@ -6,20 +6,51 @@ Servidor web principal del proyecto Cuadrito (Dots and Boxes)
 utilizando FastAPI.
 
 Sirve los archivos HTML, JS y CSS del directorio web/static/
-y deja preparado el backend para futuras integraciones de IA
-por medio de endpoints REST.
+y expone los agentes Python (squares/) por medio de endpoints REST.
 
 Autor: Equipo Arazaca – UNAL
 Fecha: 2025
 """
 
-from fastapi import FastAPI
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from squares.board import Board
+from squares.edges import edge_id
+from squares.registry import AGENTS
 from web import STATIC_DIR, get_static_path
+from web.agent_pool import AgentPool
+from web.matches import MatchRunner
+from web.sessions import SessionStore
+
+# Agentes Python reutilizados entre peticiones
+agent_pool = AgentPool()
+
+# Partidas vivas en el servidor (tablero + agente por partida)
+sessions = SessionStore()
+
+# Partidas agente contra agente jugadas por el servidor
+matches = MatchRunner(agent_pool)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Libera los recursos compartidos al apagar el servidor."""
+    yield
+    await matches.shutdown()
+    agent_pool.shutdown()
+
 
 # Crear la aplicación FastAPI
 app = FastAPI(
+    lifespan=lifespan,
     title="Cuadrito UNAL - API (Equipo G1C)",
     description="Backend del juego de agentes inteligentes Cuadrito.",
     version="1.0.0",
@@ -41,8 +72,16 @@ async def root():
     return FileResponse(get_static_path("index.html"))
 
 
+@app.get("/matches", response_class=FileResponse, include_in_schema=False)
+async def matches_page():
+    """
+    Visor de las partidas jugadas por el servidor (matches.html)
+    """
+    return FileResponse(get_static_path("matches.html"))
+
+
 # ---------------------------------------------------------------------
-# ENDPOINTS DE EJEMPLO (para futura integración con IA en Python)
+# ENDPOINTS DE LA API
 # ---------------------------------------------------------------------
 
 @app.get("/api/health")
@@ -53,23 +92,502 @@ async def health_check():
     return {"status": "✅ online", "service": "Cuadrito UNAL API G1C"}
 
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Métricas del servidor en formato de texto de Prometheus: contadores y
+    tiempos por fase de cada agente (acumulados desde el arranque) y el
+    estado actual de sesiones y partidas.
+    """
+    gauges = {
+        "sessions": len(sessions),
+        "sessions_bytes": sessions.total_bytes,
+        "matches": len(matches),
+        "matches_running": matches.running,
+        "agent_pool_workers": agent_pool.workers,
+    }
+    return PlainTextResponse(agent_pool.metrics.render(gauges),
+                             media_type="text/plain; version=0.0.4")
+
+
+class MoveRequest(BaseModel):
+    """
+    Petición de jugada: tablero (matriz de Board.grid / squares.js en
+    `board`, o formato compacto de squares.wire en base64 en `packed`),
+    color del agente, tiempo restante y nombre del agente Python.
+    """
+
+    board: list[list[int]] | None = None
+    packed: str | None = None
+    color: str = "R"
+    time: int = Field(20000, gt=0)
+    agent: str = "smart"
+
+
+# Tableros que aceptan las jugadas, los análisis, las sesiones y las partidas
+MIN_BOARD_SIZE = 2
+MAX_BOARD_SIZE = 64
+
+
+def size_error(size: int) -> str:
+    """Mensaje de error si el tamaño está fuera de rango ('' si es válido)."""
+    if MIN_BOARD_SIZE <= size <= MAX_BOARD_SIZE:
+        return ""
+    return f"Tamaño de tablero fuera de rango ({MIN_BOARD_SIZE}..{MAX_BOARD_SIZE})"
+
+
+def check_size(size: int):
+    """Valida el tamaño del tablero, o responde 400."""
+    error = size_error(size)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+
+def read_board(grid=None, packed: str = None) -> Board:
+    """
+    Construye el Board recibido (matriz o formato compacto en base64).
+
+    El tamaño se valida antes de crear el tablero: Board calcula y guarda
+    en caché las tablas de cada tamaño (squares.edges.layout), y un tamaño
+    fuera de rango no debe llegar a generarlas. La matriz se mide aquí; el
+    formato compacto lo rechaza el propio decodificador (max_size).
+
+    :raises ValueError: Si falta el tablero, llegan los dos, no es válido
+                        o su tamaño está fuera de rango
+    """
+    if (grid is None) == (packed is None):
+        raise ValueError("Envía el tablero en 'board' o en 'packed' (solo uno)")
+    if packed is not None:
+        board = Board.from_base64(packed, max_size=MAX_BOARD_SIZE)
+        error = size_error(board.size)
+    else:
+        error = size_error(len(grid))
+        board = None if error else Board.from_grid(grid)
+    if error:
+        raise ValueError(error)
+    return board
+
+
+def parse_board(grid=None, packed: str = None) -> Board:
+    """
+    Convierte el tablero recibido (ver read_board) en un Board, o responde
+    400 si falta, llegan los dos, no es válido o su tamaño no se acepta.
+    """
+    try:
+        return read_board(grid, packed)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Tablero inválido: {exc}")
+
+
+def check_agent(name: str, color: str):
+    """Valida el nombre del agente y el color, o responde 400."""
+    if name not in AGENTS:
+        raise HTTPException(status_code=400,
+                            detail=f"Agente desconocido: {name} (disponibles: {sorted(AGENTS)})")
+    if color not in ("R", "Y"):
+        raise HTTPException(status_code=400, detail="El color debe ser 'R' o 'Y'")
+
+
+@app.get("/api/agents")
+async def list_agents():
+    """
+    Lista los agentes Python disponibles para /api/move.
+    """
+    return {"agents": sorted(AGENTS)}
+
+
 @app.post("/api/move")
-async def compute_move(data: dict):
+async def compute_move(data: MoveRequest):
     """
-    Ejemplo de endpoint para calcular un movimiento del agente Python.
-    (En futuras versiones, se conectará con SmartAgent en Python)
+    Calcula la jugada del agente Python indicado para el tablero recibido.
 
-    Espera un JSON con el estado actual del tablero.
+    La búsqueda corre en el pool de hilos del AgentPool, de modo que el
+    servidor sigue atendiendo otras peticiones mientras tanto.
     """
-    example_move = [0, 0, 1]
+    check_agent(data.agent, data.color)
+    board = parse_board(data.board, data.packed)
+    if not board.free_edge_ids():
+        raise HTTPException(status_code=400, detail="No quedan jugadas en el tablero")
+
+    start = time.perf_counter()
+    move = await agent_pool.compute_async(data.agent, board, data.color, data.time)
+    elapsed = (time.perf_counter() - start) * 1000
     return JSONResponse(
         {
-            "message": "Movimiento calculado por SmartAgent (ejemplo)",
-            "move": example_move,
+            "message": f"Movimiento calculado por {data.agent}",
+            "agent": data.agent,
+            "move": move,
+            "edge": edge_id(board.size, *move),
+            "elapsed_ms": round(elapsed, 3),
         }
     )
 
 
+# ---------------------------------------------------------------------
+# ANÁLISIS POR LOTES
+# ---------------------------------------------------------------------
+
+# Topes del servidor para /api/analyze/batch
+MAX_BATCH_POSITIONS = 100000
+MAX_ANALYZE_TIME = 10000   # ms por posición
+MAX_ANALYZE_DEPTH = 64
+MAX_LINE_BYTES = 1 << 20   # una posición 64x64 en matriz ocupa ~14 KB
+
+
+class AnalyzePosition(BaseModel):
+    """Posición a analizar: tablero (`board` o `packed`) y color que mueve."""
+
+    board: list[list[int]] | None = None
+    packed: str | None = None
+    color: str = "R"
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse que no escucha por su cuenta la desconexión del
+    cliente: su generador sigue leyendo el cuerpo de la petición (receive)
+    mientras responde, y la desconexión le llega por ahí.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def ndjson_lines(request: Request):
+    """
+    Líneas no vacías del cuerpo NDJSON de la petición, leídas por trozos.
+
+    :raises ValueError: Si una línea supera MAX_LINE_BYTES
+    """
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if len(line) > MAX_LINE_BYTES:
+                raise ValueError(f"Línea de más de {MAX_LINE_BYTES} bytes")
+            if line.strip():
+                yield line
+        # Línea aún sin terminar: se corta sin esperar al resto
+        if len(pending) > MAX_LINE_BYTES:
+            raise ValueError(f"Línea de más de {MAX_LINE_BYTES} bytes")
+    if pending.strip():
+        yield pending
+
+
+def analyze_position(index: int, line: bytes, agent: str, move_time: int, depth) -> dict:
+    """
+    Lee y analiza una posición del lote (llamada bloqueante, para el pool
+    de hilos). Los errores de la posición se devuelven en la línea en lugar
+    de cortar el lote.
+    """
+    start = time.perf_counter()
+    try:
+        position = AnalyzePosition.model_validate_json(line)
+        if position.color not in ("R", "Y"):
+            raise ValueError("El color debe ser 'R' o 'Y'")
+        board = read_board(position.board, position.packed)
+        if not board.free_edge_ids():
+            raise ValueError("No quedan jugadas en el tablero")
+        result = agent_pool.analyze(agent, board, position.color, move_time, depth)
+    except (ValueError, TypeError) as exc:
+        return {"index": index, "error": str(exc)}
+    move = result["move"]
+    return {
+        "index": index,
+        "move": move,
+        "edge": edge_id(board.size, *move),
+        "score": result["score"],
+        "depth": result["depth"],
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+async def analyze_stream(request: Request, agent: str, move_time: int, depth):
+    """
+    Lee las posiciones del cuerpo a medida que se necesitan, las reparte en
+    el pool de hilos del AgentPool (como mucho una por hilo a la vez) y
+    produce una línea NDJSON por posición en el orden en que terminan.
+    En memoria solo hay las posiciones en curso, no el lote.
+    """
+    loop = asyncio.get_running_loop()
+    lines = ndjson_lines(request)
+    pending = set()
+    index = 0
+    reading = True
+    try:
+        while True:
+            while reading and len(pending) < agent_pool.workers:
+                try:
+                    line = await anext(lines)
+                except StopAsyncIteration:
+                    reading = False
+                    break
+                except ValueError as exc:
+                    yield json.dumps({"index": index, "error": str(exc)}) + "\n"
+                    reading = False
+                    break
+                if index >= MAX_BATCH_POSITIONS:
+                    yield json.dumps({"index": index, "error":
+                                      f"Lote de más de {MAX_BATCH_POSITIONS} posiciones"}) + "\n"
+                    reading = False
+                    break
+                pending.add(loop.run_in_executor(agent_pool.executor, analyze_position,
+                                                 index, line, agent, move_time, depth))
+                index += 1
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield json.dumps(future.result()) + "\n"
+    finally:
+        for future in pending:
+            future.cancel()
+        await lines.aclose()
+
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(request: Request, agent: str = "search", time: int = 1000,
+                        depth: int | None = None):
+    """
+    Analiza muchas posiciones con un agente Python. El cuerpo es NDJSON
+    (una posición por línea) y la respuesta también: una línea por
+    posición, con su `index` en el lote, a medida que terminan. Ni el lote
+    ni los resultados se acumulan en memoria.
+
+    Los topes van en la URL: agente, tiempo máximo (ms) y profundidad
+    máxima por posición.
+    """
+    check_agent(agent, "R")
+    if not 1 <= time <= MAX_ANALYZE_TIME:
+        raise HTTPException(status_code=400,
+                            detail=f"Tiempo por posición fuera de rango (1..{MAX_ANALYZE_TIME} ms)")
+    if depth is not None and not 1 <= depth <= MAX_ANALYZE_DEPTH:
+        raise HTTPException(status_code=400,
+                            detail=f"Profundidad fuera de rango (1..{MAX_ANALYZE_DEPTH})")
+    return _DuplexStreamingResponse(analyze_stream(request, agent, time, depth),
+                                    media_type="application/x-ndjson")
+
+
+# ---------------------------------------------------------------------
+# SESIONES DE PARTIDA
+# ---------------------------------------------------------------------
+
+class NewGameRequest(BaseModel):
+    """Creación de una partida: tamaño, agente Python y su color."""
+
+    size: int = 4
+    agent: str = "smart"
+    agent_color: str = "Y"
+    time: int = Field(20000, gt=0)
+    ponder: bool = False
+
+
+class GameMoveRequest(BaseModel):
+    """
+    Jugada del jugador en turno: [fila, columna, lado] en `move` o el
+    índice canónico de la línea (squares.edges) en `edge`.
+    """
+
+    move: list[int] | None = None
+    edge: int | None = None
+
+
+class AgentMoveRequest(BaseModel):
+    """Tiempo restante del agente (ms) al pedirle su jugada."""
+
+    time: int = Field(20000, gt=0)
+
+
+def get_session(game_id: str):
+    """Devuelve la sesión o responde 404."""
+    session = sessions.get(game_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Partida no encontrada o expirada")
+    return session
+
+
+@app.post("/api/games")
+async def create_game(data: NewGameRequest, packed: bool = False):
+    """
+    Crea una partida en el servidor con un Board vivo y su agente Python.
+    """
+    check_agent(data.agent, data.agent_color)
+    check_size(data.size)
+    # Crear el agente puede ser costoso (tabla de transposición, solver,
+    # procesos): se hace en el pool de hilos, como las jugadas
+    loop = asyncio.get_running_loop()
+    session = await loop.run_in_executor(agent_pool.executor, sessions.create, data.size,
+                                         data.agent, data.agent_color, data.time, data.ponder)
+    return session.state(packed)
+
+
+@app.get("/api/games/{game_id}")
+async def game_state(game_id: str, packed: bool = False):
+    """
+    Estado actual de una partida.
+    """
+    return get_session(game_id).state(packed)
+
+
+@app.post("/api/games/{game_id}/moves")
+async def post_game_move(game_id: str, data: GameMoveRequest, packed: bool = False):
+    """
+    Aplica la jugada del jugador en turno (el rival del agente).
+    """
+    session = get_session(game_id)
+    if (data.move is None) == (data.edge is None):
+        raise HTTPException(status_code=400, detail="Envía la jugada en 'move' o en 'edge' (solo uno)")
+    if data.edge is not None:
+        if not 0 <= data.edge < session.board.layout.n_edges:
+            raise HTTPException(status_code=400, detail=f"Línea fuera del tablero: {data.edge}")
+        move = list(session.board.layout.moves[data.edge])
+    elif len(data.move) != 3:
+        raise HTTPException(status_code=400, detail="La jugada debe ser [fila, columna, lado]")
+    else:
+        move = data.move
+    async with session.lock:
+        if session.turn == session.agent_color:
+            raise HTTPException(status_code=409, detail="Es el turno del agente")
+        if not session.apply(move, session.turn):
+            raise HTTPException(status_code=400, detail=f"Movimiento inválido: {move}")
+        return session.state(packed)
+
+
+@app.post("/api/games/{game_id}/agent-move")
+async def agent_game_move(game_id: str, data: AgentMoveRequest, packed: bool = False):
+    """
+    Pide al agente de la partida su jugada sobre el tablero vivo y la aplica.
+    El agente conserva entre turnos lo que haya calculado.
+    """
+    session = get_session(game_id)
+    async with session.lock:
+        if session.finished:
+            raise HTTPException(status_code=409, detail="La partida ya terminó")
+        if session.turn != session.agent_color:
+            raise HTTPException(status_code=409, detail="No es el turno del agente")
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        move = await loop.run_in_executor(
+            agent_pool.executor, session.agent_compute, data.time
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        agent_pool.record(session.agent_name, session.agent, elapsed / 1000)
+        move = [int(v) for v in move]
+        if not session.apply(move, session.agent_color):
+            raise HTTPException(status_code=500, detail=f"El agente propuso un movimiento inválido: {move}")
+        state = session.state(packed)
+        state["move"] = move
+        state["edge"] = edge_id(session.board.size, *move)
+        state["elapsed_ms"] = round(elapsed, 3)
+        return state
+
+
+@app.delete("/api/games/{game_id}")
+async def close_game(game_id: str):
+    """
+    Cierra una partida y libera su memoria.
+    """
+    if not sessions.close(game_id):
+        raise HTTPException(status_code=404, detail="Partida no encontrada o expirada")
+    return {"game_id": game_id, "closed": True}
+
+
+# ---------------------------------------------------------------------
+# PARTIDAS ENTRE AGENTES EN EL SERVIDOR
+# ---------------------------------------------------------------------
+
+class NewMatchRequest(BaseModel):
+    """
+    Partidas agente contra agente: tamaño, agentes, tiempo por jugador,
+    pausa entre jugadas (ms) y número de partidas a lanzar.
+    """
+
+    size: int = 4
+    red: str = "smart"
+    yellow: str = "random"
+    time: int = Field(20000, gt=0)
+    delay: int = Field(0, ge=0)
+    count: int = 1
+
+
+def get_match(match_id: str):
+    """Devuelve la partida o responde 404."""
+    match = matches.get(match_id)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    return match
+
+
+@app.post("/api/matches")
+async def create_matches(data: NewMatchRequest):
+    """
+    Lanza una o varias partidas entre agentes Python. Se juegan en el
+    servidor de forma concurrente; sus jugadas se siguen por WebSocket
+    en /ws/matches/{match_id}.
+    """
+    check_agent(data.red, "R")
+    check_agent(data.yellow, "Y")
+    check_size(data.size)
+    if not 1 <= data.count <= 64:
+        raise HTTPException(status_code=400, detail="Número de partidas fuera de rango (1..64)")
+    started = [matches.start(data.size, data.red, data.yellow, data.time, data.delay)
+               for _ in range(data.count)]
+    return {"matches": [m.summary() for m in started]}
+
+
+@app.get("/api/matches")
+async def list_matches():
+    """
+    Lista las partidas del servidor (en juego y terminadas recientes).
+    """
+    return {"running": matches.running, "matches": matches.list()}
+
+
+@app.get("/api/matches/{match_id}")
+async def match_state(match_id: str):
+    """
+    Estado actual de una partida del servidor.
+    """
+    return get_match(match_id).state()
+
+
+@app.delete("/api/matches/{match_id}")
+async def cancel_match(match_id: str):
+    """
+    Cancela una partida del servidor.
+    """
+    if not matches.cancel(match_id):
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    return {"match_id": match_id, "cancelled": True}
+
+
+@app.websocket("/ws/matches/{match_id}")
+async def watch_match(websocket: WebSocket, match_id: str):
+    """
+    Transmite en vivo una partida: primero su estado completo y luego
+    cada jugada (con relojes y capturas) hasta el evento final.
+    """
+    await websocket.accept()
+    match = matches.get(match_id)
+    if match is None:
+        await websocket.send_json({"type": "error", "detail": "Partida no encontrada"})
+        await websocket.close(code=4404)
+        return
+    queue = matches.subscribe(match)
+    try:
+        while True:
+            event = await queue.get()
+            await websocket.send_json(event)
+            if event["type"] == "end":
+                break
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        matches.unsubscribe(match, queue)
+
+
 # ---------------------------------------------------------------------
 # PUNTO DE ENTRADA
 # ---------------------------------------------------------------------
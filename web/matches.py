@@ -0,0 +1,318 @@
+"""
+matches.py
+==========
+
+Partidas entre agentes Python jugadas por el propio servidor.
+
+MatchRunner aloja muchas partidas a la vez sobre asyncio: cada partida es
+una tarea que pide la jugada a su agente en el pool de hilos (AgentPool),
+descuenta el reloj, aplica la jugada al Board y publica el evento a todos
+los navegadores suscritos (WebSocket). Así se pueden jugar decenas de
+partidas concurrentes en una sola máquina y verlas en vivo.
+
+Los agentes de cada partida se crean en el pool de hilos al empezar a
+jugarla (crearlos puede reservar tablas de transposición o lanzar
+procesos) y se sueltan al terminar: las partidas terminadas que se
+conservan para consulta no retienen su memoria.
+
+Reglas de fin de partida (igual que main.Environment / tournament.py):
+    - 'timeout': el jugador agotó su reloj
+    - 'invalid': el agente propuso una jugada inválida
+    - 'score':   tablero completo; gana quien tenga más casillas (o empate)
+    - 'error':   el agente falló (excepción al crearlo o al calcular su
+                 jugada); gana el rival, o nadie si falló antes de empezar
+
+Eventos publicados (diccionarios JSON):
+    - {"type": "state", ...}  estado completo (al suscribirse)
+    - {"type": "move", ...}   jugada, tiempo usado, relojes, capturas, marcador y tablero
+    - {"type": "end", ...}    ganador, motivo y marcador final
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+from squares.board import Board
+from squares.registry import make_agent
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_compute(agent, board, remaining, last_move=None):
+    """
+    Ejecuta agent.compute en el hilo de trabajo y mide solo ese cálculo
+    (la espera por un hilo libre del pool no descuenta reloj). El aviso de
+    la jugada del rival entra en el tiempo medido, como en main.Environment.
+
+    :return: Tupla (jugada, milisegundos empleados)
+    """
+    start = time.perf_counter()
+    if last_move is not None:
+        agent.notify_opponent_move(board, last_move)
+    move = agent.compute(board, remaining)
+    return move, (time.perf_counter() - start) * 1000
+
+
+def _make_agents(match) -> dict:
+    """
+    Crea e inicializa los agentes de la partida (en el hilo de trabajo).
+
+    :return: Diccionario color -> Agent
+    """
+    agents = {}
+    for color, name in match.names.items():
+        agent = make_agent(name, color=color)
+        agent.init(color, match.board.grid, match.time_limit)
+        agents[color] = agent
+    return agents
+
+
+class Match:
+    """
+    Estado de una partida agente contra agente alojada en el servidor.
+    """
+
+    def __init__(self, size: int, red: str, yellow: str, time_limit: int, delay_ms: int = 0):
+        """
+        :param size: Tamaño del tablero
+        :param red: Nombre registrado del agente rojo
+        :param yellow: Nombre registrado del agente amarillo
+        :param time_limit: Tiempo por jugador (ms)
+        :param delay_ms: Pausa entre jugadas (para seguirlas en el navegador)
+        """
+        self.id = uuid.uuid4().hex
+        self.size = size
+        self.names = {"R": red, "Y": yellow}
+        self.agents = None          # se crean al empezar a jugar (ver _make_agents)
+        self.time_limit = time_limit
+        self.delay_ms = delay_ms
+        self.board = Board(size)
+        self.remaining = {"R": float(time_limit), "Y": float(time_limit)}
+        self.player = "R"
+        self.moves = []
+        self.status = "pending"     # 'pending', 'running', 'finished', 'cancelled'
+        self.winner = " "
+        self.reason = None
+        self.created = time.time()
+        self.task = None
+        self.subscribers = set()
+
+    @property
+    def score(self):
+        return {"R": self.board.red_boxes, "Y": self.board.yellow_boxes}
+
+    def summary(self) -> dict:
+        """Resumen breve (para listados)."""
+        return {
+            "match_id": self.id,
+            "size": self.size,
+            "red": self.names["R"],
+            "yellow": self.names["Y"],
+            "status": self.status,
+            "moves": len(self.moves),
+            "score": self.score,
+            "winner": self.winner,
+            "reason": self.reason,
+        }
+
+    def state(self) -> dict:
+        """Estado completo serializable."""
+        state = self.summary()
+        state.update({
+            "type": "state",
+            "board": self.board.grid,
+            "turn": self.player,
+            "clock": {c: round(v, 1) for c, v in self.remaining.items()},
+            "time_limit": self.time_limit,
+        })
+        return state
+
+
+class MatchRunner:
+    """
+    Conjunto de partidas del servidor con su bucle de juego asíncrono.
+    """
+
+    def __init__(self, agent_pool, max_running: int = 64, max_finished: int = 256):
+        """
+        :param agent_pool: AgentPool cuyo ejecutor calcula las jugadas
+        :param max_running: Partidas que pueden estar jugándose a la vez
+        :param max_finished: Partidas terminadas que se conservan para consulta
+        """
+        self.agent_pool = agent_pool
+        self.max_running = max_running
+        self.max_finished = max_finished
+        self._matches = OrderedDict()
+        self._slots = None
+
+    def __len__(self):
+        return len(self._matches)
+
+    def get(self, match_id: str):
+        """Devuelve la partida o None si no existe."""
+        return self._matches.get(match_id)
+
+    def list(self):
+        """Resúmenes de todas las partidas conservadas."""
+        return [m.summary() for m in self._matches.values()]
+
+    @property
+    def running(self) -> int:
+        """Partidas en juego."""
+        return sum(1 for m in self._matches.values() if m.status == "running")
+
+    # ----------------------------------------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------------------------------------
+
+    def start(self, size: int, red: str, yellow: str, time_limit: int, delay_ms: int = 0) -> Match:
+        """
+        Crea una partida y lanza su tarea en el bucle de eventos actual.
+
+        :return: Match (su tarea ya está programada)
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+        match = Match(size, red, yellow, time_limit, delay_ms)
+        self._matches[match.id] = match
+        self._trim()
+        match.task = asyncio.create_task(self._run(match))
+        return match
+
+    def cancel(self, match_id: str) -> bool:
+        """Cancela una partida (si sigue en juego) y la elimina."""
+        match = self._matches.pop(match_id, None)
+        if match is None:
+            return False
+        if match.task is not None and not match.task.done():
+            match.task.cancel()
+        return True
+
+    async def shutdown(self):
+        """Cancela todas las partidas en juego."""
+        tasks = [m.task for m in self._matches.values() if m.task is not None and not m.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._matches.clear()
+
+    def _trim(self):
+        """Descarta las partidas terminadas más antiguas por encima del límite."""
+        finished = [k for k, m in self._matches.items() if m.status in ("finished", "cancelled")]
+        for match_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._matches[match_id]
+
+    # ----------------------------------------------------------------------
+    # Suscripciones
+    # ----------------------------------------------------------------------
+
+    def subscribe(self, match: Match) -> asyncio.Queue:
+        """
+        Suscribe un consumidor a los eventos de la partida. El primer
+        evento de la cola es el estado completo actual.
+        """
+        queue = asyncio.Queue()
+        queue.put_nowait(match.state())
+        if match.status in ("finished", "cancelled"):
+            queue.put_nowait(self._end_event(match))
+        else:
+            match.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, match: Match, queue: asyncio.Queue):
+        """Elimina un consumidor."""
+        match.subscribers.discard(queue)
+
+    def _publish(self, match: Match, event: dict):
+        for queue in match.subscribers:
+            queue.put_nowait(event)
+
+    def _end_event(self, match: Match) -> dict:
+        return {"type": "end", "match_id": match.id, "winner": match.winner,
+                "reason": match.reason, "score": match.score, "moves": len(match.moves)}
+
+    # ----------------------------------------------------------------------
+    # Bucle de juego
+    # ----------------------------------------------------------------------
+
+    async def _run(self, match: Match):
+        """Juega la partida completa (una tarea de asyncio por partida)."""
+        loop = asyncio.get_running_loop()
+        executor = self.agent_pool.executor
+        try:
+            async with self._slots:
+                match.agents = await loop.run_in_executor(executor, _make_agents, match)
+                match.status = "running"
+                self._publish(match, match.state())
+                while match.status == "running":
+                    await self._turn(match, loop, executor)
+                    if match.delay_ms and match.status == "running":
+                        await asyncio.sleep(match.delay_ms / 1000)
+        except asyncio.CancelledError:
+            match.status = "cancelled"
+            match.reason = "cancelled"
+            raise
+        except Exception:
+            logger.exception("Error en la partida %s (%s vs %s)", match.id,
+                             match.names["R"], match.names["Y"])
+            # Con los agentes ya creados falló el jugador en turno
+            winner = " " if match.agents is None else "Y" if match.player == "R" else "R"
+            self._finish(match, winner, "error")
+        finally:
+            if match.agents is not None:
+                for agent in match.agents.values():
+                    agent.cancel_pondering()
+                match.agents = None
+            self._publish(match, self._end_event(match))
+            match.subscribers.clear()
+            self._trim()
+
+    async def _turn(self, match: Match, loop, executor):
+        """Pide, cronometra y aplica la jugada del jugador en turno."""
+        player = match.player
+        agent = match.agents[player]
+        board = match.board
+        last_move = match.moves[-1] if match.moves else None
+        move, elapsed = await loop.run_in_executor(executor, _timed_compute, agent, board,
+                                                   match.remaining[player], last_move)
+        self.agent_pool.record(match.names[player], agent, elapsed / 1000)
+        match.remaining[player] -= elapsed
+        move = [int(v) for v in move]
+        match.moves.append(move)
+
+        other = "Y" if player == "R" else "R"
+        if match.remaining[player] <= 0:
+            self._finish(match, other, "timeout")
+        elif not board.move(*move, color=-1 if player == "R" else -2):
+            self._finish(match, other, "invalid")
+
+        event = {
+            "type": "move",
+            "match_id": match.id,
+            "player": player,
+            "move": move,
+            "valid": match.reason is None,
+            "elapsed_ms": round(elapsed, 3),
+            "clock": {c: round(v, 1) for c, v in match.remaining.items()},
+            "captured": [list(c) for c in board.last_captured] if match.reason is None else [],
+            "score": match.score,
+            "board": board.grid,
+        }
+        self._publish(match, event)
+
+        if match.status == "running":
+            if board.filled == board.size * board.size:
+                cr, cy = board.red_boxes, board.yellow_boxes
+                self._finish(match, "R" if cr > cy else "Y" if cy > cr else " ", "score")
+            else:
+                match.player = other
+
+    def _finish(self, match: Match, winner: str, reason: str):
+        match.winner = winner
+        match.reason = reason
+        match.status = "finished"
@@ -0,0 +1,242 @@
+"""
+sessions.py
+===========
+
+Sesiones de partida en el servidor web.
+
+Cada sesión conserva un Board vivo y la instancia del agente Python que
+juega esa partida. Las jugadas se aplican de forma incremental (sin volver
+a leer el tablero completo) y el agente mantiene entre turnos lo que haya
+calculado (por ejemplo, su tabla de transposición). Con ponder=True el
+agente sigue buscando entre petición y petición mientras el rival piensa,
+como mucho ponder_limit segundos por turno (el hilo compite por el GIL con
+el servidor). Al cerrar o descartar una sesión la búsqueda de fondo solo
+se cancela: el bucle de eventos nunca espera a que termine.
+
+Las sesiones inactivas se descartan por tiempo (TTL) y, si se supera el
+número máximo de sesiones o el tope de memoria estimado, se descartan
+primero las usadas hace más tiempo (LRU).
+
+Autor: Equipo Arazaca – UNAL
+Fecha: 2025
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from squares.board import Board
+from squares.registry import make_agent
+
+# Segundos de búsqueda de fondo por turno en las sesiones con ponder
+PONDER_LIMIT = 5.0
+
+# Memoria aproximada de un nodo del árbol de MCTSAgent (objeto, hijos y
+# líneas sin expandir)
+NODE_BYTES = 256
+
+
+class GameSession:
+    """
+    Estado de una partida alojada en el servidor.
+    """
+
+    def __init__(self, size: int, agent_name: str, agent_color: str, time_limit: int,
+                 ponder: bool = False, ponder_limit: float = PONDER_LIMIT):
+        self.id = uuid.uuid4().hex
+        self.board = Board(size)
+        self.agent_name = agent_name
+        self.agent_color = agent_color
+        self.agent = make_agent(agent_name, color=agent_color)
+        self.agent.ponder = ponder
+        self.agent.ponder_limit = ponder_limit
+        self.agent.init(agent_color, self.board.grid, time_limit)
+        self.time_limit = time_limit
+        self.turn = "R"
+        self.moves = []
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.lock = asyncio.Lock()
+
+    @property
+    def finished(self) -> bool:
+        """True si ya no quedan líneas por dibujar."""
+        return not self.board.free_edge_ids()
+
+    def apply(self, move, color: str) -> bool:
+        """
+        Aplica una jugada del jugador en turno y pasa el turno.
+
+        :param move: [fila, columna, lado]
+        :param color: 'R' o 'Y' (debe ser el jugador en turno)
+        :return: True si la jugada fue válida
+        """
+        if color != self.turn:
+            return False
+        code = -1 if color == "R" else -2
+        if not self.board.move(*move, color=code):
+            return False
+        self.moves.append([int(v) for v in move])
+        self.turn = "Y" if color == "R" else "R"
+        return True
+
+    def agent_compute(self, time: int):
+        """
+        Jugada del agente sobre el tablero vivo (llamada bloqueante, para el
+        pool de hilos). Antes le avisa de la última jugada del rival.
+
+        :param time: Tiempo restante del agente (ms)
+        :return: Lista [fila, columna, lado]
+        """
+        if self.moves:
+            self.agent.notify_opponent_move(self.board, self.moves[-1])
+        return self.agent.compute(self.board, time)
+
+    def close(self):
+        """Cancela la búsqueda de fondo del agente (sin esperarla)."""
+        self.agent.cancel_pondering()
+
+    def estimate_bytes(self) -> int:
+        """
+        Memoria aproximada de la sesión: tablero más las tablas del agente
+        (tabla de transposición y, en MCTS, el árbol conservado entre
+        turnos: un nodo por simulación de la raíz).
+        """
+        size = 200 + 40 * self.board.size * self.board.size + 16 * len(self.moves)
+        tt = getattr(self.agent, "tt", None)
+        if tt is not None:
+            size += tt.memory_bytes
+        root = getattr(self.agent, "root", None)
+        if root is not None:
+            size += NODE_BYTES * root.visits
+        return size
+
+    def state(self, packed: bool = False) -> dict:
+        """
+        Resumen serializable de la sesión.
+
+        :param packed: Si True, el tablero va en `packed` (formato compacto
+                       de squares.wire en base64) en lugar de `board`
+        """
+        board = self.board
+        state = {
+            "game_id": self.id,
+            "size": board.size,
+            "turn": self.turn,
+            "agent": self.agent_name,
+            "agent_color": self.agent_color,
+            "moves": len(self.moves),
+            "score": {"R": board.red_boxes, "Y": board.yellow_boxes},
+            "finished": self.finished,
+            "winner": board.winner(),
+        }
+        if packed:
+            state["packed"] = board.to_base64()
+        else:
+            state["board"] = board.grid
+        return state
+
+
+class SessionStore:
+    """
+    Almacén de sesiones con expiración por inactividad y reemplazo LRU.
+    """
+
+    def __init__(self, ttl: float = 1800, max_sessions: int = 256, max_bytes: int = 1 << 30,
+                 ponder_limit: float = PONDER_LIMIT):
+        """
+        :param ttl: Segundos de inactividad antes de descartar una sesión
+        :param max_sessions: Número máximo de sesiones simultáneas
+        :param max_bytes: Tope de memoria estimada para todas las sesiones
+        :param ponder_limit: Segundos de búsqueda de fondo por turno en las
+                             sesiones con ponder
+        """
+        self.ttl = ttl
+        self.ponder_limit = ponder_limit
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._sessions = OrderedDict()
+        self._bytes = {}
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        """Memoria estimada de todas las sesiones."""
+        return sum(self._bytes.values())
+
+    def create(self, size: int, agent_name: str, agent_color: str, time_limit: int,
+               ponder: bool = False) -> GameSession:
+        """
+        Crea y registra una nueva sesión (descartando otras si hace falta).
+        Crea e inicializa el agente: llamar desde el pool de hilos, no desde
+        el bucle de eventos.
+        """
+        session = GameSession(size, agent_name, agent_color, time_limit, ponder,
+                              self.ponder_limit)
+        with self._lock:
+            self._sweep()
+            self._sessions[session.id] = session
+            self._bytes[session.id] = session.estimate_bytes()
+            self._shrink()
+        return session
+
+    def get(self, game_id: str):
+        """
+        Devuelve la sesión y la marca como usada recientemente.
+
+        Su memoria estimada se vuelve a calcular (crece con las jugadas y
+        con la tabla de transposición del agente) y, si se supera el tope,
+        se descartan las otras sesiones usadas hace más tiempo.
+
+        :return: GameSession o None si no existe o expiró
+        """
+        with self._lock:
+            self._sweep()
+            session = self._sessions.get(game_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(game_id)
+                self._bytes[game_id] = session.estimate_bytes()
+                self._shrink()
+            return session
+
+    def close(self, game_id: str) -> bool:
+        """Elimina una sesión. Retorna False si no existía."""
+        with self._lock:
+            if game_id not in self._sessions:
+                return False
+            self._evict(game_id, count=False)
+            return True
+
+    def _evict(self, game_id: str, count: bool = True):
+        session = self._sessions.pop(game_id, None)
+        if session is not None:
+            session.close()
+        self._bytes.pop(game_id, None)
+        if count:
+            self.evicted += 1
+
+    def _shrink(self):
+        """
+        Descarta las sesiones usadas hace más tiempo mientras se superen
+        los topes (nunca la más reciente).
+        """
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self.total_bytes > self.max_bytes
+        ):
+            self._evict(next(iter(self._sessions)))
+
+    def _sweep(self):
+        """Descarta las sesiones inactivas más allá del TTL."""
+        limit = time.monotonic() - self.ttl
+        while self._sessions:
+            game_id, session = next(iter(self._sessions.items()))
+            if session.last_used >= limit:
+                break
+            self._evict(game_id)